@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from os import cpu_count
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from referee import DUEL_ERRORS
+
+ASYNC_DUEL_ERRORS = DUEL_ERRORS + (asyncio.TimeoutError,)
+
+
+class AsyncDuelRunner:
+    command: List[str]
+    parse: Callable[[List[str]], Tuple]
+    default: Tuple
+    arguments: Optional[Callable[..., Tuple[str, ...]]]
+    concurrency: int
+    timeout: float
+    retries: int
+    matches: int
+    retried: int
+    timeouts: int
+    failures: int
+    referee_seconds: float
+    parsing_seconds: float
+
+    def __init__(
+        self,
+        command: List[str],
+        parse: Callable[[List[str]], Tuple],
+        default: Tuple,
+        arguments: Optional[Callable[..., Tuple[str, ...]]] = None,
+        concurrency: Optional[int] = None,
+        timeout: float = 60,
+        retries: int = 3,
+    ):
+        self.command = command
+        self.parse = parse
+        self.default = default
+        self.arguments = arguments
+        self.concurrency = concurrency or cpu_count() or 1
+        self.timeout = timeout
+        self.retries = retries
+        self.matches = 0
+        self.retried = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.referee_seconds = 0.0
+        self.parsing_seconds = 0.0
+
+    async def create_semaphore(self) -> asyncio.Semaphore:
+        return asyncio.Semaphore(self.concurrency)
+
+    async def run_referee(self, args: Tuple[str, ...]) -> List[str]:
+        started = perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *self.command, *args, stdout=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            # Hung, cancelled or interrupted referees must not outlive their match
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            self.referee_seconds += perf_counter() - started
+
+        return stdout.decode("utf-8").splitlines()
+
+    async def play(self, semaphore: asyncio.Semaphore, args: Tuple[str, ...]) -> Tuple:
+        if self.arguments is not None:
+            args = self.arguments(*args)
+
+        for attempt in range(self.retries):
+            async with semaphore:
+                try:
+                    lines = await self.run_referee(args)
+                    parsing = perf_counter()
+                    result = self.parse(lines)
+                    self.parsing_seconds += perf_counter() - parsing
+                    self.matches += 1
+                    return result
+                except ASYNC_DUEL_ERRORS as err:
+                    print(f"Duel attempt {attempt + 1}/{self.retries} failed: {err!r}")
+                    self.retried += 1
+
+        self.failures += 1
+        return self.default
+
+    def imap_unordered(
+        self, tasks: Iterable[Tuple[Any, Tuple[str, ...]]]
+    ) -> Iterator[Tuple[Any, Tuple]]:
+        """Yield (key, result) in completion order, at most concurrency referees alive"""
+        loop = asyncio.new_event_loop()
+        semaphore = loop.run_until_complete(self.create_semaphore())
+        running: Dict[asyncio.Task, Any] = {}
+        pending = iter(tasks)
+        try:
+            while True:
+                for key, args in pending:
+                    running[loop.create_task(self.play(semaphore, args))] = key
+                    if len(running) >= 2 * self.concurrency:
+                        break
+                if not running:
+                    return
+
+                done, _ = loop.run_until_complete(
+                    asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                )
+                for task in done:
+                    yield running.pop(task), task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                loop.run_until_complete(
+                    asyncio.gather(*running, return_exceptions=True)
+                )
+            loop.close()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.concurrency,
+            "referee": self.referee_seconds,
+            "parsing": self.parsing_seconds,
+            "retries": self.retried,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+        }
+
+    def report(self) -> str:
+        return (
+            f"Async referees [{self.concurrency}]: {self.matches} matches, "
+            f"{self.retried} retries, {self.timeouts} timeouts, {self.failures} failures"
+        )
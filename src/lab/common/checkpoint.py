@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from numpy.random import Generator
+
+# A checkpoint is one .npz archive: the arrays as stored, plus a "meta" entry
+# holding the JSON encoded scalars and random generators states. No pickle.
+
+
+def write_checkpoint(path: str, arrays: Dict[str, np.ndarray], meta: Dict) -> None:
+    # Write aside then rename, an interrupted save keeps the previous checkpoint
+    temporary = f"{path}.tmp"
+    entries: Dict[str, Any] = {
+        "meta": np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+        **arrays,
+    }
+    with open(temporary, "wb") as f:
+        np.savez_compressed(f, **entries)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def read_checkpoint(path: str) -> Tuple[Dict[str, np.ndarray], Dict]:
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files if key != "meta"}
+        meta = json.loads(data["meta"].tobytes())
+    return arrays, meta
+
+
+def get_rng_states(rng: Generator) -> Dict:
+    legacy = np.random.get_state(legacy=False)
+    legacy["state"]["key"] = legacy["state"]["key"].tolist()  # type: ignore
+    version, state, gauss = random.getstate()
+    return {
+        "generator": rng.bit_generator.state,
+        "numpy": legacy,
+        "random": [version, list(state), gauss],
+    }
+
+
+def set_rng_states(rng: Generator, states: Dict) -> None:
+    rng.bit_generator.state = states["generator"]
+    legacy = states["numpy"]
+    legacy["state"]["key"] = np.array(legacy["state"]["key"], dtype=np.uint32)
+    np.random.set_state(legacy)
+    version, state, gauss = states["random"]
+    random.setstate((version, tuple(state), gauss))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+
+import numpy as np
+
+# Layout: one HEADER, then fixed-size records (id, generation, genome) appended in
+# order. A record is found by its number, so the offset index only maps
+# (id, generation) -> number. A torn last record (crash while appending) is ignored.
+MAGIC = b"CHRA"
+VERSION = 1
+HEADER = struct.Struct("<4sH16sI6x")
+ID_SIZE = 36
+
+
+class ArchivedChromosome(Protocol):
+    id: str
+    generation: int
+    genome: np.ndarray
+
+
+class ChromosomeArchive:
+    path: str
+    dtype: np.dtype
+    length: int
+    record_dtype: np.dtype
+    index: Dict[Tuple[str, int], int]
+    generations: Dict[str, List[int]]
+
+    def __init__(self, path: str, dtype, length: int):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = length
+        self.record_dtype = np.dtype(
+            [
+                ("id", f"S{ID_SIZE}"),
+                ("generation", "<u4"),
+                ("genome", self.dtype, (length,)),
+            ]
+        )
+        self.index = {}
+        self.generations = {}
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.read_header()
+            self.build_index()
+
+    @classmethod
+    def open(cls, path: str) -> ChromosomeArchive:
+        """Open an existing archive whatever its genome type and length"""
+        with open(path, "rb") as f:
+            _, _, dtype, length = cls.unpack_header(f.read(HEADER.size))
+        return cls(path, dtype, length)
+
+    @staticmethod
+    def unpack_header(data: bytes) -> Tuple[bytes, int, str, int]:
+        magic, version, dtype, length = HEADER.unpack(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a chromosome archive (v{VERSION}): {magic!r}")
+        return magic, version, dtype.rstrip(b"\0").decode(), length
+
+    def read_header(self) -> None:
+        with open(self.path, "rb") as f:
+            _, _, dtype, length = self.unpack_header(f.read(HEADER.size))
+        if np.dtype(dtype) != self.dtype or length != self.length:
+            raise ValueError(
+                f"{self.path} holds {length} x {dtype} genomes, "
+                f"not {self.length} x {self.dtype.str}"
+            )
+
+    def build_index(self) -> None:
+        for number, record in enumerate(self.records()):
+            self.add_to_index(record["id"].decode(), int(record["generation"]), number)
+
+    def add_to_index(self, id: str, generation: int, number: int) -> None:
+        if (id, generation) in self.index:
+            return
+        self.index[(id, generation)] = number
+        self.generations.setdefault(id, []).append(generation)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self.index
+
+    def append(self, chromosomes: Iterable[ArchivedChromosome]) -> int:
+        """Append the chromosomes not archived yet in one write, return their count"""
+        unique: Dict[Tuple[str, int], ArchivedChromosome] = {}
+        for chromosome in chromosomes:
+            key = (chromosome.id, chromosome.generation)
+            if key not in self.index:
+                unique.setdefault(key, chromosome)
+        new = list(unique.values())
+        if not new:
+            return 0
+
+        records = np.empty(len(new), dtype=self.record_dtype)
+        records["id"] = [chromosome.id.encode() for chromosome in new]
+        records["generation"] = [chromosome.generation for chromosome in new]
+        records["genome"] = [chromosome.genome for chromosome in new]
+
+        with open(self.path, "ab") as f:
+            size = f.tell()
+            if size == 0:
+                f.write(
+                    HEADER.pack(MAGIC, VERSION, self.dtype.str.encode(), self.length)
+                )
+                first = 0
+            else:
+                # Numbers follow the complete records, a torn one is dropped
+                first = (size - HEADER.size) // self.record_dtype.itemsize
+                f.truncate(HEADER.size + first * self.record_dtype.itemsize)
+            f.write(records.tobytes())
+
+        for number, chromosome in enumerate(new, first):
+            self.add_to_index(chromosome.id, chromosome.generation, number)
+        return len(new)
+
+    def get(self, id: str, generation: Optional[int] = None) -> np.ndarray:
+        """Genome of a chromosome, at its last archived generation by default"""
+        if generation is None:
+            if id not in self.generations:
+                raise KeyError(id)
+            generation = self.generations[id][-1]
+        number = self.index[(id, generation)]
+
+        with open(self.path, "rb") as f:
+            f.seek(HEADER.size + number * self.record_dtype.itemsize)
+            data = f.read(self.record_dtype.itemsize)
+        return np.frombuffer(data, dtype=self.record_dtype)[0]["genome"].copy()
+
+    def records(self) -> np.ndarray:
+        """Every complete record, memory-mapped read-only for bulk analysis"""
+        if not os.path.exists(self.path):
+            return np.empty(0, dtype=self.record_dtype)
+        count = (os.path.getsize(self.path) - HEADER.size) // self.record_dtype.itemsize
+        if count <= 0:
+            return np.empty(0, dtype=self.record_dtype)
+        return np.memmap(
+            self.path,
+            dtype=self.record_dtype,
+            mode="r",
+            offset=HEADER.size,
+            shape=(count,),
+        )
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import Iterable, List, Optional, Protocol, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS duels (
+    id INTEGER PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    chromosome_1 TEXT NOT NULL,
+    generation_1 INTEGER NOT NULL,
+    hash_1 TEXT NOT NULL,
+    chromosome_2 TEXT NOT NULL,
+    generation_2 INTEGER NOT NULL,
+    hash_2 TEXT NOT NULL,
+    score_1 REAL,
+    score_2 REAL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS duels_generation ON duels (generation);
+CREATE INDEX IF NOT EXISTS duels_chromosome_1 ON duels (chromosome_1, chromosome_2);
+CREATE INDEX IF NOT EXISTS duels_chromosome_2 ON duels (chromosome_2, chromosome_1);
+CREATE INDEX IF NOT EXISTS duels_hashes ON duels (hash_1, hash_2);
+-- Every duel seen from both sides
+CREATE VIEW IF NOT EXISTS matchups AS
+    SELECT id, generation, chromosome_1 AS chromosome, generation_1 AS born,
+        hash_1 AS hash, chromosome_2 AS opponent, hash_2 AS opponent_hash,
+        score_1 AS score, score_2 AS opponent_score, result, 0 AS swapped
+    FROM duels
+    UNION ALL
+    SELECT id, generation, chromosome_2, generation_2, hash_2, chromosome_1, hash_1,
+        score_2, score_1, result, 1
+    FROM duels;
+"""
+
+
+class StoredChromosome(Protocol):
+    id: str
+    generation: int
+
+
+def oriented(result: str, swapped: int) -> Tuple:
+    values = json.loads(result)
+    return tuple(values[1::-1] + values[2:] if swapped else values)
+
+
+class DuelStore:
+    path: str
+    connection: sqlite3.Connection
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> DuelStore:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_duels(
+        self,
+        generation: int,
+        duels: Iterable[Tuple[StoredChromosome, str, StoredChromosome, str, Tuple]],
+    ) -> int:
+        """Store (chromosome, hash, opponent, hash, result) duels in one transaction"""
+        rows = [
+            (
+                generation,
+                chromosome_1.id,
+                chromosome_1.generation,
+                hash_1,
+                chromosome_2.id,
+                chromosome_2.generation,
+                hash_2,
+                result[0],
+                result[1],
+                json.dumps(list(result)),
+            )
+            for chromosome_1, hash_1, chromosome_2, hash_2, result in duels
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO duels (generation, chromosome_1, generation_1, hash_1,"
+                " chromosome_2, generation_2, hash_2, score_1, score_2, result)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM duels").fetchone()[0]
+
+    def matchup_results(self, hash_1: str, hash_2: str, limit: int) -> List[Tuple]:
+        """Latest results between two genomes, seen from the first one"""
+        rows = self.connection.execute(
+            "SELECT result, swapped FROM matchups WHERE hash = ? AND opponent_hash = ?"
+            " ORDER BY id DESC LIMIT ?",
+            (hash_1, hash_2, limit),
+        )
+        return [oriented(result, swapped) for result, swapped in rows]
+
+    def head_to_head(self, chromosome: str, opponent: str) -> List[Tuple[int, Tuple]]:
+        """(generation, result) of every duel between two chromosomes"""
+        rows = self.connection.execute(
+            "SELECT generation, result, swapped FROM matchups"
+            " WHERE chromosome = ? AND opponent = ? ORDER BY id",
+            (chromosome, opponent),
+        )
+        return [
+            (generation, oriented(result, swapped))
+            for generation, result, swapped in rows
+        ]
+
+    def history(
+        self, chromosome: str, generation: Optional[int] = None
+    ) -> List[Tuple[int, str, Tuple]]:
+        """(generation, opponent, result) of a chromosome, in one generation or all"""
+        query = (
+            "SELECT generation, opponent, result, swapped FROM matchups"
+            " WHERE chromosome = ?"
+        )
+        parameters: Tuple = (chromosome,)
+        if generation is not None:
+            query += " AND generation = ?"
+            parameters += (generation,)
+        rows = self.connection.execute(query + " ORDER BY id", parameters)
+        return [
+            (generation, opponent, oriented(result, swapped))
+            for generation, opponent, result, swapped in rows
+        ]
+
+    def opponents(self, chromosome: str) -> List[Tuple[str, int, float, float]]:
+        """(opponent, duels, mean score, mean opponent score), most met first"""
+        return self.connection.execute(
+            "SELECT opponent, COUNT(*), AVG(score), AVG(opponent_score) FROM matchups"
+            " WHERE chromosome = ? GROUP BY opponent ORDER BY COUNT(*) DESC, opponent",
+            (chromosome,),
+        ).fetchall()
+
+    def generation_summary(self, generation: int) -> List[Tuple[str, int, float]]:
+        """(chromosome, duels, mean score) of one generation, best mean first"""
+        return self.connection.execute(
+            "SELECT chromosome, COUNT(*), AVG(score) FROM matchups"
+            " WHERE generation = ? GROUP BY chromosome ORDER BY AVG(score) DESC",
+            (generation,),
+        ).fetchall()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+import pickle
+from collections import OrderedDict
+from hashlib import blake2b
+from random import choice
+from typing import Dict, List, Optional, Protocol, Tuple
+
+import numpy as np
+
+
+def genome_hash(genome: np.ndarray) -> str:
+    # Same genes and dtype give the same key, whatever the chromosome id or generation
+    data = np.ascontiguousarray(genome)
+    return blake2b(data.dtype.str.encode() + data.tobytes(), digest_size=16).hexdigest()
+
+
+class ResultStore(Protocol):
+    def matchup_results(self, hash_1: str, hash_2: str, limit: int) -> List[Tuple]:
+        """Latest results between two genomes, seen from the first one"""
+
+
+def swap_result(result: Tuple) -> Tuple:
+    return (result[1], result[0], *result[2:])
+
+
+class EvaluationCache:
+    capacity: int
+    fresh_samples: int
+    path: Optional[str]
+    store: Optional[ResultStore]
+    scores: OrderedDict[str, float]
+    results: OrderedDict[Tuple[str, str], List[Tuple]]
+    hits: int
+    misses: int
+    skipped: int
+
+    def __init__(self, capacity: int, fresh_samples: int, path: Optional[str] = None):
+        self.capacity = capacity
+        self.fresh_samples = fresh_samples
+        self.path = path
+        self.store = None
+        self.scores = OrderedDict()
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __enter__(self) -> EvaluationCache:
+        return self
+
+    def __exit__(self, *_) -> None:
+        if self.path is not None:
+            self.save()
+
+    def touch(self, table: OrderedDict, key, value=None) -> None:
+        if value is not None:
+            table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.capacity:
+            table.popitem(last=False)
+
+    def get_score(self, key: str, default: float) -> float:
+        if key not in self.scores:
+            return default
+        self.touch(self.scores, key)
+        return self.scores[key]
+
+    def set_score(self, key: str, score: float) -> None:
+        self.touch(self.scores, key, score)
+
+    def lookup(self, key_1: str, key_2: str) -> Optional[Tuple]:
+        """A past result once the match-up has fresh_samples of them, None to play it"""
+        key = (min(key_1, key_2), max(key_1, key_2))
+        samples = self.results.get(key)
+        if samples is None and self.store is not None:
+            # First time seen here, maybe played in earlier runs
+            samples = self.store.matchup_results(*key, self.fresh_samples)
+            if samples:
+                self.touch(self.results, key, samples)
+        if samples is None or len(samples) < self.fresh_samples:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.touch(self.results, key)
+        result = choice(samples)
+        return result if key_1 <= key_2 else swap_result(result)
+
+    def add(self, key_1: str, key_2: str, result: Tuple) -> None:
+        # Match-ups are stored once, results seen from the smallest key
+        key = (min(key_1, key_2), max(key_1, key_2))
+        samples = self.results.get(key, [])
+        samples.append(tuple(result) if key_1 <= key_2 else swap_result(result))
+        self.touch(self.results, key, samples[-self.fresh_samples :])
+
+    def load(self) -> None:
+        with open(self.path, "rb") as f:  # type: ignore
+            state: Dict = pickle.load(f)
+        self.scores = OrderedDict(state["scores"])
+        self.results = OrderedDict(state["results"])
+
+    def save(self) -> None:
+        # Write aside then rename, an interrupted run keeps the previous cache
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump({"scores": self.scores, "results": self.results}, f)
+        os.replace(temporary, self.path)  # type: ignore
+
+    def report(self) -> str:
+        return (
+            f"Cache: {self.hits} hits, {self.misses} misses, {self.skipped} skipped, "
+            f"{len(self.scores)} scores, {len(self.results)} match-ups"
+        )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+from os import getpid
+from queue import SimpleQueue
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+def timed_call(function: Callable, args: Tuple) -> Tuple[int, float, Any]:
+    started = perf_counter()
+    result = function(*args)
+    return getpid(), perf_counter() - started, result
+
+
+class EvaluationPool:
+    size: int
+    pool: Optional[Any]
+    busy: Dict[int, float]
+    tasks: Dict[int, int]
+    period_start: float
+    total_busy: float
+
+    def __init__(self, size: int):
+        self.size = size
+        self.pool = None
+        self.total_busy = 0.0
+        self.reset_utilisation()
+
+    def __enter__(self) -> EvaluationPool:
+        # Workers are forked on first use
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        self.close(terminate=exc_type is not None)
+
+    def start(self) -> None:
+        if self.pool is None:
+            self.pool = Pool(self.size)
+
+    def resize(self, size: int) -> None:
+        if size != self.size:
+            print(f"Resizing evaluation pool: {self.size} -> {size}")
+            self.close()
+            self.size = size
+        self.start()
+
+    def close(self, terminate: bool = False) -> None:
+        if self.pool is None:
+            return
+
+        if terminate:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+    def apply_async(self, function: Callable, args: Tuple) -> AsyncResult:
+        self.start()
+        return self.pool.apply_async(timed_call, (function, args))  # type: ignore
+
+    def get(self, result: AsyncResult) -> Any:
+        return self.account(result.get())
+
+    def account(self, report: Tuple[int, float, Any]) -> Any:
+        pid, busy, value = report
+        self.busy[pid] += busy
+        self.tasks[pid] += 1
+        self.total_busy += busy
+        return value
+
+    def imap_unordered(
+        self,
+        function: Callable,
+        tasks: Iterable[Tuple[Any, Tuple]],
+        window: Optional[int] = None,
+    ) -> Iterator[Tuple[Any, Any]]:
+        """Yield (key, result) in completion order, with at most window tasks queued"""
+        self.start()
+        window = window or 2 * self.size
+        done: SimpleQueue = SimpleQueue()
+        pending = iter(tasks)
+        in_flight = 0
+
+        def submit(key: Any, args: Tuple) -> None:
+            self.pool.apply_async(  # type: ignore
+                timed_call,
+                (function, args),
+                callback=lambda report: done.put((key, report, None)),
+                error_callback=lambda error: done.put((key, None, error)),
+            )
+
+        try:
+            while True:
+                for key, args in pending:
+                    submit(key, args)
+                    in_flight += 1
+                    if in_flight >= window:
+                        break
+                if in_flight == 0:
+                    return
+
+                key, report, error = done.get()
+                in_flight -= 1
+                if error is not None:
+                    raise error
+                yield key, self.account(report)
+        finally:
+            # Let running tasks finish so that the next batch starts on idle workers
+            for _ in range(in_flight):
+                done.get()
+
+    def reset_utilisation(self) -> None:
+        self.busy = defaultdict(float)
+        self.tasks = defaultdict(int)
+        self.period_start = perf_counter()
+
+    def utilisation(self) -> Dict[int, float]:
+        elapsed = max(perf_counter() - self.period_start, 1e-9)
+        return {pid: busy / elapsed for pid, busy in sorted(self.busy.items())}
+
+    def idle_ratio(self) -> float:
+        elapsed = max(perf_counter() - self.period_start, 1e-9)
+        return max(0.0, 1 - sum(self.busy.values()) / (self.size * elapsed))
+
+    def stats(self) -> Dict[str, float]:
+        # Duels are parsed and retried inside the workers, out of sight
+        return {"workers": self.size, "referee": self.total_busy}
+
+    def report(self) -> str:
+        workers = ", ".join(
+            f"{pid}: {ratio:.0%} ({self.tasks[pid]})"
+            for pid, ratio in self.utilisation().items()
+        )
+        return f"Workers [{workers}], idle {self.idle_ratio():.0%}"
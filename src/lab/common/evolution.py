@@ -0,0 +1,910 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from itertools import islice
+from math import ceil
+from os import makedirs, scandir
+from os.path import isdir, isfile
+from random import sample, uniform
+from shutil import rmtree
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from uuid import uuid4
+
+import numpy as np
+from numpy.random import choice, default_rng
+
+from async_referee import AsyncDuelRunner
+from checkpoint import get_rng_states, read_checkpoint, set_rng_states, write_checkpoint
+from chromosome_archive import ChromosomeArchive
+from duel_store import DuelStore
+from evaluation_cache import EvaluationCache, genome_hash
+from evaluation_pool import EvaluationPool
+from genome_bank import bank_argument, write_genome_bank
+from matchmaking import Matchmaker
+from racing import Racing
+from telemetry import Telemetry
+
+# Defaults of the GA core, each project passes its own tuning
+POPULATION_SIZE = 20
+ELITE_RATIO = 0.1
+CHROMOSOME_MUTATE_RATIO = 0.1
+GENE_MUTATE_RATIO = 0.0001
+CROSSOVER_RATIO = 1.0
+PREVIOUS_SCORE_RATIO = 0.25
+GENERATIONS_MAX = 1000
+POOL_SIZE = 3
+ROUNDS_PER_GENERATION = 10
+RATING_SCALE = 200  # score gap for 10:1 odds, used by matchmaking
+
+STANDINGS_PATIENCE = 0  # stop a generation once the elite is stable
+CACHE_CAPACITY = 100_000
+CACHE_FRESH_SAMPLES = 3  # real results a match-up needs before being replayed
+DUEL_BUDGET = 0  # duels per generation, 0 for rounds_per_generation full rounds
+RACING_CONFIDENCE = 2.0
+MATCHMAKING = "random"
+CHECKPOINT_FILE = ".checkpoint.npz"
+CHECKPOINT_INTERVAL = 10
+ARCHIVE_FILE = ".chromosomes/archive.bin"
+GENOME_BANK_FILE = ".chromosomes/genomes.bin"
+POOL_SIZE_FILE = ".pool_size"  # a worker count written here resizes a running pool
+
+RNG = default_rng()
+
+
+def unzip(zipped) -> Tuple:
+    return tuple(zip(*zipped))
+
+
+def pairwise(iterable):
+    "s -> (s0, s1), (s2, s3), (s4, s5), ..."
+    a = iter(iterable)
+    return zip(a, a)
+
+
+def generic_arg(cls, i: int):
+    return cls.__orig_bases__[0].__args__[i]
+
+
+class Gene(ABC):
+    dtype: type = np.float64
+    genome: np.ndarray
+    index: int
+
+    def __init__(self, genome: np.ndarray, index: int):
+        self.genome = genome
+        self.index = index
+
+    @classmethod
+    @abstractmethod
+    def random_genome(cls, shape) -> np.ndarray:
+        pass
+
+    @classmethod
+    @abstractmethod
+    def encode_genome(cls, genome: np.ndarray) -> str:
+        pass
+
+    @classmethod
+    @abstractmethod
+    def decode_genome(cls, string: str) -> np.ndarray:
+        pass
+
+    def __str__(self) -> str:
+        return self.encode_genome(self.genome[self.index : self.index + 1])
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    @classmethod
+    @abstractmethod
+    def crossover_genomes(
+        cls,
+        weight: Union[float, np.ndarray],
+        inv_weight: Union[float, np.ndarray],
+        genome_1: np.ndarray,
+        genome_2: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        pass
+
+    @classmethod
+    @abstractmethod
+    def mutate_values(cls, values: np.ndarray) -> np.ndarray:
+        pass
+
+    @classmethod
+    def crossover_population(
+        cls, genomes: np.ndarray, parents: np.ndarray, crossover_ratio: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Breed consecutive parent pairs, return children genomes and crossed pairs"""
+        parents_1, parents_2 = parents[0::2], parents[1::2]
+        children = np.empty((len(parents), genomes.shape[1]), dtype=genomes.dtype)
+        children[0::2] = genomes[parents_1]
+        children[1::2] = genomes[parents_2]
+
+        crossing = RNG.random(len(parents_1)) <= crossover_ratio
+        weight = RNG.uniform(0.02, 0.98, size=(np.count_nonzero(crossing), 1))
+        children_1, children_2 = children[0::2], children[1::2]
+        children_1[crossing], children_2[crossing] = cls.crossover_genomes(
+            weight,
+            1 - weight,
+            genomes[parents_1[crossing]],
+            genomes[parents_2[crossing]],
+        )
+
+        return children, crossing
+
+    @classmethod
+    def mutate_population(
+        cls, genomes: np.ndarray, rows: np.ndarray, gene_mutate_ratio: float
+    ) -> None:
+        """Mutate in place the same number of distinct genes in each given row"""
+        size = genomes.shape[1]
+        count = ceil(size * gene_mutate_ratio)
+        if len(rows) == 0 or count == 0:
+            return
+
+        indices = np.argpartition(RNG.random((len(rows), size)), count - 1, axis=1)
+        rows, indices = rows[:, None], indices[:, :count]
+        genomes[rows, indices] = cls.mutate_values(genomes[rows, indices])
+
+
+G = TypeVar("G", bound=Gene)
+
+
+class Chromosome(Generic[G]):
+    generation: int
+    id: str
+    genome: np.ndarray
+    last_score: float = 0.0
+
+    @classmethod
+    def _G(cls) -> type[G]:
+        return generic_arg(cls, 0)
+
+    def __init__(self, generation: int, genome: np.ndarray, id: Optional[str] = None):
+        self.generation = generation
+        self.id = id or str(uuid4())
+        self.genome = genome
+
+    @property
+    def genes(self) -> List[G]:
+        return [self._G()(self.genome, i) for i in range(len(self.genome))]
+
+    @classmethod
+    def random(cls, generation: int, size: int) -> Chromosome:
+        return cls(generation=generation, genome=cls._G().random_genome(size))
+
+    def __str__(self) -> str:
+        return self._G().encode_genome(self.genome)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def encode(self, file_name: str) -> None:
+        with open(file_name, "wt") as f:
+            f.write(str(self))
+
+    @classmethod
+    def from_str(cls, generation: int, string: str) -> Chromosome:
+        return cls(generation, cls._G().decode_genome(string))
+
+    def run(self, round: int):
+        return str(self._G()(self.genome, round))
+
+    def get_hash(self) -> str:
+        return genome_hash(self.genome)
+
+    def set_last_score(self, score: float):
+        self.last_score = score
+
+    def get_last_score(self) -> float:
+        return self.last_score
+
+    def copy(self) -> Chromosome:
+        # Copy on write: both share a read-only genome until mutate()
+        genome = self.genome.view()
+        genome.flags.writeable = False
+        copy = self.__class__(generation=self.generation, id=self.id, genome=genome)
+        copy.set_last_score(self.get_last_score())
+        return copy
+
+    def crossover(
+        self, generation: int, parent_2: Chromosome
+    ) -> Tuple[Chromosome, Chromosome]:
+        weight = uniform(0.02, 0.98)
+        child_1_genome, child_2_genome = self._G().crossover_genomes(
+            weight, 1 - weight, self.genome, parent_2.genome
+        )
+
+        return (
+            self.__class__(generation=generation, genome=child_1_genome),
+            self.__class__(generation=generation, genome=child_2_genome),
+        )
+
+    def mutate(self, gene_mutate_ratio) -> None:
+        if not self.genome.flags.writeable:
+            self.genome = self.genome.copy()
+        self._G().mutate_population(
+            self.genome[None], np.zeros(1, dtype=int), gene_mutate_ratio
+        )
+
+
+C = TypeVar("C", bound=Chromosome)
+
+
+class Population(Generic[C]):
+    generation: int
+    chromosomes: List[C] = []
+    genomes: np.ndarray
+
+    @classmethod
+    def _C(cls) -> type[C]:
+        return generic_arg(cls, 0)
+
+    def __init__(self, generation, chromosomes, genomes: Optional[np.ndarray] = None):
+        self.generation = generation
+        self.chromosomes = chromosomes
+
+        # One contiguous (population x chromosome) matrix, chromosomes keep row views
+        self.genomes = (
+            genomes
+            if genomes is not None
+            else np.stack([chromosome.genome for chromosome in chromosomes])
+        )
+        for chromosome, genome in zip(self.chromosomes, self.genomes):
+            chromosome.genome = genome
+
+    @classmethod
+    def random(cls, population_size: int, chromozome_size: int) -> Population:
+        genomes = cls._C()._G().random_genome((population_size, chromozome_size))
+        return cls(
+            generation=0,
+            chromosomes=[cls._C()(generation=0, genome=genome) for genome in genomes],
+            genomes=genomes,
+        )
+
+    def __str__(self) -> str:
+        return f"\nGeneration {self.generation}:\n" + "\n".join(
+            [str(chromosome) for chromosome in self.chromosomes]
+        )
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def copy(self) -> Population:
+        return self.__class__(
+            generation=self.generation,
+            chromosomes=[chromosome.copy() for chromosome in self.chromosomes],
+        )
+
+    def get_file_names(self, genome_bank: Optional[str] = None) -> List[str]:
+        if genome_bank is not None:
+            return [
+                bank_argument(genome_bank, slot)
+                for slot in range(len(self.chromosomes))
+            ]
+        # One file per population slot, rewritten in place every generation
+        return [f".chromosomes/{slot:03}.txt" for slot in range(len(self.chromosomes))]
+
+    def encode(
+        self,
+        archive: Optional[ChromosomeArchive] = None,
+        genome_bank: Optional[str] = None,
+    ) -> None:
+        if genome_bank is not None:
+            write_genome_bank(genome_bank, self.genomes)
+        else:
+            for chromosome, file_name in zip(self.chromosomes, self.get_file_names()):
+                chromosome.encode(file_name)
+        if archive is not None:
+            archive.append(self.chromosomes)
+
+
+class Standings:
+    initial: List[float]
+    scores: List[float]
+    duels: List[int]
+    gains: List[List[float]]
+    results: List[Tuple[int, int, Tuple]]
+    played: int
+    elite: Set[int]
+    elite_size: int
+    patience: int
+    stable_for: int
+
+    def __init__(
+        self,
+        scores: List[float],
+        fold: Callable[[List[float], int, int, Tuple], None],
+        elite_size: int,
+        patience: int = 0,
+    ):
+        self.initial = list(scores)
+        self.scores = scores
+        self.fold = fold
+        self.duels = [0] * len(scores)
+        self.gains = [[] for _ in scores]
+        self.results = []
+        self.played = 0
+        self.elite = set()
+        self.elite_size = elite_size
+        self.patience = patience
+        self.stable_for = 0
+
+    def add(self, player_1: int, player_2: int, result: Tuple) -> None:
+        before_1, before_2 = self.scores[player_1], self.scores[player_2]
+        self.fold(self.scores, player_1, player_2, result)
+        self.gains[player_1].append(self.scores[player_1] - before_1)
+        self.gains[player_2].append(self.scores[player_2] - before_2)
+        self.results.append((player_1, player_2, result))
+        self.duels[player_1] += 1
+        self.duels[player_2] += 1
+        self.played += 1
+
+        elite = set(self.ranking()[: self.elite_size])
+        self.stable_for = self.stable_for + 1 if elite == self.elite else 0
+        self.elite = elite
+
+    def result_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(duels x 2) players and (duels x result size) results, in arrival order"""
+        pairs = np.array([(p1, p2) for p1, p2, _ in self.results], dtype=int)
+        results = np.array([result for _, _, result in self.results], dtype=float)
+        return pairs.reshape(-1, 2), results
+
+    def ranking(self) -> List[int]:
+        return sorted(range(len(self.scores)), key=lambda i: -self.scores[i])
+
+    def is_stable(self) -> bool:
+        # The elite did not change for the last `patience` results, 0 never stops
+        return (
+            self.patience > 0
+            and min(self.duels) > 0
+            and self.stable_for >= self.patience
+        )
+
+    def __str__(self) -> str:
+        return " ".join(
+            f"#{rank + 1}:{i}={self.scores[i]:.1f}({self.duels[i]})"
+            for rank, i in enumerate(self.ranking()[: max(self.elite_size, 3)])
+        )
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+P = TypeVar("P", bound=Population)
+
+
+class GeneticAlgorithm(Generic[P]):
+    chromosome_size: int
+    population_size: int
+    generations_max: float
+    elite_ratio: float
+    chromosome_mutate_ratio: float
+    gene_mutate_ratio: float
+    crossover_ratio: float
+    pool_size: int
+    rounds_per_generation: int
+    previous_score_ratio: float
+    evaluation_pool: EvaluationPool
+    async_runner: Optional[AsyncDuelRunner]
+    cache: Optional[EvaluationCache]
+    checkpoint_file: Optional[str]
+    resuming: bool
+    archive: Optional[ChromosomeArchive]
+    genome_bank_file: Optional[str]
+    racing: Optional[Racing]
+    matchmaker: Optional[Matchmaker]
+    rating: str
+    duel_store: Optional[DuelStore]
+    played: List[Tuple[int, int, Tuple]]
+    duel_budget: int
+    telemetry: Telemetry
+    population: P
+    scores: List[float]
+    standings: Standings
+
+    @classmethod
+    def _P(cls) -> type[P]:
+        return generic_arg(cls, 0)
+
+    def __init__(
+        self,
+        chromosome_size: int,
+        population_size: int = POPULATION_SIZE,
+        generations_max: float = GENERATIONS_MAX,
+        elite_ratio: float = ELITE_RATIO,
+        chromosome_mutate_ratio: float = CHROMOSOME_MUTATE_RATIO,
+        gene_mutate_ratio: float = GENE_MUTATE_RATIO,
+        crossover_ratio: float = CROSSOVER_RATIO,
+        pool_size: int = POOL_SIZE,
+        rounds_per_generation: int = ROUNDS_PER_GENERATION,
+        previous_score_ratio: float = PREVIOUS_SCORE_RATIO,
+    ):
+        self.chromosome_size = chromosome_size
+        self.population_size = population_size
+        self.generations_max = generations_max
+        self.elite_ratio = elite_ratio
+        self.chromosome_mutate_ratio = chromosome_mutate_ratio
+        self.gene_mutate_ratio = gene_mutate_ratio
+        self.crossover_ratio = crossover_ratio
+        self.pool_size = pool_size
+        self.rounds_per_generation = rounds_per_generation
+        self.previous_score_ratio = previous_score_ratio
+        self.evaluation_pool = EvaluationPool(pool_size)
+        self.async_runner = None
+        self.cache = None
+        self.checkpoint_file = CHECKPOINT_FILE
+        self.resuming = False
+        self.archive = None
+        self.genome_bank_file = None
+        self.racing = None
+        self.matchmaker = None
+        self.rating = "sequential"
+        self.duel_store = None
+        self.played = []
+        self.duel_budget = DUEL_BUDGET
+        self.telemetry = Telemetry()
+
+    def run(self):
+        with self.evaluation_pool:
+            with self.cache or nullcontext(), self.duel_store or nullcontext():
+                self.evolve()
+
+    def evolve(self):
+        first_generation = 0
+        if self.resuming:
+            first_generation = self.load_checkpoint()
+        else:
+            self.initialize()
+        generation = 0
+        for generation in range(first_generation, self.generations_max + 1):
+            with self.telemetry.timer("selection"):
+                self.select()
+            with self.telemetry.timer("reproduction"):
+                self.reproduce_and_mutate(generation + 1)
+            self.telemetry.record(generation, self.duels_stats())
+
+            best: C = self.population.chromosomes[0]
+            print(
+                f"Generation {generation:05}: {best.generation}_{best.id} ({self.scores[0]})"
+            )
+            print(str(self.scores))
+
+            self.save_best(generation, best)
+
+            if (generation + 1) % CHECKPOINT_INTERVAL == 0:
+                self.save_checkpoint(generation + 1)
+
+    def save_best(self, generation: int, best: Chromosome) -> None:
+        with open(f".chromosomes/{generation:05}__best.txt", "w") as f:
+            f.write(str(best))
+
+    def save_checkpoint(self, generation: int) -> None:
+        """Everything needed to go on from `generation` as if never interrupted"""
+        if self.checkpoint_file is None:
+            return
+
+        chromosomes = self.population.chromosomes
+        arrays = {
+            "genomes": self.population.genomes,
+            "scores": np.array(self.scores, dtype=float),
+            "last_scores": np.array(
+                [chromosome.get_last_score() for chromosome in chromosomes],
+                dtype=float,
+            ),
+            "generations": np.array(
+                [chromosome.generation for chromosome in chromosomes], dtype=np.int64
+            ),
+            "ids": np.array([chromosome.id for chromosome in chromosomes]),
+        }
+        meta = {
+            "generation": generation,
+            "population_generation": self.population.generation,
+            "elite_ratio": self.elite_ratio,
+            "chromosome_mutate_ratio": self.chromosome_mutate_ratio,
+            "gene_mutate_ratio": self.gene_mutate_ratio,
+            "crossover_ratio": self.crossover_ratio,
+            "rng": get_rng_states(RNG),
+        }
+        write_checkpoint(self.checkpoint_file, arrays, meta)
+        print(f"Checkpoint {generation:05} saved to {self.checkpoint_file}")
+
+    def load_checkpoint(self) -> int:
+        arrays, meta = read_checkpoint(self.checkpoint_file)  # type: ignore
+        chromosomes = [
+            self._P()._C()(generation=int(generation), genome=genome, id=str(id))
+            for generation, genome, id in zip(
+                arrays["generations"], arrays["genomes"], arrays["ids"]
+            )
+        ]
+        for chromosome, last_score in zip(chromosomes, arrays["last_scores"]):
+            chromosome.set_last_score(float(last_score))
+
+        self.population = self._P()(
+            meta["population_generation"], chromosomes, arrays["genomes"]
+        )
+        self.scores = arrays["scores"].tolist()
+        self.elite_ratio = meta["elite_ratio"]
+        self.chromosome_mutate_ratio = meta["chromosome_mutate_ratio"]
+        self.gene_mutate_ratio = meta["gene_mutate_ratio"]
+        self.crossover_ratio = meta["crossover_ratio"]
+        set_rng_states(RNG, meta["rng"])
+
+        print(f"Resuming at generation {meta['generation']:05}")
+        return meta["generation"]
+
+    def initialize(self) -> None:
+        print("initialize")
+        chromosomes: List[C] = []  # type: ignore
+        if isdir(".bests"):
+            for filename in scandir(".bests"):
+                if filename.is_file():
+                    with open(filename, "r") as f:
+                        chromosomes.append(self._P()._C().from_str(0, f.read()))
+
+        print(f"Read {len(chromosomes)} chromosomes")
+
+        for _ in range(len(chromosomes), self.population_size):
+            chromosomes.append(self._P()._C().random(0, self.chromosome_size))
+
+        print(f"First generation: {len(chromosomes)} chromosomes")
+
+        self.population = self._P()(0, chromosomes)
+        print("initialization done")
+
+    def select(self) -> None:
+        self.compute_fitness()
+
+    def compute_fitness(self) -> None:
+        self.scores = [
+            self.get_score(chromosome) for chromosome in self.population.chromosomes
+        ]
+
+    def get_score(self, chromosome: C) -> float:
+        return chromosome.get_last_score()
+
+    def run_duels(
+        self,
+        launch_duel: Callable,
+        duels: Iterable[Tuple[Any, Tuple]],
+    ) -> Iterator[Tuple[Any, Tuple]]:
+        if self.async_runner is not None:
+            yield from self.async_runner.imap_unordered(duels)
+            return
+
+        self.pool_size = self.read_pool_size()
+        self.evaluation_pool.resize(self.pool_size)
+        self.evaluation_pool.reset_utilisation()
+        yield from self.evaluation_pool.imap_unordered(launch_duel, duels)
+
+    def read_pool_size(self) -> int:
+        if not isfile(POOL_SIZE_FILE):
+            return self.pool_size
+        with open(POOL_SIZE_FILE) as f:
+            content = f.read().strip()
+        if not content.isdigit() or int(content) == 0:
+            print(f"Ignoring {POOL_SIZE_FILE}: {content!r} is no worker count")
+            return self.pool_size
+        return int(content)
+
+    def run_cached_duels(
+        self,
+        launch_duel: Callable,
+        duels: Iterable[Tuple[Tuple[int, int], Tuple]],
+        hashes: List[str],
+    ) -> Iterator[Tuple[Tuple[int, int], Tuple]]:
+        """run_duels, replaying match-ups the cache has enough fresh samples of"""
+        fresh: Iterable[Tuple[Tuple[int, int], Tuple]] = duels
+        if self.cache is not None:
+            fresh = []
+            for (player_1, player_2), args in duels:
+                if hashes[player_1] == hashes[player_2]:
+                    # Mirror match, a genome against itself tells nothing
+                    self.cache.skipped += 1
+                    continue
+                result = self.cache.lookup(hashes[player_1], hashes[player_2])
+                if result is None:
+                    fresh.append(((player_1, player_2), args))
+                else:
+                    yield (player_1, player_2), result
+
+        for (player_1, player_2), result in self.run_duels(launch_duel, fresh):
+            if self.cache is not None:
+                self.cache.add(hashes[player_1], hashes[player_2], result)
+            self.played.append((player_1, player_2, result))
+            yield (player_1, player_2), result
+
+    def pair(self, players: List[int]) -> List[Tuple[int, int]]:
+        if self.matchmaker is None:
+            return list(pairwise(sample(players, len(players))))
+        return self.matchmaker.pair(
+            players, self.standings.scores, self.standings.duels
+        )
+
+    def rounds(
+        self, population_size: int, budget: int
+    ) -> Iterator[Iterable[Tuple[int, int]]]:
+        """Yield the pairs of each round"""
+        if self.racing is None:
+            # One stream, next round duels start as soon as a worker is free
+            yield islice(
+                (
+                    pair
+                    for _ in range(self.rounds_per_generation)
+                    for pair in self.pair(list(range(population_size)))
+                ),
+                budget,
+            )
+            return
+
+        while self.standings.played < budget:
+            contenders = self.racing.contenders(self.standings)
+            if not contenders:
+                return
+            played = self.standings.played
+            pairs = self.pair(contenders)[: budget - self.standings.played]
+            yield pairs
+            if self.standings.played == played:
+                # Only mirror matches were left, the race cannot move any more
+                return
+
+    def play_duels(
+        self,
+        launch_duel: Callable,
+        file_names: List[str],
+        hashes: List[str],
+    ) -> None:
+        population_size = len(file_names)
+        budget = self.duel_budget or self.rounds_per_generation * (population_size // 2)
+        if self.matchmaker is not None:
+            self.matchmaker.reset()
+        self.played = []
+        with self.telemetry.timer("dispatch"):
+            self.dispatch_duels(launch_duel, file_names, hashes, budget)
+        self.telemetry.count("duels", len(self.played))
+        self.telemetry.count("replayed", self.standings.played - len(self.played))
+
+        if self.racing is not None:
+            print(f" raced {self.standings.played}/{budget} duels", end="")
+
+    def dispatch_duels(
+        self,
+        launch_duel: Callable,
+        file_names: List[str],
+        hashes: List[str],
+        budget: int,
+    ) -> None:
+        for pairs in self.rounds(len(file_names), budget):
+            duels = (
+                ((player_1, player_2), (file_names[player_1], file_names[player_2]))
+                for player_1, player_2 in pairs
+            )
+            # Results are folded as soon as each duel ends, whatever the submission order
+            for (player_1, player_2), result in self.run_cached_duels(
+                launch_duel, duels, hashes
+            ):
+                self.standings.add(player_1, player_2, result)
+                print(".", end="", flush=True)
+                if self.standings.is_stable():
+                    print(f" stable after {self.standings.played} duels", end="")
+                    return
+
+    def rate(self) -> List[float]:
+        """Scores of the generation, as folded live by the standings by default"""
+        return self.standings.scores
+
+    def initial_scores(self, hashes: List[str]) -> List[float]:
+        # A child identical to a rated genome starts where an elite copy of it would
+        scores = [
+            chromosome.get_last_score() for chromosome in self.population.chromosomes
+        ]
+        if self.cache is None:
+            return scores
+        return [self.cache.get_score(key, score) for key, score in zip(hashes, scores)]
+
+    def cache_scores(self, hashes: List[str], scores: List[float]) -> None:
+        if self.cache is None:
+            return
+        for key, score in zip(hashes, scores):
+            self.cache.set_score(key, score * self.previous_score_ratio)
+        print(self.cache.report())
+
+    def store_duels(self, hashes: List[str]) -> None:
+        # Only duels really played, not the ones replayed from the cache
+        if self.duel_store is None:
+            return
+        chromosomes = self.population.chromosomes
+        self.duel_store.add_duels(
+            self.population.generation,
+            (
+                (chromosomes[p1], hashes[p1], chromosomes[p2], hashes[p2], result)
+                for p1, p2, result in self.played
+            ),
+        )
+
+    def duels_report(self) -> str:
+        return (self.async_runner or self.evaluation_pool).report()
+
+    def duels_stats(self) -> Dict[str, float]:
+        return (self.async_runner or self.evaluation_pool).stats()
+
+    def sort(
+        self, scores: List[float], chromosomes: List[C]
+    ) -> Tuple[List[float], List[C]]:
+        return unzip(  # type: ignore
+            sorted(
+                zip(scores, chromosomes),
+                key=lambda z: z[0],
+                reverse=True,
+            )
+        )
+
+    def normalize(self, scores: List[float]) -> List[float]:
+        lower_score = min(scores)
+        total = sum([score - lower_score for score in scores])
+        return (
+            [(score - lower_score) / total for score in scores]
+            if total != 0
+            else [1 / len(scores)] * len(scores)
+        )
+
+    def carry(self, chromosome: C) -> C:
+        """Copy of a chromosome for the next generation, its score scaled down"""
+        copy = chromosome.copy()
+        copy.set_last_score(chromosome.get_last_score() * self.previous_score_ratio)
+        return copy  # type: ignore
+
+    def reproduce_and_mutate(self, generation: int) -> None:
+        chromosomes = self.population.chromosomes
+        genomes = self.population.genomes
+        gene_class = self._P()._C()._G()
+
+        order = np.argsort(-np.array(self.scores, dtype=float), kind="stable")
+        self.scores = [self.scores[i] for i in order]
+
+        self.chromosome_mutate_ratio = generation / self.generations_max
+        self.crossover_ratio = 1 - generation / self.generations_max
+
+        elite_size = ceil(self.population_size * self.elite_ratio)
+        new_chromosomes = [self.carry(chromosomes[i]) for i in order[:elite_size]]
+
+        scores = self.normalize(self.scores)
+        pool_size = self.population_size - elite_size
+        parents = order[
+            choice(
+                len(chromosomes),
+                size=pool_size if pool_size % 2 == 0 else pool_size + 1,
+                p=scores,
+            )
+        ]
+
+        children, crossing = gene_class.crossover_population(
+            genomes, parents, self.crossover_ratio
+        )
+        parents, children = parents[:pool_size], children[:pool_size]
+        mutating = RNG.random(pool_size) <= self.chromosome_mutate_ratio
+        gene_class.mutate_population(
+            children, np.flatnonzero(mutating), self.gene_mutate_ratio
+        )
+
+        for i, parent in enumerate(parents):
+            if crossing[i // 2]:
+                child = self._P()._C()(generation=generation, genome=children[i])
+            else:
+                child = self.carry(chromosomes[parent])
+            if mutating[i]:
+                # A mutated copy is a new genome, archived under its own key
+                child.id = str(uuid4())
+                child.generation = generation
+            new_chromosomes.append(child)
+
+        self.population = self._P()(
+            generation,
+            new_chromosomes,
+            np.concatenate([genomes[order[:elite_size]], children]),
+        )
+
+
+class DuelGeneticAlgorithm(GeneticAlgorithm[P], ABC):
+    """Fitness from duels between the chromosomes of each generation"""
+
+    launch_duel: Callable
+
+    def __init__(
+        self,
+        chromosome_size: int,
+        launch_duel: Callable,
+        async_runner: Optional[AsyncDuelRunner] = None,
+        cache: bool = False,
+        cache_file: Optional[str] = None,
+        resume: bool = False,
+        genome_bank: bool = False,
+        racing: bool = False,
+        matchmaking: str = MATCHMAKING,
+        rating: str = "sequential",
+        rating_scale: float = RATING_SCALE,
+        duel_store: Optional[str] = None,
+        telemetry_file: Optional[str] = None,
+        **parameters: Any,
+    ):
+        super().__init__(chromosome_size, **parameters)
+        self.launch_duel = launch_duel
+        self.async_runner = async_runner
+        self.telemetry = Telemetry(telemetry_file)
+        self.rating = rating
+        self.matchmaker = Matchmaker(matchmaking, rating_scale)
+        if racing:
+            self.racing = Racing(self.rounds_per_generation, RACING_CONFIDENCE)
+        if genome_bank:
+            self.genome_bank_file = GENOME_BANK_FILE
+        if cache or cache_file:
+            self.cache = EvaluationCache(
+                CACHE_CAPACITY, CACHE_FRESH_SAMPLES, cache_file
+            )
+        if duel_store:
+            self.duel_store = DuelStore(duel_store)
+            if self.cache is not None:
+                self.cache.store = self.duel_store
+        self.resuming = resume
+        if not resume:
+            rmtree(".chromosomes", ignore_errors=True)
+        makedirs(".chromosomes", exist_ok=True)
+        self.archive = ChromosomeArchive(
+            ARCHIVE_FILE, self._P()._C()._G().dtype, self.chromosome_size
+        )
+
+    def compute_fitness(self) -> None:
+        with self.telemetry.timer("encode"):
+            self.population.encode(self.archive, self.genome_bank_file)
+        population_size = len(self.population.chromosomes)
+        hashes = [chromosome.get_hash() for chromosome in self.population.chromosomes]
+        self.standings = Standings(
+            self.initial_scores(hashes),
+            self.fold(),
+            ceil(population_size * self.elite_ratio),
+            STANDINGS_PATIENCE,
+        )
+
+        # Genomes are published once per generation by encode(), jobs only carry paths
+        file_names = self.population.get_file_names(self.genome_bank_file)
+        self.play_duels(self.launch_duel, file_names, hashes)
+
+        print("\n", end="", flush=True)
+        with self.telemetry.timer("rating"):
+            scores = self.rate()
+        self.standings.scores[:] = scores
+        print(self.standings)
+        if self.matchmaker is not None:
+            print(self.matchmaker.report())
+        print(self.duels_report())
+
+        for i in range(population_size):
+            self.population.chromosomes[i].set_last_score(scores[i])
+        self.cache_scores(hashes, scores)
+        self.store_duels(hashes)
+
+        self.scores = scores
+
+    def fold(self) -> Callable[[List[float], int, int, Tuple], None]:
+        return self.fold_duel
+
+    @abstractmethod
+    def fold_duel(
+        self, scores: List[float], player_1: int, player_2: int, result: Tuple
+    ) -> None:
+        """Fold the result of one duel into the live scores of both players"""
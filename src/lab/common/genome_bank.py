@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+import struct
+
+import numpy as np
+
+# The whole population, pre-decoded, in one file the bots memory-map: a HEADER
+# then a (rows x length) matrix. A bot is given "<path>#<row>" instead of a
+# chromosome file, ai.py reads its row with the standard library only.
+MAGIC = b"GENB"
+VERSION = 1
+HEADER = struct.Struct("<4sH16sII2x")
+SEPARATOR = "#"
+
+
+def bank_argument(path: str, row: int) -> str:
+    return f"{path}{SEPARATOR}{row}"
+
+
+def is_bank_argument(argument: str) -> bool:
+    return SEPARATOR in argument
+
+
+def write_genome_bank(path: str, genomes: np.ndarray) -> None:
+    # Replace, never rewrite: bots still mapping the previous bank keep their pages
+    rows, length = genomes.shape
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, genomes.dtype.str.encode(), rows, length))
+        f.write(np.ascontiguousarray(genomes).tobytes())
+    os.replace(temporary, path)
+
+
+def read_genome_bank(argument: str) -> np.ndarray:
+    path, row = argument.rsplit(SEPARATOR, 1)
+    with open(path, "rb") as f:
+        magic, version, dtype, rows, length = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a genome bank (v{VERSION}): {magic!r}")
+    bank = np.memmap(
+        path,
+        dtype=dtype.rstrip(b"\0").decode(),
+        mode="r",
+        offset=HEADER.size,
+        shape=(rows, length),
+    )
+    return np.array(bank[int(row)])
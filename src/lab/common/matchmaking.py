@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import Counter
+from math import sqrt
+from random import random, sample
+from typing import List, Sequence, Set, Tuple
+
+STRATEGIES = ("random", "swiss", "information")
+
+
+def expected_score(rating_1: float, rating_2: float, scale: float) -> float:
+    return 1 / (1 + 10 ** ((rating_2 - rating_1) / scale))
+
+
+def uncertainty(duels: int) -> float:
+    return 1 / sqrt(1 + duels)
+
+
+def information(
+    rating_1: float, rating_2: float, duels_1: int, duels_2: int, scale: float
+) -> float:
+    # Outcome variance p(1-p) peaks for even match-ups, worth more between barely rated
+    p = expected_score(rating_1, rating_2, scale)
+    return p * (1 - p) * (uncertainty(duels_1) + uncertainty(duels_2))
+
+
+class Matchmaker:
+    strategy: str
+    scale: float
+    met: Counter
+    rounds: List[float]
+
+    def __init__(self, strategy: str, scale: float):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown matchmaking {strategy}, not in {STRATEGIES}")
+        self.strategy = strategy
+        self.scale = scale
+        self.reset()
+
+    def reset(self) -> None:
+        self.met = Counter()
+        self.rounds = []
+
+    def pair(
+        self, players: List[int], ratings: Sequence[float], duels: Sequence[int]
+    ) -> List[Tuple[int, int]]:
+        """Pair the players for one round, recording its expected information"""
+        if self.strategy == "swiss":
+            pairs = self.swiss(players, ratings)
+        elif self.strategy == "information":
+            pairs = self.most_informative(players, ratings, duels)
+        else:
+            shuffled = sample(players, len(players))
+            pairs = list(zip(shuffled[0::2], shuffled[1::2]))
+
+        self.met.update(tuple(sorted(pair)) for pair in pairs)
+        self.rounds.append(
+            sum(
+                information(ratings[a], ratings[b], duels[a], duels[b], self.scale)
+                for a, b in pairs
+            )
+        )
+        return pairs
+
+    def swiss(
+        self, players: List[int], ratings: Sequence[float]
+    ) -> List[Tuple[int, int]]:
+        # Neighbours in the standings meet, random tie-break between equal ratings:
+        # from the top, each player takes the next one down it met the least
+        ranked = sorted(players, key=lambda i: (-ratings[i], random()))
+        pairs = []
+        while len(ranked) > 1:
+            player = ranked.pop(0)
+            opponent = min(
+                ranked,
+                key=lambda other: self.met[(min(player, other), max(player, other))],
+            )
+            ranked.remove(opponent)
+            pairs.append((player, opponent))
+        return pairs
+
+    def most_informative(
+        self, players: List[int], ratings: Sequence[float], duels: Sequence[int]
+    ) -> List[Tuple[int, int]]:
+        # Greedy matching on information, shared by the times the pair already met
+        candidates = sorted(
+            (
+                information(ratings[a], ratings[b], duels[a], duels[b], self.scale)
+                / (1 + self.met[(min(a, b), max(a, b))]),
+                random(),
+                a,
+                b,
+            )
+            for i, a in enumerate(players)
+            for b in players[i + 1 :]
+        )
+        paired: Set[int] = set()
+        pairs = []
+        for _, _, a, b in reversed(candidates):
+            if a not in paired and b not in paired:
+                paired.update((a, b))
+                pairs.append((a, b))
+        return pairs
+
+    def report(self) -> str:
+        if not self.rounds:
+            return f"Matchmaking {self.strategy}: no round"
+        return (
+            f"Matchmaking {self.strategy}: expected information per round "
+            + " ".join(f"{value:.2f}" for value in self.rounds)
+        )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from math import inf, sqrt
+from random import choice
+from statistics import stdev
+from typing import List, Protocol
+
+import numpy as np
+
+
+class RacedStandings(Protocol):
+    scores: List[float]
+    gains: List[List[float]]
+    elite_size: int
+
+
+# Successive rounds restricted to the chromosomes still racing for the elite: a
+# score may still move by confidence x the spread of its per-duel gains x sqrt(duels
+# left), a chromosome leaves the race once that interval is surely in or out.
+class Racing:
+    max_duels: int
+    confidence: float
+    min_duels: int
+
+    def __init__(self, max_duels: int, confidence: float, min_duels: int = 2):
+        self.max_duels = max_duels
+        self.confidence = confidence
+        self.min_duels = min_duels
+
+    def margin(self, gains: List[float]) -> float:
+        if len(gains) < self.min_duels:
+            return inf
+        remaining = max(self.max_duels - len(gains), 0)
+        return self.confidence * stdev(gains) * sqrt(remaining)
+
+    def undecided(self, standings: RacedStandings) -> List[int]:
+        scores = np.array(standings.scores, dtype=float)
+        margins = np.array([self.margin(gains) for gains in standings.gains])
+        lower, upper = scores - margins, scores + margins
+        others = ~np.eye(len(scores), dtype=bool)
+
+        # In: fewer than elite_size others may still end above its lowest score
+        surely_in = ((upper[None, :] > lower[:, None]) & others).sum(axis=1)
+        # Out: at least elite_size others surely end above its highest score
+        surely_out = ((lower[None, :] > upper[:, None]) & others).sum(axis=1)
+        decided = (surely_in < standings.elite_size) | (
+            surely_out >= standings.elite_size
+        )
+        return np.flatnonzero(~decided).tolist()
+
+    def contenders(self, standings: RacedStandings) -> List[int]:
+        """Undecided chromosomes with duels left, plus a sparring partner if odd"""
+        contenders = [
+            i
+            for i in self.undecided(standings)
+            if len(standings.gains[i]) < self.max_duels
+        ]
+        if len(contenders) % 2 == 1:
+            others = [i for i in range(len(standings.scores)) if i not in contenders]
+            if others:
+                contenders.append(choice(others))
+            else:
+                contenders.pop()
+        return contenders
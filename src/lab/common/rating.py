@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Order-independent ratings of a whole generation. Every function takes the
+# initial scores, the (m x 2) players of each duel and one row per duel result.
+
+
+def point_totals(
+    initial: np.ndarray, pairs: np.ndarray, points: np.ndarray
+) -> np.ndarray:
+    totals = np.array(initial, dtype=float)
+    np.add.at(totals, np.asarray(pairs).reshape(-1), np.asarray(points).reshape(-1))
+    return totals
+
+
+def expected_shares(ratings: np.ndarray, pairs: np.ndarray, scale: float) -> np.ndarray:
+    ratings = np.asarray(ratings, dtype=float)
+    return 1 / (1 + 10 ** ((ratings[pairs[:, 1]] - ratings[pairs[:, 0]]) / scale))
+
+
+def batch_elo(
+    initial: np.ndarray,
+    pairs: np.ndarray,
+    shares: np.ndarray,
+    k: float = 32,
+    scale: float = 400,
+) -> np.ndarray:
+    """Elo with every duel expected from the ratings at the start of the generation"""
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    surprise = k * (
+        np.asarray(shares, dtype=float) - expected_shares(initial, pairs, scale)
+    )
+    ratings = np.array(initial, dtype=float)
+    np.add.at(ratings, pairs[:, 0], surprise)
+    np.add.at(ratings, pairs[:, 1], -surprise)
+    return ratings
+
+
+def bradley_terry(
+    initial: np.ndarray,
+    pairs: np.ndarray,
+    shares: np.ndarray,
+    scale: float = 400,
+    prior: float = 1.0,
+    iterations: int = 200,
+    tolerance: float = 1e-9,
+) -> np.ndarray:
+    """Maximum likelihood strengths by minorization-maximization, on the Elo scale"""
+    # Each player also plays `prior` virtual duels against a reference at the mean
+    # initial rating, scored as its initial rating predicts: this anchors the scale
+    # and keeps unbeaten or winless players finite
+    initial = np.asarray(initial, dtype=float)
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    shares = np.asarray(shares, dtype=float)
+    count = len(initial)
+    reference = initial.mean() if count else 0.0
+
+    games = np.zeros((count, count))
+    np.add.at(games, (pairs[:, 0], pairs[:, 1]), 1)
+    games += games.T
+    wins = np.zeros(count)
+    np.add.at(wins, pairs[:, 0], shares)
+    np.add.at(wins, pairs[:, 1], 1 - shares)
+    wins += prior / (1 + 10 ** ((reference - initial) / scale))
+
+    strengths = 10 ** ((initial - reference) / scale)
+    for _ in range(iterations):
+        sums = strengths[:, None] + strengths[None, :]
+        denominator = (games / sums).sum(axis=1) + prior / (strengths + 1)
+        updated = wins / denominator
+        if np.max(np.abs(updated - strengths) / strengths) < tolerance:
+            strengths = updated
+            break
+        strengths = updated
+
+    return reference + scale * np.log10(strengths)
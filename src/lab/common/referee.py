@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Line protocol spoken by a referee server:
+#   parent -> referee: one match per line, the match arguments separated by spaces
+#   referee -> parent: the output a one-shot referee would print, then END_OF_MATCH
+# A referee server exits once its stdin is closed.
+# The game referees have no server entry point, RefereeSession runs programs
+# speaking the protocol, like the projects' stub_referee.py.
+END_OF_MATCH = "END_OF_MATCH"
+
+# What a failed referee run may raise, anything else (e.g. Ctrl-C) propagates
+DUEL_ERRORS = (OSError, ValueError, IndexError, SyntaxError, subprocess.SubprocessError)
+
+
+class RefereeError(Exception):
+    pass
+
+
+class RefereeWorker:
+    command: List[str]
+    timeout: float
+    process: Optional[subprocess.Popen]
+    lines: Queue
+    matches: int
+    restarts: int
+
+    def __init__(self, command: List[str], timeout: float = 60):
+        self.command = command
+        self.timeout = timeout
+        self.process = None
+        self.lines = Queue()
+        self.matches = 0
+        self.restarts = 0
+
+    def start(self) -> None:
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+            # A thread reads the output, so a hung referee cannot block play()
+            self.lines = Queue()
+            Thread(
+                target=read_lines, args=(self.process, self.lines), daemon=True
+            ).start()
+
+    def restart(self) -> None:
+        self.close()
+        self.restarts += 1
+        self.start()
+
+    def close(self) -> None:
+        if self.process is None:
+            return
+
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.close()  # type: ignore
+                self.process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def play(self, args: Tuple[str, ...]) -> List[str]:
+        self.start()
+        process: subprocess.Popen = self.process  # type: ignore
+        try:
+            process.stdin.write(" ".join(args) + "\n")  # type: ignore
+            process.stdin.flush()  # type: ignore
+        except OSError as err:
+            raise RefereeError(f"Referee {process.pid} is gone: {err}")
+
+        lines: List[str] = []
+        deadline = perf_counter() + self.timeout
+        while True:
+            try:
+                line = self.lines.get(timeout=max(0.0, deadline - perf_counter()))
+            except Empty:
+                raise RefereeError(f"Referee {process.pid} timed out ({self.timeout}s)")
+            if line is None:
+                raise RefereeError(f"Referee {process.pid} exited ({process.wait()})")
+            if line == END_OF_MATCH:
+                self.matches += 1
+                return lines
+            lines.append(line)
+
+
+def read_lines(process: subprocess.Popen, lines: Queue) -> None:
+    for line in process.stdout:  # type: ignore
+        lines.put(line.rstrip("\n"))
+    lines.put(None)
+
+
+class RefereeSession:
+    command: List[str]
+    size: int
+    parse: Callable[[List[str]], Tuple]
+    default: Tuple
+    arguments: Optional[Callable[..., Tuple[str, ...]]]
+    timeout: float
+    retries: int
+    workers: List[RefereeWorker]
+    idle: Queue
+    executor: Optional[ThreadPoolExecutor]
+    lock: Lock
+    counters: Dict[str, float]
+
+    def __init__(
+        self,
+        command: List[str],
+        size: int,
+        parse: Callable[[List[str]], Tuple],
+        default: Tuple,
+        arguments: Optional[Callable[..., Tuple[str, ...]]] = None,
+        timeout: float = 60,
+        retries: int = 3,
+    ):
+        self.command = command
+        self.size = size
+        self.parse = parse
+        self.default = default
+        self.arguments = arguments
+        self.timeout = timeout
+        self.retries = retries
+        self.workers = []
+        self.idle = Queue()
+        self.executor = None
+        self.lock = Lock()
+        self.counters = {"referee": 0.0, "parsing": 0.0, "retries": 0, "failures": 0}
+
+    def __enter__(self) -> RefereeSession:
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict:
+        # Referee processes and threads stay in the parent process
+        return {
+            **self.__dict__,
+            "workers": [],
+            "idle": None,
+            "executor": None,
+            "lock": None,
+        }
+
+    def start(self) -> None:
+        if self.executor is not None:
+            return
+
+        self.workers = [
+            RefereeWorker(self.command, self.timeout) for _ in range(self.size)
+        ]
+        for worker in self.workers:
+            worker.start()
+            self.idle.put(worker)
+        self.executor = ThreadPoolExecutor(self.size, thread_name_prefix="referee")
+
+    def resize(self, size: int) -> None:
+        if size != self.size:
+            self.close()
+            self.size = size
+        self.start()
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
+        self.idle = Queue()
+
+    def play(self, args: Tuple[str, ...]) -> Tuple:
+        if self.arguments is not None:
+            args = self.arguments(*args)
+        worker: RefereeWorker = self.idle.get()
+        try:
+            for attempt in range(self.retries):
+                if attempt > 0:
+                    self.account("retries", 1)
+                started = perf_counter()
+                try:
+                    lines = worker.play(args)
+                    parsing = perf_counter()
+                    self.account("referee", parsing - started)
+                    result = self.parse(lines)
+                    self.account("parsing", perf_counter() - parsing)
+                    return result
+                except RefereeError as err:
+                    print(f"Restarting referee: {err}")
+                    worker.restart()
+                except DUEL_ERRORS as err:
+                    print(f"Unexpected referee output {err=}")
+            self.account("failures", 1)
+            return self.default
+        finally:
+            self.idle.put(worker)
+
+    def account(self, key: str, value: float) -> None:
+        with self.lock:
+            self.counters[key] += value
+
+    def imap_unordered(
+        self, tasks: Iterable[Tuple[Any, Tuple[str, ...]]]
+    ) -> Iterator[Tuple[Any, Tuple]]:
+        """Yield (key, result) in completion order, one match in flight per referee"""
+        self.start()
+        running: Dict[Future, Any] = {}
+        pending = iter(tasks)
+        try:
+            while True:
+                for key, args in pending:
+                    running[self.executor.submit(self.play, args)] = key  # type: ignore
+                    if len(running) >= self.size:
+                        break
+                if not running:
+                    return
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield running.pop(future), future.result()
+        finally:
+            wait(running)
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            return {"workers": self.size, **self.counters}
+
+    def report(self) -> str:
+        return (
+            "Referees ["
+            + ", ".join(
+                f"{worker.matches} matches/{worker.restarts} restarts"
+                for worker in self.workers
+            )
+            + "]"
+        )
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from statistics import mean
+from time import perf_counter, time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Throughputs, the higher the better, and costs, the lower the better; other
+# metrics (duel counts) describe the run without being good or bad
+HIGHER_IS_BETTER = ("duels_per_second", "utilisation")
+LOWER_IS_BETTER = ("retries", "failures", "timeouts")
+NOT_METRICS = ("generation", "time")
+
+
+class Telemetry:
+    path: Optional[str]
+    timings: Dict[str, float]
+    counters: Dict[str, int]
+    backend: Dict[str, float]
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.backend = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.timings = defaultdict(float)
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += perf_counter() - started
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def record(self, generation: int, backend: Dict[str, float]) -> Dict:
+        """Metrics of one generation, appended as a JSON line when a path is set"""
+        # Backends count since they started, a generation gets the difference
+        spent = {
+            key: value - self.backend.get(key, 0)
+            for key, value in backend.items()
+            if key != "workers"
+        }
+        self.backend = dict(backend)
+
+        record: Dict = {"generation": generation, "time": round(time(), 3)}
+        record.update(
+            (f"{name}_seconds", round(seconds, 6))
+            for name, seconds in self.timings.items()
+        )
+        record.update(self.counters)
+        dispatch = self.timings.get("dispatch", 0.0)
+        duels = self.counters.get("duels", 0)
+        record["duels_per_second"] = round(duels / dispatch, 3) if dispatch else 0.0
+        if "referee" in spent:
+            record["referee_seconds"] = round(spent["referee"], 6)
+            workers = backend.get("workers", 1)
+            record["utilisation"] = (
+                round(spent["referee"] / (workers * dispatch), 4) if dispatch else 0.0
+            )
+        if "parsing" in spent:
+            record["parsing_seconds"] = round(spent["parsing"], 6)
+        for key in ("retries", "failures", "timeouts"):
+            if key in spent:
+                record[key] = int(spent[key])
+        self.reset()
+
+        if self.path is not None:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+
+
+def read_telemetry(path: str) -> List[Dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records: List[Dict]) -> Dict[str, float]:
+    """Mean of every metric over the generations"""
+    values: Dict[str, List[float]] = defaultdict(list)
+    for record in records:
+        for key, value in record.items():
+            if key not in NOT_METRICS:
+                values[key].append(value)
+    return {key: mean(samples) for key, samples in sorted(values.items())}
+
+
+def compare(
+    run: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> List[Tuple[str, float, float, float, bool]]:
+    """(metric, run, baseline, relative change, regression) of the shared metrics"""
+    rows = []
+    for key in sorted(run.keys() & baseline.keys()):
+        change = (run[key] - baseline[key]) / baseline[key] if baseline[key] else 0.0
+        if key in HIGHER_IS_BETTER:
+            regression = -change > threshold
+        elif key in LOWER_IS_BETTER or key.endswith("_seconds"):
+            regression = change > threshold
+        else:
+            regression = False
+        rows.append((key, run[key], baseline[key], change, regression))
+    return rows
+
+
+def format_report(
+    run: str, baseline: Optional[str] = None, threshold: float = 0.1
+) -> str:
+    records = read_telemetry(run)
+    summary = summarize(records)
+    lines = [f"{run}: {len(records)} generations"]
+    if baseline is None:
+        lines += [f"  {key:<24}{value:>14.4f}" for key, value in summary.items()]
+        return "\n".join(lines)
+
+    baseline_records = read_telemetry(baseline)
+    lines[0] += f", {baseline}: {len(baseline_records)} generations"
+    for key, value, reference, change, regression in compare(
+        summary, summarize(baseline_records), threshold
+    ):
+        lines.append(
+            f"  {key:<24}{value:>14.4f}{reference:>14.4f}{change:>+9.1%}"
+            + ("  REGRESSION" if regression else "")
+        )
+    return "\n".join(lines)
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from chromosome_archive import ChromosomeArchive
+
+
+def chromosome(id: str, generation: int, value: int) -> SimpleNamespace:
+    return SimpleNamespace(id=id, generation=generation, genome=np.full(4, value))
+
+
+def test_duplicates_in_a_batch_are_archived_once(tmp_path):
+    path = str(tmp_path / "archive.bin")
+    archive = ChromosomeArchive(path, np.int8, 4)
+    assert archive.append([chromosome("a", 1, 1), chromosome("a", 1, 1)]) == 1
+    assert archive.append([chromosome("b", 1, 2), chromosome("a", 1, 1)]) == 1
+    assert archive.append([chromosome("c", 1, 3), chromosome("c", 1, 3)]) == 1
+
+    for archive in (archive, ChromosomeArchive.open(path)):
+        assert len(archive) == len(archive.records()) == 3
+        assert [archive.get(id)[0] for id in "abc"] == [1, 2, 3]
+        assert archive.generations["a"] == [1]
+
+
+def test_numbers_follow_the_records_in_the_file(tmp_path):
+    path = str(tmp_path / "archive.bin")
+    ChromosomeArchive(path, np.int8, 4).append([chromosome("a", 1, 1)])
+
+    # An archive opened before another writer appended keeps numbering right
+    stale = ChromosomeArchive(path, np.int8, 4)
+    ChromosomeArchive(path, np.int8, 4).append([chromosome("b", 1, 2)])
+    stale.append([chromosome("c", 1, 3)])
+
+    archive = ChromosomeArchive.open(path)
+    assert [archive.get(id)[0] for id in "abc"] == [1, 2, 3]
@@ -0,0 +1,45 @@
+from time import sleep
+
+from evaluation_pool import EvaluationPool
+
+
+def test_evaluation_pool():
+    with EvaluationPool(2) as evaluation_pool:
+        results = [evaluation_pool.apply_async(pow, (i, 2)) for i in range(6)]
+        assert [evaluation_pool.get(result) for result in results] == [
+            i**2 for i in range(6)
+        ]
+        assert sum(evaluation_pool.tasks.values()) == 6
+        assert 1 <= len(evaluation_pool.utilisation()) <= 2
+        assert 0 <= evaluation_pool.idle_ratio() <= 1
+
+    assert evaluation_pool.pool is None
+
+
+def test_evaluation_pool_resize():
+    evaluation_pool = EvaluationPool(1)
+    try:
+        evaluation_pool.start()
+        pool = evaluation_pool.pool
+        evaluation_pool.resize(1)
+        assert evaluation_pool.pool is pool
+
+        evaluation_pool.resize(2)
+        assert evaluation_pool.pool is not pool
+        assert evaluation_pool.size == 2
+        assert evaluation_pool.get(evaluation_pool.apply_async(sleep, (0.01,))) is None
+    finally:
+        evaluation_pool.close()
+
+
+def test_evaluation_pool_imap_unordered():
+    tasks = [(i, (0.05 * (3 - i),)) for i in range(4)]
+    with EvaluationPool(4) as evaluation_pool:
+        keys = [key for key, _ in evaluation_pool.imap_unordered(sleep, tasks)]
+
+        assert sorted(keys) == [0, 1, 2, 3]
+        assert keys[0] == 3
+
+        for key, _ in evaluation_pool.imap_unordered(sleep, tasks, window=1):
+            break
+        assert key == 0
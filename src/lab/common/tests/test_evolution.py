@@ -0,0 +1,99 @@
+import numpy as np
+
+from evolution import (
+    POOL_SIZE_FILE,
+    RNG,
+    Chromosome,
+    DuelGeneticAlgorithm,
+    Gene,
+    GeneticAlgorithm,
+    Population,
+)
+
+
+class CountGene(Gene):
+    dtype = np.int8
+
+    @classmethod
+    def random_genome(cls, shape) -> np.ndarray:
+        return RNG.integers(0, 9, size=shape, dtype=cls.dtype, endpoint=True)
+
+    @classmethod
+    def encode_genome(cls, genome: np.ndarray) -> str:
+        return "".join(str(value) for value in genome)
+
+    @classmethod
+    def decode_genome(cls, string: str) -> np.ndarray:
+        return np.array([int(value) for value in string], dtype=cls.dtype)
+
+    @classmethod
+    def crossover_genomes(cls, weight, inv_weight, genome_1, genome_2):
+        return genome_2.copy(), genome_1.copy()
+
+    @classmethod
+    def mutate_values(cls, values: np.ndarray) -> np.ndarray:
+        return cls.random_genome(values.shape)
+
+
+class CountChromosome(Chromosome[CountGene]):
+    pass
+
+
+class CountPopulation(Population[CountChromosome]):
+    pass
+
+
+def count_duel(file_name_1: str, file_name_2: str):
+    totals = [
+        sum(int(value) for value in open(name).read())
+        for name in (file_name_1, file_name_2)
+    ]
+    return totals[0], totals[1]
+
+
+class CountGeneticAlgorithm(DuelGeneticAlgorithm[CountPopulation]):
+    def run_duels(self, launch_duel, duels):
+        for key, args in duels:
+            yield key, launch_duel(*args)
+
+    def fold_duel(self, scores, player_1, player_2, result):
+        scores[player_1] += np.sign(result[0] - result[1])
+        scores[player_2] += np.sign(result[1] - result[0])
+
+
+def test_duel_fitness(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    algorithm = CountGeneticAlgorithm(
+        4, count_duel, population_size=6, rounds_per_generation=5
+    )
+    genomes = np.repeat(np.arange(6, dtype=np.int8)[:, None], 4, axis=1)
+    algorithm.population = CountPopulation(
+        0, [CountChromosome(0, genome) for genome in genomes], genomes
+    )
+    algorithm.compute_fitness()
+
+    assert algorithm.standings.played == 15
+    assert algorithm.population.chromosomes[5].get_last_score() == max(algorithm.scores)
+    assert (tmp_path / ".chromosomes" / "005.txt").read_text() == "5555"
+    assert len(algorithm.archive) == 6
+
+
+class PoolGeneticAlgorithm(GeneticAlgorithm[CountPopulation]):
+    pass
+
+
+def test_pool_size_file_resizes_the_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    algorithm = PoolGeneticAlgorithm(4, pool_size=1)
+    with algorithm.evaluation_pool:
+        assert list(algorithm.run_duels(pow, [(0, (2, 3))])) == [(0, 8)]
+        pool = algorithm.evaluation_pool.pool
+
+        (tmp_path / POOL_SIZE_FILE).write_text("none\n")
+        assert list(algorithm.run_duels(pow, [(1, (3, 2))])) == [(1, 9)]
+        assert algorithm.evaluation_pool.pool is pool
+
+        (tmp_path / POOL_SIZE_FILE).write_text("2\n")
+        assert list(algorithm.run_duels(pow, [(2, (2, 2))])) == [(2, 4)]
+        assert algorithm.pool_size == algorithm.evaluation_pool.size == 2
+        assert algorithm.evaluation_pool.pool is not pool
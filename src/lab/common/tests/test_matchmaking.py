@@ -0,0 +1,56 @@
+import pytest
+
+from matchmaking import Matchmaker, expected_score, information
+
+
+def test_information():
+    assert expected_score(1200, 1200, 400) == 0.5
+    assert expected_score(1600, 1200, 400) == pytest.approx(10 / 11)
+    assert information(1200, 1200, 0, 0, 400) > information(1600, 1200, 0, 0, 400)
+    assert information(1200, 1200, 0, 0, 400) > information(1200, 1200, 9, 9, 400)
+
+
+def test_swiss():
+    matchmaker = Matchmaker("swiss", 400)
+    ratings = [1000, 1400, 1100, 1300]
+
+    assert matchmaker.pair([0, 1, 2, 3], ratings, [0] * 4) == [(1, 3), (2, 0)]
+    assert len(matchmaker.rounds) == 1
+
+
+def test_swiss_avoids_rematches():
+    matchmaker = Matchmaker("swiss", 400)
+    ratings = [1000 + 10 * i for i in range(8)]
+
+    for _ in range(7):
+        matchmaker.pair(list(range(8)), ratings, [0] * 8)
+    assert len(matchmaker.met) == 28
+    assert set(matchmaker.met.values()) == {1}
+
+    # Once everyone met, the least met opponent is taken
+    matchmaker.pair(list(range(8)), ratings, [0] * 8)
+    assert set(matchmaker.met.values()) == {1, 2}
+
+
+def test_most_informative():
+    matchmaker = Matchmaker("information", 400)
+    ratings = [1000, 1300, 1010, 1290]
+
+    pairs = matchmaker.pair([0, 1, 2, 3], ratings, [0] * 4)
+    assert sorted(tuple(sorted(pair)) for pair in pairs) == [(0, 2), (1, 3)]
+
+    # Rematches are worth less, far apart players end up meeting
+    for _ in range(20):
+        pairs = matchmaker.pair([0, 1, 2, 3], ratings, [0] * 4)
+    assert matchmaker.met[(0, 1)] + matchmaker.met[(0, 3)] > 0
+    assert matchmaker.rounds[0] >= matchmaker.rounds[-1]
+
+
+def test_random():
+    matchmaker = Matchmaker("random", 400)
+    pairs = matchmaker.pair(list(range(5)), [1200] * 5, [0] * 5)
+
+    assert len(pairs) == 2
+    assert matchmaker.report().startswith("Matchmaking random: expected information")
+    with pytest.raises(ValueError):
+        Matchmaker("elo", 400)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from rating import batch_elo, bradley_terry
+
+PAIRS = np.array([(0, 1), (1, 2), (2, 0), (0, 2)])
+
+
+def test_batch_elo_is_order_independent():
+    shares = np.array([1.0, 0.3, 0.5, 0.9])
+    ratings = batch_elo([1200, 1200, 1300], PAIRS, shares)
+    order = [3, 1, 0, 2]
+    shuffled = batch_elo([1200, 1200, 1300], PAIRS[order], shares[order])
+
+    assert ratings == pytest.approx(shuffled)
+    assert ratings.sum() == pytest.approx(3700)
+    assert ratings[0] > 1200
+
+
+def test_bradley_terry():
+    rng = np.random.default_rng(0)
+    strengths = np.array([0.0, 200.0, 400.0, 600.0])
+    pairs = rng.integers(0, 4, size=(4000, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    expected = 1 / (1 + 10 ** ((strengths[pairs[:, 1]] - strengths[pairs[:, 0]]) / 400))
+    shares = (rng.random(len(pairs)) < expected).astype(float)
+
+    ratings = bradley_terry(np.full(4, 1200.0), pairs, shares)
+    assert np.argsort(ratings).tolist() == [0, 1, 2, 3]
+    assert np.diff(ratings) == pytest.approx([200, 200, 200], abs=40)
+
+    # Without duels, the prior keeps the initial ratings
+    assert bradley_terry([1100.0, 1300.0], np.empty((0, 2)), []) == pytest.approx(
+        [1100, 1300]
+    )
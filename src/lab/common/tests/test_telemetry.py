@@ -0,0 +1,45 @@
+import json
+
+from telemetry import Telemetry, compare, format_report, read_telemetry, summarize
+
+
+def test_telemetry_record(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+    telemetry = Telemetry(str(path))
+    for generation, referee in enumerate([3.0, 7.0]):
+        with telemetry.timer("encode"):
+            telemetry.timings["dispatch"] = 2.0
+        telemetry.count("duels", 10)
+        telemetry.record(generation, {"workers": 2, "referee": referee, "failures": 1})
+
+    first, second = read_telemetry(str(path))
+    assert first["dispatch_seconds"] == 2.0 and first["encode_seconds"] >= 0
+    assert first["duels_per_second"] == 5.0
+    assert first["utilisation"] == 0.75
+    # Backend counters are cumulative, each generation gets its own share
+    assert second["referee_seconds"] == 4.0
+    assert second["utilisation"] == 1.0
+    assert (first["failures"], second["failures"]) == (1, 0)
+    assert second["duels"] == 10
+
+
+def test_compare():
+    baseline = {"dispatch_seconds": 10.0, "duels_per_second": 5.0, "duels": 100}
+    run = {"dispatch_seconds": 10.5, "duels_per_second": 4.0, "duels": 200}
+    rows = {key: regression for key, _, _, _, regression in compare(run, baseline, 0.1)}
+    assert rows == {"dispatch_seconds": False, "duels_per_second": True, "duels": False}
+
+
+def test_format_report(tmp_path):
+    run, baseline = tmp_path / "run.jsonl", tmp_path / "baseline.jsonl"
+    run.write_text(json.dumps({"generation": 0, "encode_seconds": 2.0}) + "\n")
+    baseline.write_text(
+        "".join(
+            json.dumps({"generation": i, "encode_seconds": seconds}) + "\n"
+            for i, seconds in enumerate([1.0, 1.0])
+        )
+    )
+
+    assert summarize(read_telemetry(str(baseline))) == {"encode_seconds": 1.0}
+    report = format_report(str(run), str(baseline))
+    assert "encode_seconds" in report and "+100.0%  REGRESSION" in report
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+import os
+from hashlib import blake2b
+
+# A Python engine scores duels only once validate-engine replayed games of the
+# Java referee with it: the record ties the games reproduced to the engine source.
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def save_validation(path: str, engine: str, games: int) -> None:
+    with open(path, "w") as f:
+        json.dump({"engine": file_hash(engine), "games": games}, f)
+
+
+def check_validation(path: str, engine: str, games: int) -> None:
+    """ValueError unless the engine source reproduced that many Java games"""
+    name = os.path.basename(engine)
+    if not os.path.exists(path):
+        raise ValueError(f"{name} was never validated, run validate-engine")
+    with open(path) as f:
+        record = json.load(f)
+    if record["engine"] != file_hash(engine):
+        raise ValueError(f"{name} changed since its validation, run validate-engine")
+    if record["games"] < games:
+        raise ValueError(
+            f"{name} reproduced {record['games']} games of the {games} needed,"
+            " run validate-engine"
+        )
@@ -1,9 +1,29 @@
 from __future__ import annotations
 
+import json
+import mmap
+import os
+import struct
 import sys
+from array import array
 from enum import Enum
+from functools import lru_cache
 from traceback import print_stack
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+
+@lru_cache(maxsize=None)
+def numpy() -> Any:
+    """NumPy for the matrix products, None without it
+
+    Imported on first use only: a bot started in sparse mode, as the referee
+    launches them, never pays for its import.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
 
 
 def debug(message: str) -> None:
@@ -64,6 +84,8 @@ def compute_synapses_count(
 
 class NeuralNetwork:
     layers: List[Layer]
+    matrices: List
+    columns: List[List[Tuple[Tuple[int, ...], Tuple[int, ...]]]]
 
     def __init__(
         self,
@@ -71,6 +93,7 @@ class NeuralNetwork:
         inputs_count: int,
         hiddens_counts: List[int],
         outputs_count: int,
+        sparse: Optional[bool] = None,
     ) -> None:
         synapses_count = compute_synapses_count(
             inputs_count, hiddens_counts, outputs_count
@@ -126,13 +149,77 @@ class NeuralNetwork:
 
         my_assert(shift == len(weights), f"shift {shift} != weights {len(weights)}")
 
+        # Sparse mode, the default without NumPy: per layer and input, the neurons
+        # it feeds with a non-zero weight, so a turn costs its non-zero products
+        self.columns = []
+        np = None if sparse else numpy()
+        if sparse or np is None:
+            for layer in self.layers:
+                columns = []
+                for input_index in range(len(layer.neurons[0].weights)):
+                    synapses = [
+                        (neuron_index, neuron.weights[input_index])
+                        for neuron_index, neuron in enumerate(layer.neurons)
+                        if neuron.weights[input_index]
+                    ]
+                    columns.append(
+                        (
+                            tuple(neuron_index for neuron_index, _ in synapses),
+                            tuple(weight for _, weight in synapses),
+                        )
+                    )
+                self.columns.append(columns)
+
+        # One (neurons x inputs) view per layer on the genome, int64 products stay
+        # exact as long as a layer output fits, like the Python ints of the neurons
+        self.matrices = []
+        if np is not None and not self.columns:
+            genome = np.asarray(weights, dtype=np.int64)
+            counts = [inputs_count, *hiddens_counts, outputs_count]
+            offset = 0
+            for inputs, count in zip(counts, counts[1:]):
+                self.matrices.append(
+                    genome[offset : offset + count * inputs].reshape(count, inputs)
+                )
+                offset += count * inputs
+
     def calculate_output(self, input: List[int]) -> List[int]:
+        if self.columns:
+            outputs = input
+            for layer, columns in zip(self.layers, self.columns):
+                sums = [0] * len(layer.neurons)
+                # Zero inputs, like the padding of missing applications, cost nothing
+                for value, (indexes, weights) in zip(outputs, columns):
+                    if value:
+                        for index, weight in zip(indexes, weights):
+                            sums[index] += value * weight
+                outputs = sums
+            return outputs
+
+        if self.matrices:
+            np = numpy()
+            output = np.asarray(input, dtype=np.int64)
+            for matrix in self.matrices:
+                output = matrix @ output
+            return output.tolist()
+
         inout = input
         for layer in self.layers:
             inout = layer.calculate_output(inout)
 
         return inout
 
+    def calculate_output_batch(self, inputs: List[List[int]]) -> List[List[int]]:
+        """Outputs of many input vectors, one matrix product per layer"""
+        if self.matrices:
+            np = numpy()
+            outputs = np.asarray(inputs, dtype=np.int64)
+            for matrix in self.matrices:
+                outputs = outputs @ matrix.T
+            return outputs.tolist()
+
+        return [self.calculate_output(input) for input in inputs]
+
     def __str__(self) -> str:
         return "\n".join((str(layer) for layer in self.layers))
 
@@ -164,6 +251,7 @@ TASKS_COUNT = 8
 CARDS_LOCATIONS_COUNT = 6
 PLAYERS_COUNT = 2
 APPLICATIONS_TO_WIN = 5
+RECORD_VARIABLE = "GREEN_CIRCLE_RECORD"  # set: decisions kept in <chromosome>.jsonl
 
 
 class Game_Phase(Enum):
@@ -200,9 +288,9 @@ my_assert(
 class GreenCircleAI:
     neural_network: NeuralNetwork
 
-    def __init__(self, weights: List[int]) -> None:
+    def __init__(self, weights: List[int], sparse: Optional[bool] = None) -> None:
         self.neural_network = NeuralNetwork(
-            weights, INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT
+            weights, INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT, sparse
         )
 
         my_assert(len(self.neural_network.layers) == len(HIDDENS_COUNTS) + 1)
@@ -222,87 +310,110 @@ class GreenCircleAI:
                 )
             )
 
-    def prepare_inputs(self) -> Tuple[List[int], Dict[int, int], Dict[str, bool]]:
+    def read_inputs(
+        self,
+    ) -> Tuple[str, List[List[int]], List[List[int]], List[List[int]], List[str]]:
+        game_phase = input()  # can be MOVE, GIVE_CARD, THROW_CARD, PLAY_CARD or RELEASE
+
+        applications_count = int(input())
+        # object_type: always APPLICATION
+        # id : id of the application
+        # training_needed: number of TRAINING skills needed
+        # coding_needed: number of CODING skills needed
+        # daily_routine_needed: number of DAILY_ROUTINE skills needed
+        # task_prioritization_needed: number of TASK_PRIORITIZATION skills needed
+        # architecture_study_needed: number of ARCHITECTURE_STUDY skills needed
+        # continuous_delivery_needed: number of CONTINUOUS_DELIVERY skills needed
+        # code_review_needed: number of CODE_REVIEW skills needed
+        # refactoring_needed: number of REFACTORING skills needed
+        applications = [
+            [int(inp) for inp in input().split()[1:]] for _ in range(applications_count)
+        ]
+
+        # player_location: id of the zone in which the player is located
+        # player_score: number of points scored by the player
+        # player_permanent_daily_routine_cards: number of DAILY_ROUTINE played
+        # player_permanent_architecture_study_cards: number of ARCHITECTURE_STUDY played
+        players = [[int(inp) for inp in input().split()] for _ in range(PLAYERS_COUNT)]
+
+        card_locations_count = int(input())
+        # cards_location: the location of the card list.
+        # It can be HAND, DRAW, DISCARD, OPPONENT_CARDS, AUTOMATED and OPPONENT_AUTOMATED
+        # training_cards_count: number of TRAINING cards
+        # coding_cards_count: number of CODING cards
+        # daily_routine_cards_count: number of DAILY_ROUTINE cards
+        # task_prioritization_cards_count: number of TASK_PRIORITIZATION cards
+        # architecture_study_cards_count: number of ARCHITECTURE_STUDY cards
+        # continuous_delivery_cards_count: number of CONTINUOUS_DELIVERY cards
+        # code_review_cards_count: number of CODE_REVIEW cards
+        # refactoring_cards_count: number of REFACTORING cards
+        # bonus_cards_count: number of BONUS cards
+        # technical_debt_cards_count: number of TECHNICAL_DEBT cards
+        card_locations = [
+            [int(inp) for inp in input().split()[1:]]
+            for _ in range(card_locations_count)
+        ]
+
+        possible_actions_count = int(input())
+        possible_actions = [input() for _ in range(possible_actions_count)]
+
+        return game_phase, applications, players, card_locations, possible_actions
+
+    def prepare_inputs(
+        self,
+        game_phase: str,
+        applications: List[List[int]],
+        players: List[List[int]],
+        card_locations: List[List[int]],
+        possible_actions: List[str],
+    ) -> Tuple[List[int], Dict[int, int], Dict[str, bool]]:
+        """Network inputs from the values of a turn, without their labels"""
         ai_inputs = []
 
         ai_inputs.append(1)  # bias
 
-        game_phase = input()  # can be MOVE, GIVE_CARD, THROW_CARD, PLAY_CARD or RELEASE
         for i in range(len(Game_Phase)):
             ai_inputs.append(1 if game_phase == Game_Phase(i).name else 0)
 
-        applications_count = int(input())
-        applications: Dict[int, int] = {}
-        for i in range(applications_count):
-            # object_type: always APPLICATION
-            # id : id of the application
-            # training_needed: number of TRAINING skills needed
-            # coding_needed: number of CODING skills needed
-            # daily_routine_needed: number of DAILY_ROUTINE skills needed
-            # task_prioritization_needed: number of TASK_PRIORITIZATION skills needed
-            # architecture_study_needed: number of ARCHITECTURE_STUDY skills needed
-            # continuous_delivery_needed: number of CONTINUOUS_DELIVERY skills needed
-            # code_review_needed: number of CODE_REVIEW skills needed
-            # refactoring_needed: number of REFACTORING skills needed
-            inputs = input().split()
-
-            applications[int(inputs[1])] = i
-            ai_inputs.extend([int(inp) for inp in inputs[2:]])
-
-        ai_inputs.extend([0] * TASKS_COUNT * (APPLICATIONS_COUNT - applications_count))
-
-        for i in range(PLAYERS_COUNT):
-            # player_location: id of the zone in which the player is located
-            # player_score: number of points scored by the player
-            # player_permanent_daily_routine_cards: number of DAILY_ROUTINE played
-            # player_permanent_architecture_study_cards: number of ARCHITECTURE_STUDY played
-            inputs = input().split()
-            player_location = int(inputs[0])
+        application_indexes: Dict[int, int] = {}
+        for i, application in enumerate(applications):
+            application_indexes[application[0]] = i
+            ai_inputs.extend(application[1:])
+
+        ai_inputs.extend([0] * TASKS_COUNT * (APPLICATIONS_COUNT - len(applications)))
+
+        for player in players:
+            player_location = player[0]
             for i in range(-1, TASKS_COUNT):
                 ai_inputs.append(1 if player_location == i else 0)
 
-            player_score = int(inputs[1])
+            player_score = player[1]
             ai_inputs.append(player_score)
             correct_tasks_only = 1 if player_score == APPLICATIONS_TO_WIN - 1 else 0
             ai_inputs.append(correct_tasks_only)
-            ai_inputs.extend([int(inp) for inp in inputs[2:]])
+            ai_inputs.extend(player[2:])
 
-        card_locations_count = int(input())
-        for i in range(card_locations_count):
-            # cards_location: the location of the card list.
-            # It can be HAND, DRAW, DISCARD, OPPONENT_CARDS, AUTOMATED and OPPONENT_AUTOMATED
-            # training_cards_count: number of TRAINING cards
-            # coding_cards_count: number of CODING cards
-            # daily_routine_cards_count: number of DAILY_ROUTINE cards
-            # task_prioritization_cards_count: number of TASK_PRIORITIZATION cards
-            # architecture_study_cards_count: number of ARCHITECTURE_STUDY cards
-            # continuous_delivery_cards_count: number of CONTINUOUS_DELIVERY cards
-            # code_review_cards_count: number of CODE_REVIEW cards
-            # refactoring_cards_count: number of REFACTORING cards
-            # bonus_cards_count: number of BONUS cards
-            # technical_debt_cards_count: number of TECHNICAL_DEBT cards
-            ai_inputs.extend([int(inp) for inp in input().split()[1:]])
+        for card_location in card_locations:
+            ai_inputs.extend(card_location)
 
         ai_inputs.extend(
-            [0] * (TASKS_COUNT + 2) * (CARDS_LOCATIONS_COUNT - card_locations_count)
+            [0] * (TASKS_COUNT + 2) * (CARDS_LOCATIONS_COUNT - len(card_locations))
         )
 
-        possible_actions_count = int(input())
-        possible_actions = {}
-        for i in range(possible_actions_count):
-            possible_action = input()
-            possible_actions[possible_action] = True
-
         my_assert(len(ai_inputs) == INPUTS_COUNT, f"{len(ai_inputs)} != {INPUTS_COUNT}")
 
-        return ai_inputs, applications, possible_actions
+        return (
+            ai_inputs,
+            application_indexes,
+            {possible_action: True for possible_action in possible_actions},
+        )
 
-    def act(
-        self,
+    @staticmethod
+    def choose(
         ai_outputs: List[int],
         applications: Dict[int, int],
         possible_actions: Dict[str, bool],
-    ) -> None:
+    ) -> str:
         my_assert(
             len(ai_outputs) == OUTPUTS_COUNT, f"{len(ai_outputs)} != {OUTPUTS_COUNT}"
         )
@@ -372,27 +483,69 @@ class GreenCircleAI:
                 else:
                     raise Exception(f"Unknown action: {possible_action}")
 
-        print(max(possible_action_scores, key=possible_action_scores.get))  # type: ignore
+        return max(possible_action_scores, key=possible_action_scores.get)  # type: ignore
 
-    def run(self) -> None:
-        ai_inputs, applications, possible_actions = self.prepare_inputs()
+    def decide(
+        self,
+        game_phase: str,
+        applications: List[List[int]],
+        players: List[List[int]],
+        card_locations: List[List[int]],
+        possible_actions: List[str],
+    ) -> str:
+        ai_inputs, application_indexes, actions = self.prepare_inputs(
+            game_phase, applications, players, card_locations, possible_actions
+        )
         ai_outputs = self.neural_network.calculate_output(ai_inputs)
-        self.act(ai_outputs, applications, possible_actions)
-
-
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        debug(sys.argv[1])
-        with open(sys.argv[1], "r") as f:
-            chr = f.read()
-    else:
-        chr = ""
-
-    weights = [int.from_bytes(c.encode(), "big") - 47 - 0x20 for c in chr]
+        return self.choose(ai_outputs, application_indexes, actions)
+
+    def run(self, record: Optional[TextIO] = None) -> None:
+        view = self.read_inputs()
+        action = self.decide(*view)
+        if record is not None:
+            # One JSON line a decision, the view and the action, see engine.replay
+            print(json.dumps([*view, action]), file=record, flush=True)
+        print(action)
+
+
+def read_genome_bank(argument: str) -> List[int]:
+    # "<path>#<row>": pre-decoded int8 weights, see genome_bank.py
+    path, row = argument.rsplit("#", 1)
+    header = struct.Struct("<4sH16sII2x")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        magic, _, dtype, _, length = header.unpack_from(m)
+        my_assert(magic == b"GENB" and dtype.rstrip(b"\0") == b"|i1", argument)
+        start = header.size + int(row) * length
+        return array("b", m[start : start + length]).tolist()
+
+
+def read_weights(argument: Optional[str]) -> List[int]:
+    chr = ""
+    weights = []
+    if argument is not None:
+        debug(argument)
+        if "#" in argument:
+            weights = read_genome_bank(argument)
+        else:
+            with open(argument, "r") as f:
+                chr = f.read()
+
+    weights += [int.from_bytes(c.encode(), "big") - 47 - 0x20 for c in chr]
     # weights = [int(weight) for weight in re.findall(r'[+-]\d+', chr)]
 
     weights += [0] * (SYNAPSES_COUNT - len(weights))
-    ai = GreenCircleAI(weights[:SYNAPSES_COUNT])
+    return weights[:SYNAPSES_COUNT]
+
+
+if __name__ == "__main__":
+    ai = GreenCircleAI(
+        read_weights(sys.argv[1] if len(sys.argv) > 1 else None), sparse=True
+    )
+    record = (
+        open(f"{sys.argv[1]}.jsonl", "a")
+        if os.environ.get(RECORD_VARIABLE) and len(sys.argv) > 1
+        else None
+    )
 
     while True:
-        ai.run()
+        ai.run(record)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import inspect
+from typing import List, Optional, Tuple
+
+import ai
+import numpy as np
+from ai import HIDDENS_COUNTS, INPUTS_COUNT, OUTPUTS_COUNT
+
+# A submission is ai.py without its main, followed by a network compiled from
+# one chromosome: weights of dead neurons and unused inputs are dropped, zero
+# weights are skipped by index where a row has many, and the forward pass is a
+# sum over precomputed tuples. The weights stay one character each, as read by
+# read_weights, because ~25k integer literals would not fit the size limit.
+
+SUBMISSION_LIMIT = 100_000  # characters accepted by CodinGame
+WEIGHT_OFFSET = 47 + 0x20  # character code of weight 0, see read_weights
+MAIN = '\nif __name__ == "__main__":'
+
+COMPILED_NETWORK = """
+# Network compiled by bot_builder.py, do not edit
+from itertools import islice  # noqa: E402
+from operator import itemgetter, mul  # noqa: E402
+
+WEIGHTS = {weights}
+
+
+def take(weights, count):
+    return tuple(islice(weights, count))
+
+
+class CompiledNetwork:
+    def __init__(self) -> None:
+        weights = iter([ord(c) - {offset} for c in WEIGHTS])
+        self.columns = [(i, take(weights, {hiddens})) for i in {inputs}]
+        self.layers = [
+{layers}
+        ]
+
+    def calculate_output(self, input):
+        # Inputs are mostly zeros, the first layer adds the columns of the others
+        outputs = [0] * {hiddens}
+        for i, column in self.columns:
+            value = input[i]
+            if value:
+                outputs = [output + value * w for output, w in zip(outputs, column)]
+        for rows in self.layers:
+            outputs = [
+                sum(map(mul, weights, outputs if get is None else get(outputs)))
+                for get, weights in rows
+            ]
+        return outputs
+
+
+class CompiledAI(GreenCircleAI):
+    def __init__(self) -> None:
+        self.neural_network = CompiledNetwork()  # type: ignore
+
+
+if __name__ == "__main__":
+    ai = CompiledAI()
+
+    while True:
+        ai.run()
+"""
+
+
+def layer_matrices(weights: List[int]) -> List[np.ndarray]:
+    """(neurons x inputs) weights of every layer, as NeuralNetwork slices them"""
+    counts = [INPUTS_COUNT, *HIDDENS_COUNTS, OUTPUTS_COUNT]
+    genome = np.asarray(weights, dtype=np.int64)
+    matrices, shift = [], 0
+    for inputs, neurons in zip(counts, counts[1:]):
+        matrices.append(
+            genome[shift : shift + neurons * inputs].reshape(neurons, inputs)
+        )
+        shift += neurons * inputs
+    return matrices
+
+
+def getter(indexes: List[int]) -> str:
+    if len(indexes) == 1:
+        return f"lambda outputs: (outputs[{indexes[0]}],)"
+    return f"itemgetter{tuple(indexes)}"
+
+
+def compile_rows(matrix: np.ndarray) -> Tuple[List[str], List[int]]:
+    """(get, weights) entries of a layer and its weights in reading order"""
+    entries, weights = [], []
+    for row in matrix:
+        indexes = np.flatnonzero(row).tolist()
+        if 2 * len(indexes) < len(row):
+            entries.append(
+                f"({getter(indexes) if indexes else None}, take(weights, {len(indexes)}))"
+            )
+            weights += row[indexes].tolist()
+        else:
+            entries.append(f"(None, take(weights, {len(row)}))")
+            weights += row.tolist()
+    return entries, weights
+
+
+def build_bot(weights: List[int], limit: Optional[int] = SUBMISSION_LIMIT) -> str:
+    """Self-contained bot source playing the chromosome of the weights"""
+    matrices = layer_matrices(weights)
+
+    # A hidden neuron without weights always outputs 0, the next layer ignores it
+    for depth in range(len(matrices) - 1):
+        alive = matrices[depth].any(axis=1)
+        matrices[depth] = matrices[depth][alive]
+        matrices[depth + 1] = matrices[depth + 1][:, alive]
+
+    first = matrices[0]
+    inputs = np.flatnonzero(first.any(axis=0)).tolist()
+    encoded = first[:, inputs].T.flatten().tolist()
+    layers = []
+    for matrix in matrices[1:]:
+        entries, layer_weights = compile_rows(matrix)
+        layers.append(
+            "            [\n"
+            + "".join(f"                {entry},\n" for entry in entries)
+            + "            ],"
+        )
+        encoded += layer_weights
+
+    source = inspect.getsource(ai).split(MAIN)[0] + COMPILED_NETWORK.format(
+        weights=repr("".join(chr(weight + WEIGHT_OFFSET) for weight in encoded)),
+        offset=WEIGHT_OFFSET,
+        hiddens=len(first),
+        inputs=tuple(inputs),
+        layers="\n".join(layers),
+    )
+    if limit is not None and len(source) > limit:
+        raise ValueError(f"Bot of {len(source)} characters, over the {limit} limit")
+    return source
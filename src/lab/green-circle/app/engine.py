@@ -0,0 +1,510 @@
+from __future__ import annotations
+
+import json
+import os
+from itertools import combinations
+from random import Random
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ai import (
+    APPLICATIONS_COUNT,
+    APPLICATIONS_TO_WIN,
+    TASKS_COUNT,
+    Action,
+    Game_Phase,
+)
+
+# Green Circle played in memory: the bots get the values they would otherwise
+# parse from stdin and answer with the line they would print.
+#
+# Rules, as published by the contest:
+# - 8 desks around the circle, one per skill, each with DESK_CARDS skill cards
+# - decks start with 4 BONUS and 4 TECHNICAL_DEBT cards, hands have 4 cards plus
+#   one per permanent ARCHITECTURE_STUDY
+# - MOVE to another desk and take one of its cards, or a BONUS card when it is
+#   empty; permanent DAILY_ROUTINE cards allow to take from desks that far away
+# - GIVE_CARD to the opponent when ending next to it
+# - THROW_CARD back to its desk and take 2 TECHNICAL_DEBT cards when passing by
+#   the administrative desk, between desks 7 and 0
+# - PLAY_CARD for its effect, TRAINING and CODING allow to play more cards
+# - RELEASE an application: a skill card is worth 2 skills of its kind, a BONUS
+#   card 1 of any kind, any other card, TECHNICAL_DEBT included, 1 shoddy skill
+#   paid with a new TECHNICAL_DEBT card, the last application must be
+#   released with good skills only
+# The first to release APPLICATIONS_TO_WIN applications wins, a game still
+# undecided after MAX_ROUNDS turns is a draw.
+
+BONUS = TASKS_COUNT
+TECHNICAL_DEBT = TASKS_COUNT + 1
+CARD_TYPES = TASKS_COUNT + 2
+DESK_CARDS = 5
+BONUS_CARDS = 36
+STARTING_BONUS = 4
+STARTING_TECHNICAL_DEBT = 4
+HAND_SIZE = 4
+TASK_NEEDS = 4
+ADMINISTRATIVE_DEBT = 2
+MAX_ROUNDS = 200
+# Java games validate-engine must reproduce before the engine scores duels
+VALIDATION_GAMES = 10
+VALIDATION_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "engine_validation.json"
+)
+
+SKILLS = [
+    Action.TRAINING.name,
+    Action.CODING.name,
+    Action.DAILY_ROUTINE.name,
+    Action.TASK_PRIORITIZATION.name,
+    Action.ARCHITECTURE_STUDY.name,
+    Action.CONTINUOUS_INTEGRATION.name,
+    Action.CODE_REVIEW.name,
+    Action.REFACTORING.name,
+]
+
+# (game phase, applications, players, card locations, possible actions) -> action
+Bot = Callable[[str, List[List[int]], List[List[int]], List[List[int]], List[str]], str]
+# The same view followed by the action, as ai.py records it
+Decision = Tuple[str, List[List[int]], List[List[int]], List[List[int]], List[str], str]
+
+
+def distance(zone_1: int, zone_2: int) -> int:
+    gap = abs(zone_1 - zone_2) % TASKS_COUNT
+    return min(gap, TASKS_COUNT - gap)
+
+
+def release_plan(
+    hand: List[int], automated: List[int], needs: List[int], good_only: bool
+) -> Optional[Tuple[List[int], int]]:
+    """Cards of the hand spent on an application and the shoddy skills among them"""
+    used = [0] * CARD_TYPES
+    missing = 0
+    for task, need in enumerate(needs):
+        need -= min(need, 2 * automated[task])
+        used[task] = min(hand[task], (need + 1) // 2)
+        missing += max(0, need - 2 * used[task])
+    missing -= min(missing, automated[BONUS])
+    used[BONUS] = min(hand[BONUS], missing)
+    missing -= used[BONUS]
+
+    if missing > 0 and good_only:
+        return None
+    shoddy = missing
+    # TECHNICAL_DEBT cards are spent first, they are good for nothing else
+    for card in reversed(range(CARD_TYPES)):
+        spent = min(shoddy, hand[card] - used[card])
+        used[card] += spent
+        shoddy -= spent
+    if shoddy > 0:
+        return None
+    return used, missing
+
+
+class Player:
+    location: int
+    score: int
+    daily_routine: int
+    architecture_study: int
+    hand: List[int]
+    draw: List[int]
+    discard: List[int]
+    automated: List[int]
+
+    def __init__(self):
+        self.location = -1
+        self.score = 0
+        self.daily_routine = 0
+        self.architecture_study = 0
+        self.hand = [0] * CARD_TYPES
+        self.draw = [0] * CARD_TYPES
+        self.draw[BONUS] = STARTING_BONUS
+        self.draw[TECHNICAL_DEBT] = STARTING_TECHNICAL_DEBT
+        self.discard = [0] * CARD_TYPES
+        self.automated = [0] * CARD_TYPES
+
+    def cards(self) -> List[int]:
+        return [sum(cards) for cards in zip(self.hand, self.draw, self.discard)]
+
+    def state(self) -> List[int]:
+        return [
+            self.location,
+            self.score,
+            self.daily_routine,
+            self.architecture_study,
+        ]
+
+
+class GreenCircleGame:
+    random: Random
+    desks: List[int]
+    bonus: int
+    applications: Dict[int, List[int]]
+    players: List[Player]
+    current: int
+    rounds: int
+    phase: Game_Phase
+
+    def __init__(self, seed: Optional[int] = None):
+        self.random = Random(seed)
+        self.desks = [DESK_CARDS] * TASKS_COUNT
+        self.bonus = BONUS_CARDS
+        # Every application needs two skills, 8 skills in all
+        tasks = list(combinations(range(TASKS_COUNT), 2))
+        self.applications = {}
+        for id in sorted(self.random.sample(range(len(tasks)), APPLICATIONS_COUNT)):
+            needs = [0] * TASKS_COUNT
+            for task in tasks[id]:
+                needs[task] = TASK_NEEDS
+            self.applications[id] = needs
+        self.players = [Player(), Player()]
+        for player in self.players:
+            self.draw_cards(player, HAND_SIZE)
+        self.current = 0
+        self.rounds = 0
+        self.phase = Game_Phase.MOVE
+
+    def play(self, bot_1: Bot, bot_2: Bot) -> Tuple[int, int, int]:
+        """Play until the end, the result as parsed from the Java referee output"""
+        bots = (bot_1, bot_2)
+        while not self.is_over():
+            self.play_turn(bots[self.current])
+        return self.result()
+
+    def is_over(self) -> bool:
+        return self.rounds >= MAX_ROUNDS or any(
+            player.score >= APPLICATIONS_TO_WIN for player in self.players
+        )
+
+    def result(self) -> Tuple[int, int, int]:
+        score_1, score_2 = (player.score for player in self.players)
+        if score_1 == score_2:
+            # Draw, decided by the TECHNICAL_DEBT cards owned
+            debt_1, debt_2 = (player.cards()[TECHNICAL_DEBT] for player in self.players)
+            return -debt_1, -debt_2, self.rounds
+        return score_1, score_2, self.rounds
+
+    def play_turn(self, bot: Bot) -> None:
+        player, opponent = self.players[self.current], self.players[1 - self.current]
+        previous = player.location
+
+        self.phase = Game_Phase.MOVE
+        self.move(player, self.ask(bot))  # type: ignore
+
+        if opponent.location >= 0 and distance(player.location, opponent.location) <= 1:
+            self.phase = Game_Phase.GIVE_CARD
+            action = self.ask(bot)
+            if action is not None:
+                card = int(action.split()[1])
+                player.hand[card] -= 1
+                opponent.discard[card] += 1
+
+        if 0 <= player.location < previous:
+            self.phase = Game_Phase.THROW_CARD
+            action = self.ask(bot)
+            if action is not None:
+                card = int(action.split()[1])
+                player.hand[card] -= 1
+                self.desks[card] += 1
+            player.discard[TECHNICAL_DEBT] += ADMINISTRATIVE_DEBT
+
+        self.phase = Game_Phase.PLAY_CARD
+        plays = 1
+        while plays > 0:
+            action = self.ask(bot)
+            if action is None or action == Action.WAIT.name:
+                break
+            plays += self.play_card(player, action) - 1
+
+        self.phase = Game_Phase.RELEASE
+        action = self.ask(bot)
+        if action is not None and action != Action.WAIT.name:
+            self.release(player, int(action.split()[1]))
+
+        for card in range(CARD_TYPES):
+            player.discard[card] += player.hand[card]
+            player.hand[card] = 0
+        self.draw_cards(player, HAND_SIZE + player.architecture_study)
+        self.rounds += 1
+        self.current = 1 - self.current
+
+    def ask(self, bot: Bot) -> Optional[str]:
+        """The action of the bot, None when the phase offers no choice"""
+        actions = self.possible_actions()
+        if not actions:
+            return None
+
+        player, opponent = self.players[self.current], self.players[1 - self.current]
+        action = bot(
+            self.phase.name,
+            [[id, *needs] for id, needs in self.applications.items()],
+            [player.state(), opponent.state()],
+            [
+                player.hand,
+                player.draw,
+                player.discard,
+                opponent.cards(),
+                player.automated,
+                opponent.automated,
+            ],
+            actions,
+        )
+        if action not in actions or action == Action.RANDOM.name:
+            choices = [
+                choice
+                for choice in actions
+                if choice not in (Action.RANDOM.name, Action.WAIT.name)
+            ]
+            action = self.random.choice(choices) if choices else Action.WAIT.name
+        return action
+
+    def possible_actions(self) -> List[str]:
+        player = self.players[self.current]
+        if self.phase == Game_Phase.MOVE:
+            actions = []
+            for zone in range(TASKS_COUNT):
+                if zone == player.location:
+                    continue
+                actions.append(f"MOVE {zone}")
+                for desk in range(TASKS_COUNT):
+                    if (
+                        desk != zone
+                        and self.desks[desk] > 0
+                        and distance(zone, desk) <= player.daily_routine
+                    ):
+                        actions.append(f"MOVE {zone} {desk}")
+        elif self.phase in (Game_Phase.GIVE_CARD, Game_Phase.THROW_CARD):
+            verb = "GIVE" if self.phase == Game_Phase.GIVE_CARD else "THROW"
+            actions = [
+                f"{verb} {card}" for card in range(TASKS_COUNT) if player.hand[card] > 0
+            ]
+        elif self.phase == Game_Phase.PLAY_CARD:
+            actions = self.possible_plays(player)
+        else:
+            good_only = player.score == APPLICATIONS_TO_WIN - 1
+            actions = [
+                f"RELEASE {id}"
+                for id, needs in self.applications.items()
+                if release_plan(player.hand, player.automated, needs, good_only)
+            ]
+
+        if not actions:
+            return actions
+        if self.phase in (Game_Phase.PLAY_CARD, Game_Phase.RELEASE):
+            actions.append(Action.WAIT.name)
+        actions.append(Action.RANDOM.name)
+        return actions
+
+    def possible_plays(self, player: Player) -> List[str]:
+        actions: List[str] = []
+        for card in range(TASKS_COUNT):
+            if player.hand[card] == 0:
+                continue
+            left = list(player.hand)
+            left[card] -= 1
+            if SKILLS[card] == Action.TASK_PRIORITIZATION.name:
+                actions.extend(
+                    f"{SKILLS[card]} {thrown} {taken}"
+                    for thrown in range(TASKS_COUNT)
+                    for taken in range(TASKS_COUNT)
+                    if left[thrown] > 0 and thrown != taken and self.desks[taken] > 0
+                )
+            elif SKILLS[card] == Action.CONTINUOUS_INTEGRATION.name:
+                actions.extend(
+                    f"{SKILLS[card]} {automated}"
+                    for automated in range(TASKS_COUNT)
+                    if left[automated] > 0
+                )
+            elif SKILLS[card] == Action.REFACTORING.name:
+                if player.hand[TECHNICAL_DEBT] > 0:
+                    actions.append(SKILLS[card])
+            else:
+                actions.append(SKILLS[card])
+        return actions
+
+    def move(self, player: Player, action: str) -> None:
+        words = action.split()
+        player.location = int(words[1])
+        desk = int(words[2]) if len(words) == 3 else player.location
+        if self.desks[desk] > 0:
+            self.desks[desk] -= 1
+            player.discard[desk] += 1
+        elif self.bonus > 0:
+            self.bonus -= 1
+            player.discard[BONUS] += 1
+
+    def play_card(self, player: Player, action: str) -> int:
+        """Play a card of the hand, return how many cards may be played after it"""
+        words = action.split()
+        card = SKILLS.index(words[0])
+        player.hand[card] -= 1
+        plays = 0
+        if words[0] == Action.DAILY_ROUTINE.name:
+            player.daily_routine += 1
+            return plays
+        if words[0] == Action.ARCHITECTURE_STUDY.name:
+            player.architecture_study += 1
+            return plays
+
+        player.discard[card] += 1
+        if words[0] == Action.TRAINING.name:
+            self.draw_cards(player, 2)
+            plays = 1
+        elif words[0] == Action.CODING.name:
+            self.draw_cards(player, 1)
+            plays = 2
+        elif words[0] == Action.TASK_PRIORITIZATION.name:
+            thrown, taken = int(words[1]), int(words[2])
+            player.hand[thrown] -= 1
+            self.desks[thrown] += 1
+            self.desks[taken] -= 1
+            player.hand[taken] += 1
+        elif words[0] == Action.CONTINUOUS_INTEGRATION.name:
+            automated = int(words[1])
+            player.hand[automated] -= 1
+            player.automated[automated] += 1
+        elif words[0] == Action.CODE_REVIEW.name:
+            bonus = min(2, self.bonus)
+            self.bonus -= bonus
+            player.discard[BONUS] += bonus
+        elif words[0] == Action.REFACTORING.name:
+            player.hand[TECHNICAL_DEBT] -= 1
+        return plays
+
+    def release(self, player: Player, id: int) -> None:
+        good_only = player.score == APPLICATIONS_TO_WIN - 1
+        plan = release_plan(
+            player.hand, player.automated, self.applications.pop(id), good_only
+        )
+        used, shoddy = plan  # type: ignore
+        for card, count in enumerate(used):
+            player.hand[card] -= count
+            player.discard[card] += count
+        player.discard[TECHNICAL_DEBT] += shoddy
+        player.score += 1
+
+    def draw_cards(self, player: Player, count: int) -> None:
+        for _ in range(count):
+            if not any(player.draw):
+                # Shuffle the discard pile into the draw pile
+                player.draw, player.discard = player.discard, [0] * CARD_TYPES
+                if not any(player.draw):
+                    return
+            card = self.random.choices(range(CARD_TYPES), weights=player.draw)[0]
+            player.draw[card] -= 1
+            player.hand[card] += 1
+
+
+class ReplayError(Exception):
+    pass
+
+
+def read_decisions(path: str) -> List[Decision]:
+    """Decisions recorded by ai.py, none when the bot did not play"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [tuple(json.loads(line)) for line in f]  # type: ignore
+
+
+def record_turns(
+    decisions_1: Iterable[Decision], decisions_2: Iterable[Decision]
+) -> List[Tuple[int, List[Decision]]]:
+    """(player, decisions) of every turn, the decisions of a turn start with MOVE"""
+    turns: List[List[List[Decision]]] = [[], []]
+    for player, decisions in enumerate((decisions_1, decisions_2)):
+        for decision in decisions:
+            if decision[0] == Game_Phase.MOVE.name or not turns[player]:
+                turns[player].append([])
+            turns[player][-1].append(decision)
+    return [
+        (player, turns[player][turn])
+        for turn in range(len(turns[0]))
+        for player in range(2)
+        if turn < len(turns[player])
+    ]
+
+
+class ReplayedGame(GreenCircleGame):
+    """A game recorded against the Java referee, played again by the engine
+
+    The referee draws its own cards: the hand, draw and discard piles of the
+    player are taken from every recorded view, after checking the cards owned.
+    Everything else, applications, players, opponent cards and possible actions,
+    must be reproduced by the rules of the engine.
+    """
+
+    turns: List[Tuple[int, List[Decision]]]
+    pending: List[Decision]
+    hidden: bool  # cards drawn during the turn, not seen in a recorded view yet
+
+    def __init__(self, turns: List[Tuple[int, List[Decision]]]):
+        super().__init__()
+        if not turns:
+            raise ReplayError("no decision recorded")
+        self.applications = {id: needs for id, *needs in turns[0][1][0][1]}
+        self.turns = turns
+        self.pending = []
+        self.hidden = False
+
+    def replay(self) -> Tuple[int, int, int]:
+        """The result of the recorded turns, ReplayError at the first divergence"""
+        for number, (player, decisions) in enumerate(self.turns):
+            try:
+                if player != self.current:
+                    raise ReplayError(f"player {player + 1} to play")
+                self.pending = list(decisions)
+                self.hidden = False
+                self.play_turn(None)  # type: ignore
+                if self.pending:
+                    raise ReplayError(f"{self.pending[0][0]} not asked")
+            except ReplayError as err:
+                raise ReplayError(f"turn {number}: {err}") from None
+        return self.result()
+
+    def ask(self, bot: Bot) -> Optional[str]:
+        if not self.pending or self.pending[0][0] != self.phase.name:
+            # Cards drawn during the turn may be all the referee lacked to ask
+            if self.possible_actions() and not self.hidden:
+                raise ReplayError(f"{self.phase.name} not recorded")
+            return None
+
+        phase, applications, players, cards, actions, action = self.pending.pop(0)
+        player, opponent = self.players[self.current], self.players[1 - self.current]
+        hand, draw, discard, opponent_cards, automated, opponent_automated = cards
+        expected = {
+            "applications": sorted(
+                [id, *needs] for id, needs in self.applications.items()
+            ),
+            "players": [player.state(), opponent.state()],
+            "cards owned": player.cards(),
+            "opponent cards": opponent.cards(),
+            "automated": player.automated,
+            "opponent automated": opponent.automated,
+        }
+        recorded = {
+            "applications": sorted(applications),
+            "players": players,
+            "cards owned": [sum(counts) for counts in zip(hand, draw, discard)],
+            "opponent cards": opponent_cards,
+            "automated": automated,
+            "opponent automated": opponent_automated,
+        }
+        for name, values in expected.items():
+            if values != recorded[name]:
+                raise ReplayError(f"{phase} {name} {values}, recorded {recorded[name]}")
+
+        player.hand, player.draw, player.discard = list(hand), list(draw), list(discard)
+        self.hidden = False
+        possible_actions = self.possible_actions()
+        if sorted(possible_actions) != sorted(actions):
+            raise ReplayError(
+                f"{phase} actions {sorted(set(possible_actions) ^ set(actions))} differ"
+            )
+        if action == Action.RANDOM.name or action not in actions:
+            raise ReplayError(f"{phase} {action} played at random by the referee")
+        return action
+
+    def play_card(self, player: Player, action: str) -> int:
+        if action.split()[0] in (Action.TRAINING.name, Action.CODING.name):
+            self.hidden = True
+        return super().play_card(player, action)
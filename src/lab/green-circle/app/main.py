@@ -1,9 +1,46 @@
+import os
+import shutil
 import subprocess
+import tempfile
 from random import randint
+from typing import List, Optional
 
 import click
-from ai import SYNAPSES_COUNT, GreenCircleAI
-from genetic_algorithm import GENE_MAX, GENE_MIN, GreenCircleGeneticAlgorithm
+import engine
+import lab_common  # noqa: F401
+import numpy as np
+from ai import (
+    INPUTS_COUNT,
+    RECORD_VARIABLE,
+    SYNAPSES_COUNT,
+    GreenCircleAI,
+    read_weights,
+)
+from bot_builder import build_bot, layer_matrices
+from chromosome_archive import ChromosomeArchive
+from duel_store import DuelStore
+from engine import (
+    VALIDATION_FILE,
+    VALIDATION_GAMES,
+    ReplayedGame,
+    ReplayError,
+    read_decisions,
+    record_turns,
+)
+from evolution import ARCHIVE_FILE, MATCHMAKING, POOL_SIZE_FILE
+from genetic_algorithm import (
+    GENE_MAX,
+    GENE_MIN,
+    POOL_SIZE,
+    RATINGS,
+    GreenCircleChromosome,
+    GreenCircleGeneticAlgorithm,
+    launch_duel,
+)
+from matchmaking import STRATEGIES
+from screening import POSITIONS_FILE, Positions, agreement, record_positions
+from telemetry import format_report
+from validation import save_validation
 
 
 @click.group()
@@ -38,10 +75,241 @@ def launch() -> None:
     #     f.write("\n".join(result.stdout.decode('utf-8').splitlines()[:-1]))
 
 
+def duel_options(command):
+    for option in reversed(
+        [
+            click.option(
+                "--python-referee",
+                is_flag=True,
+                help="Play duels with the Python engine once validate-engine passed",
+            ),
+            click.option(
+                "--asyncio",
+                "async_duels",
+                is_flag=True,
+                help="Run referees from asyncio",
+            ),
+            click.option(
+                "--cache", is_flag=True, help="Reuse results of known genomes"
+            ),
+            click.option(
+                "--cache-file", type=click.Path(), help="Persist the evaluation cache"
+            ),
+            click.option(
+                "--genome-bank",
+                is_flag=True,
+                help="Hand bots pre-decoded genomes from one memory-mapped file",
+            ),
+            click.option(
+                "--racing",
+                is_flag=True,
+                help="Spend duels on chromosomes near the elite cut only",
+            ),
+            click.option(
+                "--matchmaking",
+                type=click.Choice(STRATEGIES),
+                default=MATCHMAKING,
+                help="How chromosomes are paired in each round",
+            ),
+            click.option(
+                "--rating",
+                type=click.Choice(RATINGS),
+                default=RATINGS[0],
+                help="How a generation's duel results become scores",
+            ),
+            click.option(
+                "--duel-store", type=click.Path(), help="Keep every duel in SQLite"
+            ),
+            click.option(
+                "--telemetry",
+                "telemetry_file",
+                type=click.Path(),
+                help="Append per-generation metrics as JSON lines",
+            ),
+            click.option(
+                "--pool-size",
+                type=click.IntRange(1),
+                default=POOL_SIZE,
+                help=f"Worker processes, write a new count in {POOL_SIZE_FILE} to resize",
+            ),
+        ]
+    ):
+        command = option(command)
+    return command
+
+
 @main.command()
-def compete() -> None:
+@duel_options
+def compete(**options) -> None:
     """Launch the competition"""
-    GreenCircleGeneticAlgorithm().run()
+    GreenCircleGeneticAlgorithm(**options).run()
+
+
+@main.command()
+@duel_options
+def resume(**options) -> None:
+    """Resume the competition from its last checkpoint"""
+    GreenCircleGeneticAlgorithm(resume=True, **options).run()
+
+
+@main.command()
+@click.argument("id")
+@click.option("--generation", type=int, help="Archived generation, the last by default")
+@click.option("--archive", default=ARCHIVE_FILE, type=click.Path(exists=True))
+@click.option("--output", type=click.File("w"), default="-", help="Bot weights file")
+def export(id: str, generation: Optional[int], archive: str, output) -> None:
+    """Export an archived chromosome in the text format read by the bot"""
+    genome = ChromosomeArchive.open(archive).get(id, generation)
+    output.write(str(GreenCircleChromosome(generation or 0, genome, id)))
+
+
+@main.command()
+@click.argument("store", type=click.Path(exists=True))
+@click.argument("chromosome")
+@click.option("--opponent", help="Only the duels against this chromosome")
+@click.option("--generation", type=int, help="Only the duels of this generation")
+def duels(
+    store: str, chromosome: str, opponent: Optional[str], generation: Optional[int]
+) -> None:
+    """Report the stored duels of a chromosome"""
+    with DuelStore(store) as duel_store:
+        if opponent is not None:
+            for played_in, result in duel_store.head_to_head(chromosome, opponent):
+                print(f"{played_in:05} {result}")
+        elif generation is not None:
+            for _, other, result in duel_store.history(chromosome, generation):
+                print(f"{other} {result}")
+        else:
+            for other, count, score, opponent_score in duel_store.opponents(chromosome):
+                print(f"{other} {count} duels {score:.1f} - {opponent_score:.1f}")
+
+
+@main.command()
+@click.argument("run", type=click.Path(exists=True))
+@click.argument("baseline", type=click.Path(exists=True), required=False)
+@click.option(
+    "--threshold", default=0.1, help="Relative change flagged as a regression"
+)
+def report(run: str, baseline: Optional[str], threshold: float) -> None:
+    """Summarize a telemetry file, compared to a baseline run if given"""
+    print(format_report(run, baseline, threshold))
+
+
+@main.command()
+@click.argument("chromosome_1", type=click.Path(exists=True))
+@click.argument("chromosome_2", type=click.Path(exists=True))
+@click.option(
+    "--games", default=VALIDATION_GAMES, help="Games played by the Java referee"
+)
+@click.option(
+    "--record",
+    default=VALIDATION_FILE,
+    type=click.Path(),
+    help="Where a validation is recorded, for --python-referee",
+)
+def validate_engine(
+    chromosome_1: str, chromosome_2: str, games: int, record: str
+) -> None:
+    """Replay the games of the Java referee with the Python engine, turn by turn"""
+    diverged = 0
+    os.environ[RECORD_VARIABLE] = "1"
+    try:
+        for game in range(games):
+            with tempfile.TemporaryDirectory() as directory:
+                # Fresh copies of the chromosomes, the bots record to <copy>.jsonl
+                file_name_1, file_name_2 = (
+                    os.path.join(directory, f"{i}.txt") for i in (1, 2)
+                )
+                shutil.copyfile(chromosome_1, file_name_1)
+                shutil.copyfile(chromosome_2, file_name_2)
+                result = launch_duel(file_name_1, file_name_2)
+                turns = record_turns(
+                    read_decisions(f"{file_name_1}.jsonl"),
+                    read_decisions(f"{file_name_2}.jsonl"),
+                )
+            try:
+                replayed = ReplayedGame(turns).replay()
+                if replayed != result:
+                    raise ReplayError(f"result {replayed}, java {result}")
+                print(f"{game}: {len(turns)} turns reproduced, result {result}")
+            except ReplayError as err:
+                diverged += 1
+                print(f"{game}: {err}")
+    finally:
+        del os.environ[RECORD_VARIABLE]
+
+    if diverged:
+        raise click.ClickException(f"{diverged} of {games} games diverged")
+    save_validation(record, engine.__file__, games)
+    print(f"Engine validated on {games} games, recorded in {record}")
+
+
+@main.command()
+@click.argument("chromosome_1", type=click.Path(exists=True))
+@click.argument("chromosome_2", type=click.Path(exists=True))
+@click.option("--seed", "seeds", type=int, multiple=True, required=True)
+@click.option("--output", default=POSITIONS_FILE, type=click.Path())
+def record(chromosome_1: str, chromosome_2: str, seeds: List[int], output: str) -> None:
+    """Record the positions of games between two chromosomes, to screen others"""
+    positions = record_positions(chromosome_1, chromosome_2, seeds)
+    positions.save(output)
+    print(f"{len(positions)} positions recorded in {output}")
+
+
+@main.command()
+@click.argument("positions", default=POSITIONS_FILE, type=click.Path(exists=True))
+@click.option("--archive", default=ARCHIVE_FILE, type=click.Path(exists=True))
+@click.option("--since", default=0, help="Only chromosomes born from this generation")
+@click.option("--top", default=10, help="Chromosomes listed")
+def screen(positions: str, archive: str, since: int, top: int) -> None:
+    """Rank archived chromosomes by agreement with recorded positions"""
+    records = ChromosomeArchive.open(archive).records()
+    records = records[records["generation"] >= since]
+    scores = agreement(records["genome"], Positions.load(positions))
+    for i in np.argsort(-scores, kind="stable")[:top]:
+        id, generation = records["id"][i].decode(), records["generation"][i]
+        print(f"{generation:05}_{id} {scores[i]:.3f}")
+
+
+@main.command()
+@click.argument("chromosome", type=click.Path(exists=True))
+@click.option("--output", type=click.File("w"), default="-", help="Bot source file")
+def build(chromosome: str, output) -> None:
+    """Build a self-contained submission bot playing a chromosome"""
+    output.write(build_bot(read_weights(chromosome)))
+
+
+@main.command()
+@click.argument("chromosome", type=click.Path(exists=True))
+@click.option(
+    "--positions", type=click.Path(exists=True), help="Count the inputs set in play"
+)
+def sparsity(chromosome: str, positions: Optional[str]) -> None:
+    """Report the zero weights of a chromosome, layer by layer"""
+    matrices = layer_matrices(read_weights(chromosome))
+    for depth, matrix in enumerate(matrices, 1):
+        nonzero = np.count_nonzero(matrix)
+        print(
+            f"Layer {depth}: {nonzero}/{matrix.size} non-zero weights"
+            f" ({nonzero / matrix.size:.1%}),"
+            f" {np.count_nonzero(~matrix.any(axis=1))} dead neurons,"
+            f" {np.count_nonzero(~matrix.any(axis=0))} unused inputs"
+        )
+    if positions is not None:
+        set_inputs = Positions.load(positions).inputs != 0
+        # Products of the sparse mode: the columns of the inputs set, then the
+        # next layers, their inputs hardly ever 0
+        products = (set_inputs @ np.count_nonzero(matrices[0], axis=0)).mean() + sum(
+            np.count_nonzero(matrix) for matrix in matrices[1:]
+        )
+        print(
+            f"Inputs: {set_inputs.sum(axis=1).mean():.1f}/{INPUTS_COUNT} set per turn,"
+            f" {np.count_nonzero(~set_inputs.any(axis=0))} never set"
+        )
+        print(
+            f"Products per turn: {products:.0f} sparse,"
+            f" {sum(matrix.size for matrix in matrices)} dense"
+        )
 
 
 @main.command()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List
+
+import numpy as np
+from ai import HIDDENS_COUNTS, INPUTS_COUNT, OUTPUTS_COUNT, GreenCircleAI, read_weights
+from checkpoint import read_checkpoint, write_checkpoint
+from engine import GreenCircleGame
+
+# Offline pre-screening: chromosomes are compared on recorded positions, the
+# encoded prepare_inputs of played turns with the action the recording bot
+# chose, before spending referee time on them. Positions are kept in one .npz
+# file, the checkpoint.py format, to screen several runs on the same corpus.
+
+POSITIONS_FILE = "positions.npz"
+SCREENING_CHUNK = 64  # chromosomes per tensor product, ~200 KB of weights each
+LAYERS_COUNTS = [INPUTS_COUNT, *HIDDENS_COUNTS, OUTPUTS_COUNT]
+
+
+class Positions:
+    inputs: np.ndarray
+    applications: List[Dict[int, int]]
+    actions: List[Dict[str, bool]]
+    chosen: List[str]
+
+    def __init__(
+        self,
+        inputs: np.ndarray,
+        applications: List[Dict[int, int]],
+        actions: List[Dict[str, bool]],
+        chosen: List[str],
+    ):
+        self.inputs = inputs
+        self.applications = applications
+        self.actions = actions
+        self.chosen = chosen
+
+    def __len__(self) -> int:
+        return len(self.chosen)
+
+    def save(self, path: str) -> None:
+        write_checkpoint(
+            path,
+            {"inputs": self.inputs},
+            {
+                "applications": [
+                    list(indexes.items()) for indexes in self.applications
+                ],
+                "actions": [list(actions) for actions in self.actions],
+                "chosen": self.chosen,
+            },
+        )
+
+    @classmethod
+    def load(cls, path: str) -> Positions:
+        arrays, meta = read_checkpoint(path)
+        return cls(
+            arrays["inputs"],
+            [{id: index for id, index in pairs} for pairs in meta["applications"]],
+            [dict.fromkeys(actions, True) for actions in meta["actions"]],
+            meta["chosen"],
+        )
+
+
+def record_positions(file_name_1: str, file_name_2: str, seeds: List[int]) -> Positions:
+    """Every decision of both chromosomes in the games of the seeds"""
+    inputs: List[List[int]] = []
+    applications: List[Dict[int, int]] = []
+    actions: List[Dict[str, bool]] = []
+    chosen: List[str] = []
+
+    def recording(ai: GreenCircleAI) -> Callable[..., str]:
+        def bot(*view) -> str:
+            ai_inputs, application_indexes, possible_actions = ai.prepare_inputs(*view)
+            action = ai.choose(
+                ai.neural_network.calculate_output(ai_inputs),
+                application_indexes,
+                possible_actions,
+            )
+            inputs.append(ai_inputs)
+            applications.append(application_indexes)
+            actions.append(possible_actions)
+            chosen.append(action)
+            return action
+
+        return bot
+
+    ai_1, ai_2 = (
+        GreenCircleAI(read_weights(file_name))
+        for file_name in (file_name_1, file_name_2)
+    )
+    for seed in seeds:
+        GreenCircleGame(seed).play(recording(ai_1), recording(ai_2))
+    return Positions(
+        np.array(inputs, dtype=np.int64).reshape(-1, INPUTS_COUNT),
+        applications,
+        actions,
+        chosen,
+    )
+
+
+def batch_outputs(genomes: np.ndarray, inputs: np.ndarray) -> np.ndarray:
+    """(chromosomes x positions x outputs) network outputs, a tensor product a layer"""
+    weights = genomes.astype(np.int64)
+    outputs = inputs.T
+    shift = 0
+    for count, neurons in zip(LAYERS_COUNTS, LAYERS_COUNTS[1:]):
+        matrices = weights[:, shift : shift + neurons * count]
+        outputs = matrices.reshape(len(weights), neurons, count) @ outputs
+        shift += neurons * count
+    return outputs.transpose(0, 2, 1)
+
+
+def agreement(genomes: np.ndarray, positions: Positions) -> np.ndarray:
+    """Share of the positions where each chromosome chooses the recorded action"""
+    scores = np.zeros(len(genomes))
+    for start in range(0, len(genomes), SCREENING_CHUNK):
+        outputs = batch_outputs(
+            genomes[start : start + SCREENING_CHUNK], positions.inputs
+        )
+        # Python ints from here, MOVE scores are products of two outputs
+        for i, chromosome_outputs in enumerate(outputs.tolist(), start):
+            scores[i] = sum(
+                GreenCircleAI.choose(ai_outputs, indexes, actions) == action
+                for ai_outputs, indexes, actions, action in zip(
+                    chromosome_outputs,
+                    positions.applications,
+                    positions.actions,
+                    positions.chosen,
+                )
+            ) / max(1, len(positions))
+    return scores
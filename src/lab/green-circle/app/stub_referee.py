@@ -0,0 +1,45 @@
+# Stand-in for the Java referee, speaking the referee.py line protocol.
+# The "game" is decided by the genomes checksums, so results are deterministic.
+import sys
+import time
+
+import lab_common  # noqa: F401
+from genome_bank import is_bank_argument, read_genome_bank
+from referee import END_OF_MATCH
+
+
+def checksum(file_name: str) -> int:
+    if is_bank_argument(file_name):
+        return int(read_genome_bank(file_name).view("uint8").sum())
+    with open(file_name, "rb") as f:
+        return sum(f.read())
+
+
+def play(file_name_1: str, file_name_2: str) -> None:
+    checksum_1, checksum_2 = checksum(file_name_1), checksum(file_name_2)
+    rounds = 100 + (checksum_1 + checksum_2) % 100
+    for frame in range(rounds):
+        print(f"KEY_FRAME {frame + 1}")
+    if checksum_1 == checksum_2:
+        print("-1 -1")
+    else:
+        score_1 = 5 if checksum_1 > checksum_2 else checksum_1 % 5
+        score_2 = 5 if checksum_2 > checksum_1 else checksum_2 % 5
+        print(f"{score_1} {score_2}")
+
+
+if __name__ == "__main__":
+    # One-shot invocation, like the Java referee: the match is on the command line
+    if len(sys.argv) > 1:
+        play(*sys.argv[1:])
+        sys.exit()
+
+    for line in sys.stdin:
+        args = line.split()
+        if "crash" in args:
+            sys.exit(1)
+        if "hang" in args:
+            time.sleep(60)
+
+        play(*args)
+        print(END_OF_MATCH, flush=True)
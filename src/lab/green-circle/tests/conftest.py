@@ -0,0 +1,33 @@
+import pytest
+
+from evolution import GeneticAlgorithm
+from genetic_algorithm import GreenCircleGeneticAlgorithm, GreenCirclePopulation
+
+
+class SimpleGeneticAlgorithm(GeneticAlgorithm[GreenCirclePopulation]):
+    """The GA core on Green Circle chromosomes, `duel` plays in process"""
+
+    def __init__(self, *args, duel=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.duel = duel
+        self.launched = []
+
+    def run_duels(self, launch_duel, duels):
+        self.launched = [key for key, _ in duels]
+        for player_1, player_2 in self.launched:
+            yield (player_1, player_2), self.duel(player_1, player_2)
+
+
+@pytest.fixture
+def simple_algorithm():
+    def make(chromosome_size=50, population_size=9, **kwargs):
+        return SimpleGeneticAlgorithm(chromosome_size, population_size, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def green_circle_algorithm(tmp_path, monkeypatch):
+    # The algorithm works in the current directory, see its .chromosomes/
+    monkeypatch.chdir(tmp_path)
+    return GreenCircleGeneticAlgorithm
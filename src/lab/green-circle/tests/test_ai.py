@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+from random import Random
+
+from click.testing import CliRunner
+
+import ai
+from ai import (
+    HIDDENS_COUNTS,
+    INPUTS_COUNT,
+    OUTPUTS_COUNT,
+    SYNAPSES_COUNT,
+    NeuralNetwork,
+)
+from genetic_algorithm import GENE_MAX, GENE_MIN
+from main import main
+
+
+def test_matrix_output_matches_neurons():
+    random = Random(0)
+    weights = [random.randint(GENE_MIN, GENE_MAX) for _ in range(SYNAPSES_COUNT)]
+    neural_network = NeuralNetwork(weights, INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT)
+    neurons_only = NeuralNetwork(weights, INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT)
+    neurons_only.matrices = []
+
+    assert len(neural_network.matrices) == len(HIDDENS_COUNTS) + 1
+    for _ in range(10):
+        inputs = [random.randint(0, 40) for _ in range(INPUTS_COUNT)]
+        outputs = neural_network.calculate_output(inputs)
+        assert outputs == neurons_only.calculate_output(inputs)
+        assert all(type(output) is int for output in outputs)
+
+
+def test_sparse_output_matches_neurons():
+    random = Random(0)
+    weights = [
+        0 if random.random() < 0.9 else random.randint(GENE_MIN, GENE_MAX)
+        for _ in range(SYNAPSES_COUNT)
+    ]
+    sparse = NeuralNetwork(weights, INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT, True)
+    neurons_only = NeuralNetwork(weights, INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT)
+    neurons_only.matrices = []
+
+    assert not sparse.matrices
+    synapses = sum(len(indexes) for columns in sparse.columns for indexes, _ in columns)
+    assert synapses == sum(weight != 0 for weight in weights)
+    for _ in range(10):
+        inputs = [
+            random.randint(0, 40) if random.random() < 0.2 else 0
+            for _ in range(INPUTS_COUNT)
+        ]
+        assert sparse.calculate_output(inputs) == neurons_only.calculate_output(inputs)
+
+
+def test_sparse_bot_does_not_import_numpy():
+    # The referee starts ai.py for every duel, sparse bots skip the NumPy import
+    code = (
+        "import sys, ai; ai.GreenCircleAI([0] * ai.SYNAPSES_COUNT, sparse=True);"
+        " print('numpy' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(ai.__file__),
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    assert result.stdout.decode().strip() == "False"
+
+
+def test_sparsity_command(tmp_path):
+    path = tmp_path / "chromosome.txt"
+    # One character per weight, "O" is 0: only the first column of layer 1 is set
+    first_layer = INPUTS_COUNT * HIDDENS_COUNTS[0]
+    path.write_text(
+        "".join(
+            "P" if i < first_layer and i % INPUTS_COUNT == 0 else "O"
+            for i in range(SYNAPSES_COUNT)
+        )
+    )
+
+    result = CliRunner().invoke(main, ["sparsity", str(path)])
+
+    assert result.exit_code == 0, result.output
+    assert (
+        f"Layer 1: {HIDDENS_COUNTS[0]}/{INPUTS_COUNT * HIDDENS_COUNTS[0]}"
+        in result.output
+    )
+    assert f"{INPUTS_COUNT - 1} unused inputs" in result.output
+    assert "Layer 2: 0/" in result.output
@@ -0,0 +1,30 @@
+import sys
+
+from async_referee import AsyncDuelRunner
+from genetic_algorithm import DUEL_DEFAULT, parse_duel
+
+from tests.test_referee import STUB_REFEREE, files  # noqa: F401
+
+
+def test_async_duel_runner(files):  # noqa: F811
+    duels = [((i, j), (files[i], files[j])) for i in range(3) for j in range(3)]
+    runner = AsyncDuelRunner(STUB_REFEREE, parse_duel, DUEL_DEFAULT, concurrency=2)
+    results = dict(runner.imap_unordered(duels))
+
+    assert len(results) == 9
+    assert results[(0, 1)][:2] == (4, 5)
+    assert results[(1, 0)][:2] == (5, 4)
+    assert results[(0, 2)][:2] == (-1, -1)
+    assert runner.matches == 9
+    assert runner.failures == 0
+
+
+def test_async_duel_runner_timeout():
+    hung = [sys.executable, "-c", "import time; time.sleep(30)"]
+    runner = AsyncDuelRunner(hung, parse_duel, DUEL_DEFAULT, timeout=0.2, retries=2)
+    results = list(runner.imap_unordered([("a", ()), ("b", ())]))
+
+    assert sorted(results) == [("a", DUEL_DEFAULT), ("b", DUEL_DEFAULT)]
+    assert runner.timeouts == 4
+    assert runner.retried == 4
+    assert runner.failures == 2
@@ -0,0 +1,72 @@
+from random import Random
+
+from ai import INPUTS_COUNT, OUTPUTS_COUNT, GreenCircleAI, NeuralNetwork
+from genetic_algorithm import (
+    CHROMOSOME_SIZE,
+    GENE_MAX,
+    GENE_MIN,
+    GENE_MUTATE_RATIO,
+    POPULATION_SIZE,
+    GreenCircleChromosome,
+    GreenCirclePopulation,
+)
+
+# Hot paths of a generation and of a bot turn, at production sizes. Timings are
+# only taken with --benchmark-enable, see the benchmark targets of the Makefile.
+
+
+def test_chromosome_crossover(benchmark):
+    parent_1 = GreenCircleChromosome.random(0, CHROMOSOME_SIZE)
+    parent_2 = GreenCircleChromosome.random(0, CHROMOSOME_SIZE)
+    child_1, _ = benchmark(parent_1.crossover, 1, parent_2)
+
+    assert child_1.genome.shape == (CHROMOSOME_SIZE,)
+
+
+def test_chromosome_mutate(benchmark):
+    chromosome = GreenCircleChromosome.random(0, CHROMOSOME_SIZE)
+    benchmark(chromosome.mutate, GENE_MUTATE_RATIO)
+
+    assert GENE_MIN <= chromosome.genome.min() <= chromosome.genome.max() <= GENE_MAX
+
+
+def test_chromosome_copy(benchmark):
+    chromosome = GreenCircleChromosome.random(0, CHROMOSOME_SIZE)
+    copy = benchmark(chromosome.copy)
+
+    assert copy.id == chromosome.id
+
+
+def test_population_random(benchmark):
+    population = benchmark(
+        GreenCirclePopulation.random, POPULATION_SIZE, CHROMOSOME_SIZE
+    )
+
+    assert population.genomes.shape == (POPULATION_SIZE, CHROMOSOME_SIZE)
+
+
+def test_reproduce_and_mutate(benchmark, simple_algorithm):
+    algorithm = simple_algorithm(CHROMOSOME_SIZE, POPULATION_SIZE)
+
+    def setup():
+        algorithm.population = GreenCirclePopulation.random(
+            POPULATION_SIZE, CHROMOSOME_SIZE
+        )
+        algorithm.scores = list(range(POPULATION_SIZE))
+        return (1,), {}
+
+    benchmark.pedantic(algorithm.reproduce_and_mutate, setup=setup, rounds=20)
+
+    assert len(algorithm.population.chromosomes) == POPULATION_SIZE
+
+
+def test_neural_network_calculate_output(benchmark):
+    network: NeuralNetwork = GreenCircleAI(
+        GreenCircleChromosome.random(0, CHROMOSOME_SIZE).genome.tolist()
+    ).neural_network
+    # Game inputs are small counters and flags
+    random = Random(0)
+    inputs = [random.randint(0, 5) for _ in range(INPUTS_COUNT)]
+    outputs = benchmark(network.calculate_output, inputs)
+
+    assert len(outputs) == OUTPUTS_COUNT
@@ -0,0 +1,53 @@
+import importlib.util
+from random import Random
+
+import pytest
+
+from ai import INPUTS_COUNT, SYNAPSES_COUNT, GreenCircleAI
+from bot_builder import SUBMISSION_LIMIT, build_bot
+from engine import GreenCircleGame
+from genetic_algorithm import GENE_MAX, GENE_MIN
+
+
+def load_bot(path, source):
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location("bot", path)
+    bot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bot)
+    return bot
+
+
+@pytest.mark.parametrize("sparsity", [0.0, 0.7, 0.99])
+def test_compiled_bot_plays_like_the_chromosome(tmp_path, sparsity):
+    random = Random(0)
+    weights = [
+        0 if random.random() < sparsity else random.randint(GENE_MIN, GENE_MAX)
+        for _ in range(SYNAPSES_COUNT)
+    ]
+    source = build_bot(weights)
+    compiled = load_bot(tmp_path / "bot.py", source).CompiledAI()
+    ai = GreenCircleAI(weights)
+
+    assert len(source) <= SUBMISSION_LIMIT
+    for _ in range(20):
+        inputs = [
+            random.randint(0, 5) if random.random() < 0.2 else 0
+            for _ in range(INPUTS_COUNT)
+        ]
+        assert compiled.neural_network.calculate_output(
+            inputs
+        ) == ai.neural_network.calculate_output(inputs)
+
+    def bot(*view):
+        action = ai.decide(*view)
+        assert compiled.decide(*view) == action
+        return action
+
+    game = GreenCircleGame(0)
+    for _ in range(6):
+        game.play_turn(bot)
+
+
+def test_build_bot_over_the_limit():
+    with pytest.raises(ValueError):
+        build_bot([1] * SYNAPSES_COUNT, limit=1000)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from checkpoint import read_checkpoint, write_checkpoint
+from genetic_algorithm import GreenCirclePopulation
+
+
+def test_write_read_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    write_checkpoint(path, {"a": np.arange(3, dtype=np.int8)}, {"b": [1, "c"]})
+    write_checkpoint(path, {"a": np.arange(4, dtype=np.int8)}, {"b": [2, "d"]})
+
+    arrays, meta = read_checkpoint(path)
+    assert arrays["a"].dtype == np.int8
+    assert arrays["a"].tolist() == [0, 1, 2, 3]
+    assert meta == {"b": [2, "d"]}
+    assert [file.name for file in tmp_path.iterdir()] == ["checkpoint.npz"]
+
+
+def test_resume_reproduces_the_run(tmp_path, simple_algorithm):
+    algorithm = simple_algorithm()
+    algorithm.checkpoint_file = str(tmp_path / "checkpoint.npz")
+    algorithm.population = GreenCirclePopulation.random(9, 50)
+    algorithm.scores = list(range(9))
+    algorithm.population.chromosomes[3].set_last_score(12.5)
+    algorithm.save_checkpoint(7)
+
+    algorithm.reproduce_and_mutate(8)
+    expected = algorithm.population.genomes.copy()
+
+    resumed = simple_algorithm()
+    resumed.checkpoint_file = algorithm.checkpoint_file
+    assert resumed.load_checkpoint() == 7
+    assert resumed.population.chromosomes[3].get_last_score() == 12.5
+    assert resumed.population.genomes.dtype == np.int8
+    resumed.reproduce_and_mutate(8)
+
+    assert np.array_equal(resumed.population.genomes, expected)
+    assert resumed.scores == algorithm.scores
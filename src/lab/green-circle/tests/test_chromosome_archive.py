@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from chromosome_archive import ChromosomeArchive
+from genetic_algorithm import GreenCircleChromosome, GreenCircleGene
+from main import main
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "archive.bin")
+
+
+def chromosomes():
+    return [
+        GreenCircleChromosome(0, GreenCircleGene.random_genome(20), id="a"),
+        GreenCircleChromosome(0, GreenCircleGene.random_genome(20), id="b"),
+    ]
+
+
+def test_append_and_get(path):
+    archive = ChromosomeArchive(path, np.int8, 20)
+    first = chromosomes()
+    assert archive.append(first) == 2
+    assert archive.append(first) == 0
+
+    mutated = GreenCircleChromosome(3, GreenCircleGene.random_genome(20), id="a")
+    assert archive.append([mutated]) == 1
+
+    archive = ChromosomeArchive.open(path)
+    assert len(archive) == 3
+    assert ("b", 0) in archive
+    assert np.array_equal(archive.get("a", 0), first[0].genome)
+    assert np.array_equal(archive.get("a"), mutated.genome)
+    assert archive.records()["generation"].tolist() == [0, 0, 3]
+    with pytest.raises(KeyError):
+        archive.get("c")
+
+
+def test_torn_record_is_dropped(path):
+    archive = ChromosomeArchive(path, np.int8, 20)
+    archive.append(chromosomes())
+    with open(path, "ab") as f:
+        f.write(b"torn")
+
+    archive = ChromosomeArchive(path, np.int8, 20)
+    assert len(archive) == 2
+    chromosome = GreenCircleChromosome(1, GreenCircleGene.random_genome(20), id="c")
+    archive.append([chromosome])
+    assert np.array_equal(ChromosomeArchive.open(path).get("c"), chromosome.genome)
+
+
+def test_genome_type_mismatch(path):
+    ChromosomeArchive(path, np.int8, 20).append(chromosomes())
+    with pytest.raises(ValueError):
+        ChromosomeArchive(path, np.float32, 20)
+
+
+def test_export(path):
+    archived = chromosomes()
+    ChromosomeArchive(path, np.int8, 20).append(archived)
+
+    result = CliRunner().invoke(main, ["export", "b", "--archive", path])
+    assert result.exit_code == 0
+    assert result.output == str(archived[1])
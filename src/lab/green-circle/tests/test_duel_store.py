@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from duel_store import DuelStore
+from evaluation_cache import EvaluationCache
+from main import main
+
+A = SimpleNamespace(id="a", generation=0)
+B = SimpleNamespace(id="b", generation=1)
+C = SimpleNamespace(id="c", generation=1)
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "duels.sqlite")
+    with DuelStore(path) as store:
+        store.add_duels(
+            1, [(A, "ha", B, "hb", (5, 2, 150)), (C, "hc", A, "ha", (1, 5, 180))]
+        )
+        store.add_duels(2, [(B, "hb", A, "ha", (-1, -1, 200))])
+    return path
+
+
+def test_queries(path):
+    with DuelStore(path) as store:
+        assert len(store) == 3
+        assert store.head_to_head("a", "b") == [(1, (5, 2, 150)), (2, (-1, -1, 200))]
+        assert store.head_to_head("b", "a") == [(1, (2, 5, 150)), (2, (-1, -1, 200))]
+        assert store.history("a", 1) == [(1, "b", (5, 2, 150)), (1, "c", (5, 1, 180))]
+        assert store.opponents("a") == [("b", 2, 2.0, 0.5), ("c", 1, 5.0, 1.0)]
+        assert store.generation_summary(1) == [
+            ("a", 2, 5.0),
+            ("b", 1, 2.0),
+            ("c", 1, 1.0),
+        ]
+        assert store.matchup_results("hb", "ha", 1) == [(-1, -1, 200)]
+        assert store.matchup_results("hb", "ha", 5) == [(-1, -1, 200), (2, 5, 150)]
+
+
+def test_cache_reads_the_store(path):
+    with DuelStore(path) as store:
+        cache = EvaluationCache(10, 2)
+        cache.store = store
+        assert cache.lookup("ha", "hb") in [(-1, -1, 200), (5, 2, 150)]
+        assert cache.lookup("ha", "hc") is None
+
+
+def test_duels_report(path):
+    result = CliRunner().invoke(main, ["duels", path, "a", "--opponent", "c"])
+
+    assert result.exit_code == 0
+    assert result.output == "00001 (5, 1, 180)\n"
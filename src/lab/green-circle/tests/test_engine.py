@@ -0,0 +1,193 @@
+import json
+from random import Random
+
+import engine
+import main as cli
+import pytest
+from ai import INPUTS_COUNT, SYNAPSES_COUNT, GreenCircleAI
+from click.testing import CliRunner
+from engine import (
+    BONUS,
+    CARD_TYPES,
+    TECHNICAL_DEBT,
+    VALIDATION_GAMES,
+    GreenCircleGame,
+    ReplayedGame,
+    ReplayError,
+    record_turns,
+    release_plan,
+)
+from genetic_algorithm import GENE_MAX, GENE_MIN, simulate_duel
+from validation import check_validation, save_validation
+
+
+def random_bot(*_) -> str:
+    return "RANDOM"
+
+
+def cards(**counts) -> list:
+    hand = [0] * CARD_TYPES
+    for card, count in counts.items():
+        hand[int(card[1:])] = count
+    return hand
+
+
+def test_release_plan():
+    needs = [4, 0, 0, 0, 0, 0, 0, 2]
+    none = [0] * CARD_TYPES
+
+    assert release_plan(cards(c0=2, c7=1), none, needs, True) == (cards(c0=2, c7=1), 0)
+    # A BONUS card is one skill of any kind
+    assert release_plan(cards(c0=2, c8=2), none, needs, True) == (cards(c0=2, c8=2), 0)
+    # Shoddy skills are paid with any other card, TECHNICAL_DEBT included
+    assert release_plan(cards(c0=2, c9=2), none, needs, False) == (cards(c0=2, c9=2), 2)
+    assert release_plan(cards(c0=2, c9=2), none, needs, True) is None
+    assert release_plan(cards(c0=2, c9=1), none, needs, False) is None
+    # Automated skills are free
+    assert release_plan(cards(c0=2), cards(c7=1), needs, True) == (cards(c0=2), 0)
+    assert BONUS < TECHNICAL_DEBT < CARD_TYPES
+
+
+def test_game_is_deterministic():
+    results = [GreenCircleGame(seed).play(random_bot, random_bot) for seed in (1, 1, 2)]
+
+    assert results[0] == results[1]
+    for score_1, score_2, rounds in results:
+        assert 0 < rounds <= engine.MAX_ROUNDS
+        assert (score_1 < 0) == (score_2 < 0)
+
+
+def test_ai_decides_a_possible_action():
+    random = Random(0)
+    ai = GreenCircleAI(
+        [random.randint(GENE_MIN, GENE_MAX) for _ in range(SYNAPSES_COUNT)]
+    )
+    game = GreenCircleGame(0)
+    seen = []
+
+    def bot(*view):
+        seen.append(view)
+        return ai.decide(*view)
+
+    game.ask(bot)
+
+    view = seen[0]
+    assert len(ai.prepare_inputs(*view)[0]) == INPUTS_COUNT
+    assert ai.decide(*view) in view[-1]
+
+
+def test_simulate_duel(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "MAX_ROUNDS", 4)
+    file_names = []
+    # One character per weight, "O" is 0 and "Z" 11
+    for i, weight in enumerate("OZ"):
+        file_name = tmp_path / f"{i}.txt"
+        file_name.write_text(weight * SYNAPSES_COUNT)
+        file_names.append(str(file_name))
+
+    assert simulate_duel(*file_names, 3) == simulate_duel(*file_names, 3)
+    assert simulate_duel(*file_names, 3)[2] == 4
+
+
+def recorded_game(seed: int) -> tuple:
+    """The result of a game and the decisions of each player, as ai.py records them"""
+    random = Random(seed)
+    decisions: tuple = ([], [])
+
+    def recording(player):
+        def bot(*view):
+            action = random.choice(
+                [action for action in view[-1] if action != "RANDOM"]
+            )
+            decisions[player].append(json.loads(json.dumps([*view, action])))
+            return action
+
+        return bot
+
+    return GreenCircleGame(seed).play(recording(0), recording(1)), decisions
+
+
+def test_replay_reproduces_recorded_games():
+    for seed in (1, 2):
+        result, decisions = recorded_game(seed)
+        turns = record_turns(*decisions)
+
+        assert len(turns) == result[2]
+        assert ReplayedGame(turns).replay() == result
+
+
+def test_replay_reports_divergences(monkeypatch):
+    _, decisions = recorded_game(1)
+    turns = record_turns(*decisions)
+
+    # The first decision of turn 3 is a MOVE, its applications are compared
+    turns[3][1][0][1][0][1] += 1
+    with pytest.raises(ReplayError, match="turn 3: MOVE applications"):
+        ReplayedGame(turns).replay()
+    turns[3][1][0][1][0][1] -= 1
+
+    # A recorded decision the engine does not ask for
+    turns[5][1].insert(1, turns[5][1][0])
+    with pytest.raises(ReplayError, match="turn 5: MOVE not asked"):
+        ReplayedGame(turns).replay()
+    del turns[5][1][1]
+
+    # A rule the engine gets wrong
+    monkeypatch.setattr(engine, "ADMINISTRATIVE_DEBT", 3)
+    with pytest.raises(ReplayError, match="turn 4: MOVE opponent cards"):
+        ReplayedGame(turns).replay()
+
+
+def test_validate_engine(tmp_path, monkeypatch):
+    games = [recorded_game(1), recorded_game(2)]
+
+    def launch_duel(file_name_1, file_name_2):
+        # The Java referee, each bot recording to <chromosome>.jsonl
+        result, decisions = games.pop(0)
+        for file_name, player_decisions in zip((file_name_1, file_name_2), decisions):
+            with open(f"{file_name}.jsonl", "w") as f:
+                f.writelines(
+                    json.dumps(decision) + "\n" for decision in player_decisions
+                )
+        return result
+
+    monkeypatch.setattr(cli, "launch_duel", launch_duel)
+    chromosome = tmp_path / "chromosome.txt"
+    chromosome.write_text("O")
+    record = tmp_path / "validation.json"
+    arguments = ["validate-engine", str(chromosome), str(chromosome), "--games", "2"]
+    arguments += ["--record", str(record)]
+
+    result = CliRunner().invoke(cli.main, arguments)
+    assert result.exit_code == 0
+    assert result.output.count("turns reproduced") == 2
+    assert json.loads(record.read_text())["games"] == 2
+    record.unlink()
+
+    first, second = recorded_game(1), recorded_game(2)
+    games[:] = [first, (first[0], second[1])]
+    result = CliRunner().invoke(cli.main, arguments)
+    assert result.exit_code == 1
+    assert "1: result" in result.output
+    assert "1 of 2 games diverged" in result.output
+    assert not record.exists()
+
+
+def test_python_referee_needs_a_validated_engine(
+    tmp_path, monkeypatch, green_circle_algorithm
+):
+    record = tmp_path / "validation.json"
+    monkeypatch.setattr("genetic_algorithm.VALIDATION_FILE", str(record))
+    with pytest.raises(ValueError, match="never validated"):
+        green_circle_algorithm(python_referee=True)
+
+    save_validation(str(record), engine.__file__, VALIDATION_GAMES - 1)
+    with pytest.raises(ValueError, match=f"{VALIDATION_GAMES - 1} games"):
+        check_validation(str(record), engine.__file__, VALIDATION_GAMES)
+
+    record.write_text(json.dumps({"engine": "0" * 32, "games": VALIDATION_GAMES}))
+    with pytest.raises(ValueError, match="engine.py changed"):
+        check_validation(str(record), engine.__file__, VALIDATION_GAMES)
+
+    save_validation(str(record), engine.__file__, VALIDATION_GAMES)
+    assert green_circle_algorithm(python_referee=True).launch_duel is simulate_duel
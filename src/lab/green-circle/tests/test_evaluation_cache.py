@@ -0,0 +1,63 @@
+import numpy as np
+
+from evaluation_cache import EvaluationCache, genome_hash
+
+
+def test_genome_hash():
+    genome = np.arange(10, dtype=np.int8)
+
+    assert genome_hash(genome) == genome_hash(genome.copy())
+    assert genome_hash(genome) != genome_hash(genome.astype(np.int16))
+    assert genome_hash(genome) != genome_hash(genome[::-1])
+
+
+def test_lookup_needs_fresh_samples():
+    cache = EvaluationCache(10, 2)
+    cache.add("a", "b", (5, 1, 120))
+    assert cache.lookup("a", "b") is None
+
+    cache.add("b", "a", (1, 5, 120))
+    assert cache.lookup("a", "b") == (5, 1, 120)
+    assert cache.lookup("b", "a") == (1, 5, 120)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_lru_eviction():
+    cache = EvaluationCache(2, 1)
+    cache.set_score("a", 1.0)
+    cache.set_score("b", 2.0)
+    assert cache.get_score("a", 0.0) == 1.0
+    cache.set_score("c", 3.0)
+
+    assert list(cache.scores) == ["a", "c"]
+    assert cache.get_score("b", -1.0) == -1.0
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "cache.pickle")
+    with EvaluationCache(10, 1, path) as cache:
+        cache.set_score("a", 1.0)
+        cache.add("a", "b", (5, 0, 100))
+
+    cache = EvaluationCache(10, 1, path)
+    assert cache.get_score("a", 0.0) == 1.0
+    assert cache.lookup("b", "a") == (0, 5, 100)
+
+
+def test_run_cached_duels(simple_algorithm):
+    algorithm = simple_algorithm(
+        5, 3, duel=lambda player_1, player_2: (player_1, player_2, 100)
+    )
+    algorithm.cache = EvaluationCache(10, 1)
+    hashes = ["x", "y", "x"]
+
+    results = list(
+        algorithm.run_cached_duels(None, [((0, 1), ()), ((0, 2), ())], hashes)
+    )
+    assert algorithm.launched == [(0, 1)]
+    assert results == [((0, 1), (0, 1, 100))]
+    assert algorithm.cache.skipped == 1
+
+    results = list(algorithm.run_cached_duels(None, [((1, 2), ())], hashes))
+    assert algorithm.launched == []
+    assert results == [((1, 2), (1, 0, 100))]
@@ -0,0 +1,176 @@
+import numpy as np
+import pytest
+
+from chromosome_archive import ChromosomeArchive
+from evolution import Gene, Standings
+from genetic_algorithm import (
+    CHROMOSOME_SIZE,
+    GENE_MAX,
+    GENE_MIN,
+    GreenCircleChromosome,
+    GreenCircleGene,
+    GreenCirclePopulation,
+)
+
+
+def assert_genome(genome: np.ndarray):
+    assert genome.dtype == np.int8
+    assert GENE_MIN <= genome.min() and genome.max() <= GENE_MAX
+
+
+def test_chromosome_random():
+    chromosome = GreenCircleChromosome.random(0, CHROMOSOME_SIZE)
+
+    assert chromosome.genome.shape == (CHROMOSOME_SIZE,)
+    assert_genome(chromosome.genome)
+
+
+def test_chromosome_str():
+    chromosome = GreenCircleChromosome.random(0, CHROMOSOME_SIZE)
+    string = str(chromosome)
+
+    assert len(string) == CHROMOSOME_SIZE
+    assert string == "".join([str(gene) for gene in chromosome.genes])
+    assert np.array_equal(
+        GreenCircleChromosome.from_str(0, string).genome, chromosome.genome
+    )
+
+
+def test_gene_view():
+    chromosome = GreenCircleChromosome.random(0, 10)
+    gene = chromosome.genes[3]
+    gene.synapse_weight = 100
+
+    assert chromosome.genome[3] == GENE_MAX
+    assert gene.synapse_weight == GENE_MAX
+
+
+def test_population_matrix():
+    population = GreenCirclePopulation.random(4, 50)
+
+    assert population.genomes.shape == (4, 50)
+    assert_genome(population.genomes)
+    for i, chromosome in enumerate(population.chromosomes):
+        assert np.shares_memory(chromosome.genome, population.genomes)
+        assert np.array_equal(chromosome.genome, population.genomes[i])
+
+
+def test_chromosome_copy():
+    chromosome = GreenCircleChromosome.random(0, 50)
+    chromosome.set_last_score(100)
+    copy = chromosome.copy()
+    genome = chromosome.genome.copy()
+
+    assert copy.id == chromosome.id
+    assert np.shares_memory(copy.genome, chromosome.genome)
+    assert copy.get_last_score() == chromosome.get_last_score()
+    with pytest.raises(ValueError):
+        copy.genome[0] = 0
+
+    copy.mutate(0.5)
+    assert not np.shares_memory(copy.genome, chromosome.genome)
+    assert not np.array_equal(copy.genome, genome)
+    assert np.array_equal(chromosome.genome, genome)
+
+
+def test_chromosome_crossover():
+    parent_1 = GreenCircleChromosome(0, np.full(50, GENE_MIN, dtype=np.int8))
+    parent_2 = GreenCircleChromosome(0, np.full(50, GENE_MAX, dtype=np.int8))
+    child_1, child_2 = parent_1.crossover(1, parent_2)
+
+    assert child_1.generation == child_2.generation == 1
+    assert np.array_equal(child_1.genome + child_2.genome, np.zeros(50))
+    assert_genome(child_1.genome)
+
+
+def test_chromosome_mutate():
+    chromosome = GreenCircleChromosome(0, np.full(1000, 127, dtype=np.int8))
+    chromosome.mutate(0.01)
+
+    assert np.count_nonzero(chromosome.genome != 127) == 10
+    assert_genome(chromosome.genome[chromosome.genome != 127])
+
+
+def test_crossover_population():
+    genomes = np.stack([np.full(50, GENE_MIN), np.full(50, GENE_MAX)]).astype(np.int8)
+    children, crossing = GreenCircleGene.crossover_population(
+        genomes, np.array([0, 1, 1, 0, 0, 0]), 1.0
+    )
+
+    assert children.shape == (6, 50)
+    assert crossing.all()
+    assert np.array_equal(children[0] + children[1], np.zeros(50))
+    assert np.array_equal(children[4], genomes[0])
+
+    children, crossing = GreenCircleGene.crossover_population(
+        genomes, np.array([0, 1]), 0.0
+    )
+    assert not crossing.any()
+    assert np.array_equal(children, genomes)
+
+
+def test_gene_hooks_are_abstract():
+    class PartialGene(Gene):
+        random_genome = GreenCircleGene.random_genome
+        encode_genome = GreenCircleGene.encode_genome
+        decode_genome = GreenCircleGene.decode_genome
+        crossover_genomes = GreenCircleGene.crossover_genomes
+
+    with pytest.raises(TypeError, match="mutate_values"):
+        PartialGene(np.zeros(3, dtype=np.int8), 0)
+
+
+def test_mutate_population():
+    genomes = np.full((4, 1000), 127, dtype=np.int8)
+    GreenCircleGene.mutate_population(genomes, np.array([1, 3]), 0.01)
+
+    assert np.count_nonzero(genomes != 127, axis=1).tolist() == [0, 10, 0, 10]
+
+
+def test_reproduce_and_mutate(simple_algorithm):
+    algorithm = simple_algorithm()
+    algorithm.population = GreenCirclePopulation.random(9, 50)
+    algorithm.scores = list(range(9))
+    best = algorithm.population.chromosomes[8]
+    algorithm.reproduce_and_mutate(1)
+
+    assert algorithm.scores == list(range(8, -1, -1))
+    assert len(algorithm.population.chromosomes) == 9
+    assert algorithm.population.genomes.shape == (9, 50)
+    assert algorithm.population.chromosomes[0].id == best.id
+    assert np.array_equal(algorithm.population.genomes[0], best.genome)
+    for i, chromosome in enumerate(algorithm.population.chromosomes):
+        assert np.shares_memory(chromosome.genome, algorithm.population.genomes)
+        assert np.array_equal(chromosome.genome, algorithm.population.genomes[i])
+
+
+def test_mutated_copies_are_archived_apart(tmp_path, simple_algorithm):
+    # Last generation: no crossover, every child is a mutated copy of the best
+    algorithm = simple_algorithm(generations_max=1)
+    algorithm.population = GreenCirclePopulation.random(9, 50)
+    algorithm.scores = [0] * 8 + [100]
+    algorithm.reproduce_and_mutate(1)
+
+    archive = ChromosomeArchive(str(tmp_path / "archive.bin"), np.int8, 50)
+    assert archive.append(algorithm.population.chromosomes) == 9
+    for chromosome in algorithm.population.chromosomes[1:]:
+        assert chromosome.generation == 1
+        assert np.array_equal(archive.get(chromosome.id), chromosome.genome)
+
+
+def test_standings():
+    def fold(scores, player_1, player_2, result):
+        scores[player_1] += result[0]
+        scores[player_2] += result[1]
+
+    standings = Standings([0.0] * 4, fold, elite_size=1, patience=2)
+    standings.add(0, 1, (3, 0))
+    standings.add(2, 3, (0, 1))
+    assert standings.ranking()[0] == 0
+    assert standings.duels == [1, 1, 1, 1]
+    assert not standings.is_stable()
+
+    standings.add(0, 2, (1, 0))
+    assert standings.is_stable()
+    assert standings.played == 3
+    assert str(standings).startswith("#1:0=4.0(2)")
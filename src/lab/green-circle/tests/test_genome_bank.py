@@ -0,0 +1,32 @@
+import sys
+
+import numpy as np
+from ai import read_genome_bank as bot_read_genome_bank
+from genetic_algorithm import DUEL_DEFAULT, GreenCirclePopulation, parse_duel
+from genome_bank import bank_argument, read_genome_bank, write_genome_bank
+from referee import RefereeSession
+
+STUB_REFEREE = [sys.executable, "app/stub_referee.py"]
+
+
+def test_genome_bank(tmp_path):
+    path = str(tmp_path / "genomes.bin")
+    population = GreenCirclePopulation.random(4, 30)
+    write_genome_bank(path, population.genomes)
+
+    for slot, chromosome in enumerate(population.chromosomes):
+        argument = bank_argument(path, slot)
+        assert np.array_equal(read_genome_bank(argument), chromosome.genome)
+        assert bot_read_genome_bank(argument) == chromosome.genome.tolist()
+
+
+def test_population_genome_bank(tmp_path):
+    path = str(tmp_path / "genomes.bin")
+    population = GreenCirclePopulation.random(3, 30)
+    population.genomes[1] = population.genomes[0]
+    population.encode(genome_bank=path)
+    file_names = population.get_file_names(path)
+
+    assert file_names == [f"{path}#0", f"{path}#1", f"{path}#2"]
+    with RefereeSession(STUB_REFEREE, 1, parse_duel, DUEL_DEFAULT) as session:
+        assert session.play((file_names[0], file_names[1]))[:2] == (-1, -1)
@@ -0,0 +1,69 @@
+from evaluation_cache import EvaluationCache
+from evolution import Standings
+from racing import Racing
+
+
+def fold(scores, player_1, player_2, result):
+    scores[player_1] += result[0]
+    scores[player_2] += result[1]
+
+
+def test_undecided():
+    standings = Standings([0.0] * 4, fold, 1)
+    racing = Racing(10, 2.0)
+    assert racing.undecided(standings) == [0, 1, 2, 3]
+
+    for _ in range(5):
+        standings.add(0, 1, (10 + len(standings.gains[0]) % 2, -10))
+        standings.add(2, 3, (1, -1 - len(standings.gains[2]) % 2))
+
+    # 0 surely leads, 1 is surely last, 2 and 3 cannot reach 0 any more
+    assert racing.undecided(standings) == []
+
+    standings.add(2, 3, (-30, 30))
+    assert racing.undecided(standings) == [0, 3]
+
+
+def test_contenders_are_even():
+    standings = Standings([0.0] * 5, fold, 2)
+    racing = Racing(10, 2.0)
+    assert len(racing.contenders(standings)) == 4
+
+    racing.max_duels = 0
+    assert racing.contenders(standings) == []
+
+
+def duel(player_1, player_2):
+    return player_1, player_2
+
+
+def test_racing_play_duels(simple_algorithm):
+    algorithm = simple_algorithm(population_size=10, elite_ratio=0.2, duel=duel)
+    file_names = [str(i) for i in range(10)]
+    hashes = file_names
+
+    algorithm.standings = Standings([0.0] * 10, fold, 2)
+    algorithm.play_duels(None, file_names, hashes)
+    full = algorithm.standings.played
+
+    algorithm.racing = Racing(10, 2.0)
+    algorithm.standings = Standings([0.0] * 10, fold, 2)
+    algorithm.play_duels(None, file_names, hashes)
+    assert algorithm.standings.played == 10 < full
+    assert sorted(algorithm.standings.ranking()[:2]) == [8, 9]
+
+    algorithm.duel_budget = 7
+    algorithm.standings = Standings([0.0] * 10, fold, 2)
+    algorithm.play_duels(None, file_names, hashes)
+    assert algorithm.standings.played == 7
+
+
+def test_racing_stops_when_no_duel_is_played(simple_algorithm):
+    algorithm = simple_algorithm(population_size=4, elite_ratio=0.25, duel=duel)
+    algorithm.racing = Racing(10, 2.0)
+    algorithm.cache = EvaluationCache(100, 3)
+    algorithm.standings = Standings([0.0] * 4, fold, 1)
+
+    # Clones only: the cache skips every mirror match of every round
+    algorithm.play_duels(None, ["0"] * 4, ["0"] * 4)
+    assert algorithm.standings.played == 0
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from evolution import Standings
+from genetic_algorithm import (
+    RATING_SCALE,
+    RATINGS,
+    GreenCircleChromosome,
+    green_circle_points,
+    green_circle_shares,
+)
+from rating import point_totals
+
+RESULTS = [(5, 2, 120), (1, 5, 180), (-1, -1, 200), (3, 1, 200)]
+PAIRS = np.array([(0, 1), (1, 2), (2, 0), (0, 2)])
+
+
+def test_green_circle_points_match_fold_duel(green_circle_algorithm):
+    algorithm = green_circle_algorithm()
+    scores = [10.0, 0.0, -5.0]
+    for (player_1, player_2), result in zip(PAIRS, RESULTS):
+        algorithm.fold_duel(scores, player_1, player_2, result)
+
+    totals = point_totals([10.0, 0.0, -5.0], PAIRS, green_circle_points(RESULTS))
+    assert totals.tolist() == scores
+    assert green_circle_shares(RESULTS).tolist() == [1.0, 0.0, 0.5, 1.0]
+
+
+def test_modes_keep_one_scale(green_circle_algorithm):
+    # Player 0 beats 1 that beats 2, the last pair draws
+    duels = [
+        (0, 1, (5, 2, 120)),
+        (1, 2, (5, 3, 150)),
+        (0, 2, (5, 1, 100)),
+        (2, 1, (1, 5, 180)),
+        (1, 0, (2, 5, 130)),
+        (2, 0, (-1, -1, 200)),
+    ] * 3
+    rated = {}
+    for rating in RATINGS:
+        algorithm = green_circle_algorithm(rating=rating)
+        algorithm.standings = Standings([30.0, 0.0, -30.0], algorithm.fold(), 1)
+        for player_1, player_2, result in duels:
+            algorithm.standings.add(player_1, player_2, result)
+        rated[rating] = (list(algorithm.standings.scores), algorithm.rate())
+
+    for live, ratings in rated.values():
+        assert np.argsort(live).tolist() == np.argsort(ratings).tolist() == [2, 1, 0]
+    assert rated["sequential"] == rated["points"]
+    # Bradley-Terry ratings stay around their seeds, as the live Elo scores do
+    live, ratings = rated["bradley-terry"]
+    assert np.mean(live) == pytest.approx(0)
+    assert np.mean(ratings) == pytest.approx(0, abs=1)
+    assert np.abs(np.subtract(live, ratings)).max() < RATING_SCALE / 4
+
+
+@pytest.mark.parametrize(
+    "rating, carried", [("points", 25.0), ("bradley-terry", 100.0)]
+)
+def test_ratings_are_carried_over(green_circle_algorithm, rating, carried):
+    algorithm = green_circle_algorithm(rating=rating, cache=True)
+    chromosome = GreenCircleChromosome.random(0, 10)
+    chromosome.set_last_score(100.0)
+
+    assert algorithm.carry(chromosome).get_last_score() == carried
+    algorithm.cache_scores(["a"], [100.0])
+    assert algorithm.cache.get_score("a", 0.0) == carried
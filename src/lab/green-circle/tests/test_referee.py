@@ -0,0 +1,64 @@
+import sys
+
+import pytest
+from genetic_algorithm import DUEL_DEFAULT, parse_duel
+from referee import RefereeError, RefereeSession, RefereeWorker
+
+STUB_REFEREE = [sys.executable, "app/stub_referee.py"]
+
+
+@pytest.fixture
+def files(tmp_path):
+    file_names = []
+    for i, content in enumerate(["abc", "abd", "abc"]):
+        file_name = tmp_path / f"{i}.txt"
+        file_name.write_text(content)
+        file_names.append(str(file_name))
+    return file_names
+
+
+def test_referee_worker(files):
+    worker = RefereeWorker(STUB_REFEREE)
+    try:
+        lines = worker.play((files[0], files[1]))
+        assert parse_duel(lines) == (4, 5, len(lines) - 1)
+        assert parse_duel(worker.play((files[0], files[2])))[:2] == (-1, -1)
+        assert worker.matches == 2
+
+        with pytest.raises(RefereeError):
+            worker.play(("crash", files[0]))
+    finally:
+        worker.close()
+
+
+def test_referee_worker_timeout(files):
+    worker = RefereeWorker(STUB_REFEREE, timeout=0.5)
+    try:
+        with pytest.raises(RefereeError, match="timed out"):
+            worker.play(("hang", files[0]))
+        worker.restart()
+        assert parse_duel(worker.play((files[0], files[1])))[:2] == (4, 5)
+        assert worker.restarts == 1
+    finally:
+        worker.close()
+
+
+def test_referee_session(files):
+    duels = [((i, j), (files[i], files[j])) for i in range(3) for j in range(3)]
+    with RefereeSession(STUB_REFEREE, 2, parse_duel, DUEL_DEFAULT) as session:
+        results = dict(session.imap_unordered(duels))
+        pids = [worker.process.pid for worker in session.workers]
+
+        assert len(results) == 9
+        assert results[(0, 1)][:2] == (4, 5)
+        assert results[(1, 0)][:2] == (5, 4)
+
+        assert session.play(("crash", files[0])) == DUEL_DEFAULT
+        assert sum(worker.restarts for worker in session.workers) == 3
+        stats = session.stats()
+        assert (stats["retries"], stats["failures"]) == (2, 1)
+        assert stats["referee"] > stats["parsing"] > 0
+        assert session.play((files[1], files[2]))[:2] == (5, 4)
+        assert {worker.process.pid for worker in session.workers} != set(pids)
+
+    assert session.workers == []
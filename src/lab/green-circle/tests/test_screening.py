@@ -0,0 +1,56 @@
+import numpy as np
+
+import engine
+from ai import (
+    HIDDENS_COUNTS,
+    INPUTS_COUNT,
+    OUTPUTS_COUNT,
+    SYNAPSES_COUNT,
+    NeuralNetwork,
+)
+from genetic_algorithm import GreenCircleChromosome
+from screening import Positions, agreement, batch_outputs, record_positions
+
+
+def test_batch_outputs_match_neural_network():
+    genomes = np.stack(
+        [GreenCircleChromosome.random(0, SYNAPSES_COUNT).genome for _ in range(3)]
+    )
+    inputs = np.random.default_rng(0).integers(0, 40, (5, INPUTS_COUNT))
+    outputs = batch_outputs(genomes, inputs)
+
+    assert outputs.shape == (3, 5, OUTPUTS_COUNT)
+    for genome, chromosome_outputs in zip(genomes, outputs):
+        neural_network = NeuralNetwork(
+            genome.tolist(), INPUTS_COUNT, HIDDENS_COUNTS, OUTPUTS_COUNT
+        )
+        assert (
+            neural_network.calculate_output_batch(inputs) == chromosome_outputs.tolist()
+        )
+        assert (
+            neural_network.calculate_output(inputs[0].tolist())
+            == chromosome_outputs[0].tolist()
+        )
+
+
+def test_recorded_positions_screen_their_player(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "MAX_ROUNDS", 6)
+    chromosomes = [GreenCircleChromosome.random(0, SYNAPSES_COUNT) for _ in range(2)]
+    file_names = []
+    for i, chromosome in enumerate(chromosomes):
+        file_name = str(tmp_path / f"{i}.txt")
+        chromosome.encode(file_name)
+        file_names.append(file_name)
+
+    positions = record_positions(*file_names, [1])
+    path = str(tmp_path / "positions.npz")
+    positions.save(path)
+    loaded = Positions.load(path)
+
+    assert len(loaded) == len(positions) > 0
+    assert np.array_equal(loaded.inputs, positions.inputs)
+    assert loaded.applications == positions.applications
+    assert loaded.actions == positions.actions
+    # Both players recorded, each agrees with its own moves at least
+    shares = agreement(np.stack([c.genome for c in chromosomes]), loaded)
+    assert 0 < shares.min() and shares.sum() >= 1
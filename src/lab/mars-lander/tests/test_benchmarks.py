@@ -0,0 +1,55 @@
+from app.ai import CHROMOSOME_SIZE, POPULATION_SIZE, X_MAX, X_MIN, LanderChromosome, LanderGeneticAlgorithm, LanderPopulation, LanderSimulation
+
+# Timings are only taken with --benchmark-enable, see the Makefile benchmark targets
+
+
+def test_chromosome_crossover(benchmark):
+    chromosome_1 = LanderChromosome.random(0, CHROMOSOME_SIZE)
+    chromosome_2 = LanderChromosome.random(0, CHROMOSOME_SIZE)
+    chromosome_3, _ = benchmark(chromosome_1.crossover, 1, chromosome_2)
+
+    assert len(chromosome_3.genes) == CHROMOSOME_SIZE
+
+
+def test_chromosome_mutate(benchmark):
+    chromosome = LanderChromosome.random(0, CHROMOSOME_SIZE)
+    benchmark(chromosome.mutate)
+
+    assert len(chromosome.genes) == CHROMOSOME_SIZE
+
+
+def test_chromosome_copy(benchmark):
+    chromosome = LanderChromosome.random(0, CHROMOSOME_SIZE)
+    copy = benchmark(chromosome.copy)
+
+    assert str(copy) == str(chromosome)
+
+
+def test_population_random(benchmark):
+    population = benchmark(LanderPopulation.random, POPULATION_SIZE, CHROMOSOME_SIZE)
+
+    assert len(population.chromosomes) == POPULATION_SIZE
+
+
+def test_reproduce_and_mutate(benchmark):
+    algorithm = LanderGeneticAlgorithm()
+
+    def setup():
+        algorithm.populations = [LanderPopulation.random(POPULATION_SIZE, CHROMOSOME_SIZE)]
+        algorithm.scores = [list(range(POPULATION_SIZE))]
+        return (1,), {}
+
+    benchmark.pedantic(algorithm.reproduce_and_mutate, setup=setup, rounds=20)
+
+    assert len(algorithm.populations[-1].chromosomes) == POPULATION_SIZE
+
+
+def test_simulation_land(benchmark):
+    # run() has no physics yet, the simulation cost is the land it is played on
+    def land():
+        simulation = LanderSimulation()
+        return [simulation.get_land_y(x) for x in range(X_MIN, X_MAX, 10)]
+
+    heights = benchmark(land)
+
+    assert len(heights) == (X_MAX - X_MIN) // 10 + 1
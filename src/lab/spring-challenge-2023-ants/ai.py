@@ -1,9 +1,15 @@
+from array import array
 from enum import IntEnum
 from heapq import heappop, heappush
+import json
 import math
+import mmap
+import os
+import struct
 import sys
 
 
+RECORD_VARIABLE = "ANTS_RECORD"  # set: reads and outputs kept in <weights>.jsonl
 WEIGHTS_COUNT = 10 * 12
 DEFAULT_WEIGHTS = [
     0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.1,0.0,0.0,100.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,4.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0
@@ -42,11 +48,20 @@ class Spring2023AntsAI:
         self.oppScore = 0
         self.max_crystals = 0
 
-    def initialize(self):
+    def initialize(self, record=None):
         # Read initial game state
         number_of_cells = int(input())
-        for i in range(number_of_cells):
-            cell_info = list(map(int, input().split()))
+        cells = [list(map(int, input().split())) for _ in range(number_of_cells)]
+        _ = int(input())
+        bases = list(map(int, input().split()))
+        opp_bases = list(map(int, input().split()))
+        self.setup(cells, bases, opp_bases)
+        if record is not None:
+            print(json.dumps([cells, bases, opp_bases]), file=record, flush=True)
+
+    def setup(self, cells, bases, opp_bases):
+        # cells: [type, resources, 6 neighbours] as read at the start of the game
+        for i, cell_info in enumerate(cells):
             self.map[i] = {
                 "type": cell_info[0],
                 "resources": cell_info[1],
@@ -58,36 +73,46 @@ class Spring2023AntsAI:
             elif cell_info[0] == Type.EGG:
                 self.cells_with_eggs.append(i)
 
-        _ = int(input())
-        self.bases = list(map(int, input().split()))
-        self.opp_bases = list(map(int, input().split()))
+        self.bases = bases
+        self.opp_bases = opp_bases
 
-    def play_turn(self):
-        self.read_turn_info()
+    def play_turn(self, record=None):
+        scores, cells = self.read_turn_info()
+
+        # Print actions
+        output = ";".join(self.decide())
+        if record is not None:
+            print(json.dumps([scores, cells, output]), file=record, flush=True)
+        print(output)
+
+    def decide(self):
         paths, beacons = self.create_beacon_paths()
         actions = self.generate_actions(beacons)
 
         # If no actions, wait
         if not actions:
             actions.append("WAIT")
-
-        # Print actions
-        print(";".join(actions))
+        return actions
 
     def read_turn_info(self):
+        scores = list(map(int, input().split()))
+        cells = [list(map(int, input().split())) for _ in range(len(self.map))]
+        self.update(*scores, cells)
+        return scores, cells
+
+    def update(self, my_score, opp_score, cells):
+        # cells: [resources, myAnts, oppAnts] as read every turn
         self.cells_with_crystals = []
         self.cells_with_eggs = []
         self.total_resources = 0
         self.total_my_ants = 0
         self.paths_from_base = {}
 
-        self.myScore, self.oppScore = map(int, input().split())
-        self.myScore /= self.max_crystals
-        self.oppScore /= self.max_crystals
+        self.myScore = my_score / self.max_crystals
+        self.oppScore = opp_score / self.max_crystals
 
         # Read turn info
-        for i in range(len(self.map)):
-            cell_info = list(map(int, input().split()))
+        for i, cell_info in enumerate(cells):
             self.map[i]["resources"] = cell_info[0]
             self.map[i]["myAnts"] = cell_info[1]
             self.map[i]["oppAnts"] = cell_info[2]
@@ -292,20 +317,36 @@ class Spring2023AntsAI:
     def read_weights(s: str):
         return [float(w) for w in s.split(",")]
 
+    def read_genome_bank(argument: str):
+        # "<path>#<row>": pre-decoded float32 weights, see genome_bank.py
+        path, row = argument.rsplit("#", 1)
+        header = struct.Struct("<4sH16sII2x")
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            magic, _, dtype, _, length = header.unpack_from(m)
+            assert magic == b"GENB" and dtype.rstrip(b"\0") == b"<f4", argument
+            start = header.size + int(row) * length * 4
+            return [round(w, 5) for w in array("f", m[start : start + length * 4])]
 
-if __name__ == "__main__":
+
+def load_weights(argument):
+    # Bot argument: a genome bank slot or a weights file, the default weights otherwise
     try:
-        with open(sys.argv[1], "r") as f:
-            s = f.read()
+        if "#" in argument:
+            return Spring2023AntsAI.read_genome_bank(argument)
+        with open(argument, "r") as f:
+            return Spring2023AntsAI.read_weights(f.read())
     except Exception:
-        s = None
-    
-    if s:
-        weights = Spring2023AntsAI.read_weights(s)
-        ai = Spring2023AntsAI(weights)
-    else:
-        ai = Spring2023AntsAI()
-    
-    ai.initialize()
+        return DEFAULT_WEIGHTS
+
+
+if __name__ == "__main__":
+    argument = sys.argv[1] if len(sys.argv) > 1 else ""
+    ai = Spring2023AntsAI(load_weights(argument))
+    record = (
+        open(f"{argument}.jsonl", "a")
+        if os.environ.get(RECORD_VARIABLE) and argument
+        else None
+    )
+    ai.initialize(record)
     while True:
-        ai.play_turn()
+        ai.play_turn(record)
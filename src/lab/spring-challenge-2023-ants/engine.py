@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from heapq import heapify, heappop, heappush
+from random import Random
+from typing import Dict, List, Optional, Tuple
+
+from ai import Spring2023AntsAI, Type
+
+# Spring Challenge 2023 played in memory: the bots get the values they would
+# otherwise parse from stdin and answer with the line they would print.
+#
+# Rules, as published by the contest:
+# - a hexagonal map, symmetric around its center cell, with crystal and egg cells
+# - every turn BEACON, LINE, WAIT and MESSAGE actions, separated by ";", share
+#   the ants of a player between beacons, proportionally to their strengths
+# - ants are sent to the closest beacons and move one cell per turn
+# - the attack chain strength of a player on a cell is the best, over the paths
+#   of its ants from one of its bases, of the fewest ants on the path
+# - ants do not harvest through a cell where the opponent has ants and a
+#   stronger attack chain
+# - the harvest chain strength is the attack chain strength over the cells
+#   left, a player harvests that many resources, eggs hatching as new ants on
+#   its bases and crystals adding to its score
+# The game ends after MAX_TURNS turns, once a player owns more than half of the
+# crystals or once no crystal is left.
+
+MAX_TURNS = 100
+STARTING_ANTS = 10
+# Java games validate-engine must reproduce before the engine scores duels
+VALIDATION_GAMES = 10
+VALIDATION_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "engine_validation.json"
+)
+DIRECTIONS = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
+
+
+def generate_map(
+    random: Random,
+) -> Tuple[List[List[int]], List[int], List[int]]:
+    """(cells as [type, resources, 6 neighbours], bases, opponent bases)"""
+    rings = random.randint(4, 7)
+    # The center cell first, then every cell followed by its symmetric
+    coordinates = [(0, 0)]
+    seen = {(0, 0)}
+    for q in range(-rings, rings + 1):
+        for r in range(max(-rings, -q - rings), min(rings, -q + rings) + 1):
+            if (q, r) not in seen:
+                coordinates += [(q, r), (-q, -r)]
+                seen.update(((q, r), (-q, -r)))
+    index = {coordinate: i for i, coordinate in enumerate(coordinates)}
+
+    cells = []
+    for i, (q, r) in enumerate(coordinates):
+        if i % 2 == 0 and i > 0:
+            type, resources = cells[i - 1][:2]
+        else:
+            type = random.choices(
+                [Type.EMPTY, Type.EGG, Type.CRYSTAL], weights=[66, 12, 22]
+            )[0]
+            resources = 0 if type == Type.EMPTY else random.randint(10, 60)
+        neighbours = [index.get((q + dq, r + dr), -1) for dq, dr in DIRECTIONS]
+        cells.append([int(type), resources, *neighbours])
+
+    # Bases are empty cells away from the center, the opponent's mirror them
+    empty = [i for i in range(1, len(cells), 2) if cells[i][0] == Type.EMPTY]
+    bases = sorted(random.sample(empty, random.randint(1, 2)))
+    return cells, bases, [base + 1 for base in bases]
+
+
+class AntsGame:
+    cells: List[List[int]]
+    bases: List[List[int]]
+    resources: List[int]
+    ants: List[List[int]]
+    scores: List[int]
+    distances: List[List[int]]
+    initial_crystals: int
+    turns: int
+
+    def __init__(self, seed: Optional[int] = None):
+        self.start(*generate_map(Random(seed)))
+
+    def start(
+        self, cells: List[List[int]], bases: List[int], opp_bases: List[int]
+    ) -> None:
+        self.cells = cells
+        self.bases = [bases, opp_bases]
+        self.resources = [cell[1] for cell in self.cells]
+        self.ants = [[0] * len(self.cells) for _ in range(2)]
+        for player in range(2):
+            self.spawn(player, STARTING_ANTS * len(self.bases[player]))
+        self.scores = [0, 0]
+        self.distances = [self.breadth_first(cell) for cell in range(len(self.cells))]
+        self.initial_crystals = self.crystals()
+        self.turns = 0
+
+    def play(self, ai_1: Spring2023AntsAI, ai_2: Spring2023AntsAI) -> Tuple[int, int]:
+        """Play until the end, the scores as parsed from the Java referee output"""
+        ais = (ai_1, ai_2)
+        for player, ai in enumerate(ais):
+            ai.setup(self.cells, self.bases[player], self.bases[1 - player])
+        while not self.is_over():
+            self.play_turn([self.ask(player, ai) for player, ai in enumerate(ais)])
+        return self.scores[0], self.scores[1]
+
+    def is_over(self) -> bool:
+        crystals = self.crystals()
+        return (
+            self.turns >= MAX_TURNS
+            or crystals == 0
+            or any(2 * score > self.initial_crystals for score in self.scores)
+        )
+
+    def crystals(self) -> int:
+        return sum(
+            resources
+            for cell, resources in zip(self.cells, self.resources)
+            if cell[0] == Type.CRYSTAL
+        )
+
+    def ask(self, player: int, ai: Spring2023AntsAI) -> str:
+        ai.update(self.scores[player], self.scores[1 - player], self.view(player))
+        return ";".join(ai.decide())
+
+    def view(self, player: int) -> List[List[int]]:
+        """[resources, my ants, opponent ants] of every cell, as read by a bot"""
+        mine, theirs = self.ants[player], self.ants[1 - player]
+        return [list(cell) for cell in zip(self.resources, mine, theirs)]
+
+    def play_turn(self, outputs: List[str]) -> None:
+        for player, output in enumerate(outputs):
+            self.move(player, self.beacons(output))
+        self.harvest()
+        self.turns += 1
+
+    def beacons(self, output: str) -> Dict[int, int]:
+        beacons: Dict[int, int] = {}
+        for action in output.split(";"):
+            words = action.split()
+            try:
+                if words[0] == "BEACON":
+                    cell, strength = int(words[1]), int(words[2])
+                    cells = [cell]
+                elif words[0] == "LINE":
+                    source, target, strength = map(int, words[1:4])
+                    cells = self.line(source, target)
+                else:
+                    continue
+            except (IndexError, ValueError):
+                continue
+            for cell in cells:
+                if 0 <= cell < len(self.cells) and strength > 0:
+                    beacons[cell] = beacons.get(cell, 0) + strength
+        return beacons
+
+    def breadth_first(self, start: int) -> List[int]:
+        distances = [-1] * len(self.cells)
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for neighbour in self.cells[cell][2:]:
+                if neighbour != -1 and distances[neighbour] == -1:
+                    distances[neighbour] = distances[cell] + 1
+                    queue.append(neighbour)
+        return distances
+
+    def step(self, cell: int, target: int) -> int:
+        """The first neighbour on a shortest path to the target"""
+        distance = self.distances[target][cell]
+        for neighbour in self.cells[cell][2:]:
+            if neighbour != -1 and self.distances[target][neighbour] == distance - 1:
+                return neighbour
+        return cell
+
+    def line(self, source: int, target: int) -> List[int]:
+        if not (0 <= source < len(self.cells) and 0 <= target < len(self.cells)):
+            return []
+        cells = [source]
+        while cells[-1] != target and self.distances[target][cells[-1]] > 0:
+            cells.append(self.step(cells[-1], target))
+        return cells
+
+    def move(self, player: int, beacons: Dict[int, int]) -> None:
+        ants = self.ants[player]
+        total = sum(ants)
+        strength = sum(beacons.values())
+        if not total or not strength:
+            return
+
+        # Ants wanted on every beacon, the rounding leftovers to the strongest
+        wanted = {cell: total * value // strength for cell, value in beacons.items()}
+        leftovers = total - sum(wanted.values())
+        for cell in sorted(beacons, key=lambda cell: -beacons[cell])[:leftovers]:
+            wanted[cell] += 1
+
+        # The closest ants go first, every ant moves one cell toward its beacon
+        pairs = sorted(
+            (self.distances[beacon][cell], cell, beacon)
+            for cell, count in enumerate(ants)
+            if count
+            for beacon in wanted
+        )
+        moved = [0] * len(ants)
+        left = list(ants)
+        for _, cell, beacon in pairs:
+            count = min(left[cell], wanted[beacon])
+            if count:
+                left[cell] -= count
+                wanted[beacon] -= count
+                moved[self.step(cell, beacon)] += count
+        self.ants[player] = [moved[cell] + left[cell] for cell in range(len(ants))]
+
+    def chain_strengths(self, player: int, blocked: List[bool]) -> List[int]:
+        """Fewest ants on the best path from a base, 0 when no path"""
+        ants = self.ants[player]
+        strengths = [0] * len(ants)
+        queue = []
+        for base in self.bases[player]:
+            if ants[base] and not blocked[base]:
+                strengths[base] = ants[base]
+                queue.append((-ants[base], base))
+        heapify(queue)
+        while queue:
+            strength, cell = heappop(queue)
+            if -strength < strengths[cell]:
+                continue
+            for neighbour in self.cells[cell][2:]:
+                if neighbour == -1 or blocked[neighbour]:
+                    continue
+                chain = min(-strength, ants[neighbour])
+                if chain > strengths[neighbour]:
+                    strengths[neighbour] = chain
+                    heappush(queue, (-chain, neighbour))
+        return strengths
+
+    def harvest(self) -> None:
+        unblocked = [False] * len(self.cells)
+        attacks = [self.chain_strengths(player, unblocked) for player in range(2)]
+        harvests = [
+            self.chain_strengths(
+                player,
+                [
+                    bool(self.ants[1 - player][cell])
+                    and attacks[1 - player][cell] > attacks[player][cell]
+                    for cell in range(len(self.cells))
+                ],
+            )
+            for player in range(2)
+        ]
+
+        eggs = [0, 0]
+        for cell, (type, *_) in enumerate(self.cells):
+            resources = self.resources[cell]
+            if type == Type.EMPTY or not resources:
+                continue
+            amounts = share(
+                [min(harvest[cell], resources) for harvest in harvests], resources
+            )
+            self.resources[cell] -= sum(amounts)
+            for player, amount in enumerate(amounts):
+                if type == Type.CRYSTAL:
+                    self.scores[player] += amount
+                else:
+                    eggs[player] += amount
+        for player, count in enumerate(eggs):
+            self.spawn(player, count)
+
+    def spawn(self, player: int, count: int) -> None:
+        bases = self.bases[player]
+        for i, base in enumerate(bases):
+            self.ants[player][base] += count // len(bases) + (i < count % len(bases))
+
+
+def share(amounts: List[int], resources: int) -> List[int]:
+    """Amounts harvested on one cell, split evenly when both ask for too much"""
+    if sum(amounts) <= resources:
+        return amounts
+    half = resources // 2
+    amount_1, amount_2 = amounts
+    if amount_1 <= half:
+        return [amount_1, resources - amount_1]
+    if amount_2 <= half:
+        return [resources - amount_2, amount_2]
+    return [half, half]
+
+
+class ReplayError(Exception):
+    pass
+
+
+def read_record(path: str) -> List[list]:
+    """The map then the turns recorded by ai.py, nothing when the bot did not play"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class ReplayedGame(AntsGame):
+    """A game recorded against the Java referee, played again by the engine
+
+    The map comes from the records: the referee generates its own. Every turn,
+    the scores and cells read by both bots must be the engine's before their
+    recorded outputs are played.
+    """
+
+    records: List[List[list]]
+
+    def __init__(self, record_1: List[list], record_2: List[list]):
+        if not record_1 or not record_2:
+            raise ReplayError("no turn recorded")
+        cells, bases, opp_bases = record_1[0]
+        if record_2[0] != [cells, opp_bases, bases]:
+            raise ReplayError("the players read different maps")
+        self.start(cells, bases, opp_bases)
+        self.records = [record_1[1:], record_2[1:]]
+
+    def replay(self) -> Tuple[int, int]:
+        """The scores of the recorded turns, ReplayError at the first divergence"""
+        if len(self.records[0]) != len(self.records[1]):
+            raise ReplayError(
+                f"{len(self.records[0])} and {len(self.records[1])} turns recorded"
+            )
+        for turn, views in enumerate(zip(*self.records)):
+            try:
+                if self.is_over():
+                    raise ReplayError("played after the end")
+                self.play_turn(
+                    [self.check(player, *view) for player, view in enumerate(views)]
+                )
+            except ReplayError as err:
+                raise ReplayError(f"turn {turn}: {err}") from None
+        if not self.is_over():
+            raise ReplayError(f"turn {len(self.records[0])}: not the end")
+        return self.scores[0], self.scores[1]
+
+    def check(
+        self, player: int, scores: List[int], cells: List[List[int]], output: str
+    ) -> str:
+        """The recorded output, once the recorded view is the engine's"""
+        expected = [self.scores[player], self.scores[1 - player]]
+        if scores != expected:
+            raise ReplayError(f"player {player + 1} scores {scores}, engine {expected}")
+        for cell, (read, view) in enumerate(zip(cells, self.view(player))):
+            if read != view:
+                raise ReplayError(
+                    f"player {player + 1} cell {cell} {read}, engine {view}"
+                )
+        return output
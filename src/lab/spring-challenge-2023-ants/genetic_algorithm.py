@@ -1,20 +1,20 @@
 from __future__ import annotations
 import ast
 
+import os
 import subprocess
-from math import ceil
-from multiprocessing import Pool
-from multiprocessing.pool import AsyncResult
-from os import cpu_count, mkdir, scandir
-from os.path import isdir
-from random import randint, random, randrange, sample, uniform
-from re import match
-from shutil import rmtree
-from typing import Generic, List, Optional, Tuple, TypeVar
-from uuid import uuid4
-
-from ai import WEIGHTS_COUNT, clamp, Spring2023AntsAI
-from numpy.random import choice
+from os import cpu_count
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+from ai import WEIGHTS_COUNT, Spring2023AntsAI, load_weights
+from async_referee import AsyncDuelRunner
+import engine
+from engine import VALIDATION_FILE, VALIDATION_GAMES, AntsGame
+from evolution import MATCHMAKING, RNG, Chromosome, DuelGeneticAlgorithm, Gene, Population
+from rating import batch_elo, bradley_terry
+from referee import DUEL_ERRORS
+from validation import check_validation
 
 CHROMOSOME_SIZE = WEIGHTS_COUNT
 POPULATION_SIZE = 50
@@ -29,390 +29,83 @@ GENERATIONS_MAX = 10000
 
 POOL_SIZE = cpu_count() // 2
 ROUNDS_PER_GENERATION = 50
-
-
-def unzip(zipped) -> Tuple:
-    return tuple(zip(*zipped))
-
-
-def pairwise(iterable):
-    "s -> (s0, s1), (s2, s3), (s4, s5), ..."
-    a = iter(iterable)
-    return zip(a, a)
-
-
-def generic_arg(cls, i: int):
-    return cls.__orig_bases__[0].__args__[i]
-
-
-class Gene:
-    def __init__(self):
-        pass
-
-    @classmethod
-    def random(cls, previous: Optional[Gene] = None) -> Gene:
-        pass
-
-    def __str__(self) -> str:
-        pass
-
-    def __repr__(self) -> str:
-        return str(self)
-
-    def copy(self) -> Gene:
-        pass
-
-    def crossover(
-        self, weight: float, inv_weight: float, gene_2: Gene
-    ) -> Tuple[Gene, Gene]:
-        pass
-
-    def mutate(self, previous: Optional[Gene] = None) -> None:
-        pass
-
-
-G = TypeVar("G", bound=Gene)
-
-
-class Chromosome(Generic[G]):
-    generation: int
-    id: str
-    genes: List[G]
-
-    @classmethod
-    def _G(cls) -> type[G]:
-        return generic_arg(cls, 0)
-
-    def __init__(self, generation: int, genes: List[G], id: Optional[str] = None):
-        self.generation = generation
-        self.id = id or str(uuid4())
-        self.genes = [gene.copy() for gene in genes]  # type: ignore
-
-    @classmethod
-    def random(cls, generation: int, size: int) -> Chromosome:
-        gene = None
-        genes = []
-        for _ in range(size):
-            gene = cls._G().random(gene)
-            genes.append(gene)
-
-        return cls(generation=generation, genes=genes)  # type: ignore
-
-    def __str__(self) -> str:
-        return f"({self.generation})<{';'.join([str(gene) for gene in self.genes])}>"
-
-    def __repr__(self) -> str:
-        return str(self)
-
-    def run(self, round: int):
-        return str(self.genes[round])
-
-    def copy(self) -> Chromosome:
-        print(f"Copying {self.generation:05}_{self.id}")
-        return self.__class__(
-            generation=self.generation,
-            id=self.id,
-            genes=[gene.copy() for gene in self.genes],  # type: ignore
-        )
-
-    def crossover(
-        self, generation: int, parent_2: Chromosome
-    ) -> Tuple[Chromosome, Chromosome]:
-        weight = uniform(0.02, 0.98)
-        inv_weight = 1 - weight
-        child_1_genes, child_2_genes = unzip(
-            [
-                gene_1.crossover(weight, inv_weight, gene_2)
-                for gene_1, gene_2 in zip(self.genes, parent_2.genes)
-            ]
-        )
-
-        return (
-            self.__class__(generation=generation, genes=child_1_genes),
-            self.__class__(generation=generation, genes=child_2_genes),
-        )
-
-    def mutate(self, gene_mutate_ratio) -> None:
-        for i in sample(
-            range(len(self.genes)), ceil(len(self.genes) * gene_mutate_ratio)
-        ):
-            self.genes[i].mutate(self.genes[i - 1] if i > 0 else None)
-
-
-C = TypeVar("C", bound=Chromosome)
-
-
-class Population(Generic[C]):
-    generation: int
-    chromosomes: List[C] = []
-
-    @classmethod
-    def _C(cls) -> type[C]:
-        return generic_arg(cls, 0)
-
-    def __init__(self, generation, chromosomes):
-        self.generation = generation
-        self.chromosomes = chromosomes
-
-    @classmethod
-    def random(cls, population_size: int, chromozome_size: int) -> Population:
-        return cls(
-            generation=0,
-            chromosomes=[
-                cls._C().random(0, chromozome_size) for _ in range(population_size)
-            ],
-        )
-
-    def __str__(self) -> str:
-        return f"\nGeneration {self.generation}:\n" + "\n".join(
-            [str(chromosome) for chromosome in self.chromosomes]
-        )
-
-    def __repr__(self) -> str:
-        return str(self)
-
-    def copy(self) -> Population:
-        return self.__class__(
-            generation=self.generation,
-            chromosomes=[chromosome.copy() for chromosome in self.chromosomes],
-        )
-
-
-P = TypeVar("P", bound=Population)
-
-
-class GeneticAlgorithm(Generic[P]):
-    chromosome_size: int
-    population_size: int
-    generations_max: float
-    elite_ratio: float
-    chromosome_mutate_ratio: float
-    gene_mutate_ratio: float
-    crossover_ratio: float
-    population: P
-    scores: List[float]
-
-    @classmethod
-    def _P(cls) -> type[P]:
-        return generic_arg(cls, 0)
-
-    def __init__(
-        self,
-        chromosome_size: int = CHROMOSOME_SIZE,
-        population_size: int = POPULATION_SIZE,
-        generations_max: float = GENERATIONS_MAX,
-        elite_ratio: float = ELITE_RATIO,
-        chromosome_mutate_ratio: float = CHROMOSOME_MUTATE_RATIO,
-        gene_mutate_ratio: float = GENE_MUTATE_RATIO,
-        crossover_ratio: float = CROSSOVER_RATIO,
-    ):
-        self.chromosome_size = chromosome_size
-        self.population_size = population_size
-        self.generations_max = generations_max
-        self.elite_ratio = elite_ratio
-        self.chromosome_mutate_ratio = chromosome_mutate_ratio
-        self.gene_mutate_ratio = gene_mutate_ratio
-        self.crossover_ratio = crossover_ratio
-
-    def run(self):
-        self.initialize()
-        generation = 0
-        for generation in range(self.generations_max + 1):
-            self.select()
-            self.reproduce_and_mutate(generation + 1)
-
-            best: C = self.population.chromosomes[0]
-            print(
-                f"Generation {generation:05}: {best.generation}_{best.id} ({self.scores[0]})"
-            )
-            print(str(self.scores))
-
-            with open(f".bests/{generation:05}_{best.id}.txt", "w") as f:
-                f.write(str(best))
-
-    def initialize(self) -> None:
-        print("initialize")
-        chromosomes: List[C] = []  # type: ignore
-        if isdir(".bests"):
-            for filename in scandir(".bests"):
-                if filename.is_file():
-                    with open(filename, "r") as f:
-                        chromosomes.append(self._P()._C().from_str(0, f.read()))
-
-        print(f"Read {len(chromosomes)} chromosomes")
-
-        for _ in range(len(chromosomes), self.population_size):
-            chromosomes.append(self._P()._C().random(0, self.chromosome_size))
-
-        print(f"First generation: {len(chromosomes)} chromosomes")
-
-        self.population = self._P()(0, chromosomes)
-        print("initialization done")
-
-    def select(self) -> None:
-        self.compute_fitness()
-
-    def compute_fitness(self) -> None:
-        self.scores = [
-            self.get_score(chromosome) for chromosome in self.population.chromosomes
-        ]
-
-    def get_score(self, chromosome: C) -> float:
-        pass
-
-    def sort(
-        self, scores: List[float], chromosomes: List[C]
-    ) -> Tuple[List[float], List[C]]:
-        return unzip(  # type: ignore
-            sorted(
-                zip(scores, chromosomes),
-                key=lambda z: z[0],
-                reverse=True,
-            )
-        )
-
-    def normalize(self, scores: List[float]) -> List[float]:
-        lower_score = min(scores)
-        total = sum([score - lower_score for score in scores])
-        return (
-            [(score - lower_score) / total for score in scores]
-            if total != 0
-            else [1 / len(scores)] * len(scores)
-        )
-
-    def reproduce_and_mutate(self, generation: int) -> None:
-        self.scores, self.population.chromosomes = self.sort(self.scores, self.population.chromosomes)  # type: ignore
-
-        self.chromosome_mutate_ratio = generation / self.generations_max
-        self.crossover_ratio = 1 - generation / self.generations_max
-
-        elite_size = ceil(self.population_size * self.elite_ratio)
-        new_chromosomes = [
-            chromosome.copy() for chromosome in self.population.chromosomes[:elite_size]
-        ]
-
-        scores = self.normalize(self.scores)
-        pool_size = self.population_size - elite_size
-        parents = choice(
-            self.population.chromosomes,
-            size=pool_size if pool_size % 2 == 0 else pool_size + 1,
-            p=scores,
-        )
-
-        for parent_1, parent_2 in pairwise(parents):
-            if random() <= self.crossover_ratio:
-                child_1, child_2 = parent_1.crossover(generation, parent_2)
-            else:
-                child_1 = parent_1.copy()
-                child_2 = parent_2.copy()
-
-            if random() <= self.chromosome_mutate_ratio:
-                child_1.mutate(self.gene_mutate_ratio)
-                child_1.generation = generation
-            if random() <= self.chromosome_mutate_ratio:
-                child_2.mutate(self.gene_mutate_ratio)
-                child_2.generation = generation
-
-            new_chromosomes.append(child_1)
-            if len(new_chromosomes) < self.population_size:
-                new_chromosomes.append(child_2)
-
-        self.population = self._P()(generation, new_chromosomes)
-
+RATING_SCALE = 400  # score gap for 10:1 odds, used by matchmaking
+RATINGS = ("sequential", "elo", "bradley-terry")
 
 JAR = "..\\SpringChallenge2023\\target\\spring-2023-ants-1.0-SNAPSHOT.jar;..\\SpringChallenge2023\\target\\lib\\*"
 MAIN = "MySpring2023Main"
+DUEL_DEFAULT = (0, 0)
+DUEL_TIMEOUT = 120
 AI = "..\\cg-23-spring\\ai.py"
 PREFIX = "..\\cg-23-spring\\"
+LOCAL_AI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai.py")
 GENE_MIN = -500
 GENE_MAX = 500
 
 
 class Spring2023AntsGene(Gene):
-    synapse_weight: float
+    dtype = np.float32
+
+    @property
+    def synapse_weight(self) -> float:
+        return float(self.genome[self.index])
 
-    def __init__(self, synapse_weight: Optional[float] = None):
-        self.synapse_weight = round(clamp(
-            self._random() if synapse_weight is None else synapse_weight,
-            GENE_MIN,
-            GENE_MAX,
-        ),5)
+    @synapse_weight.setter
+    def synapse_weight(self, synapse_weight: float) -> None:
+        self.genome[self.index] = self.normalize(np.array(synapse_weight))
 
     @classmethod
-    def random(cls, _: Optional[Gene] = None) -> Spring2023AntsGene:
-        return cls(cls._random())
+    def normalize(cls, genome: np.ndarray) -> np.ndarray:
+        return np.round(np.clip(genome, GENE_MIN, GENE_MAX), 5).astype(cls.dtype)
 
     @classmethod
-    def _random(cls) -> int:
-        return sample([uniform(GENE_MIN, GENE_MAX), uniform(-1, 1), 0], 1, counts=[2, 2, 6])[0]
+    def random_genome(cls, shape) -> np.ndarray:
+        # 20% wide weights, 20% small weights, 60% zeros
+        kind = RNG.choice(3, size=shape, p=[0.2, 0.2, 0.6])
+        return cls.normalize(
+            np.where(
+                kind == 0,
+                RNG.uniform(GENE_MIN, GENE_MAX, size=shape),
+                np.where(kind == 1, RNG.uniform(-1, 1, size=shape), 0),
+            )
+        )
 
-    def __str__(self) -> str:
-        return str(self.synapse_weight)
+    @classmethod
+    def encode_genome(cls, genome: np.ndarray) -> str:
+        return ",".join([str(round(float(weight), 5)) for weight in genome])
+
+    @classmethod
+    def decode_genome(cls, string: str) -> np.ndarray:
+        return cls.normalize(np.array(Spring2023AntsAI.read_weights(string)))
 
     @classmethod
-    def from_str(cls, c: str) -> Spring2023AntsGene:
-        return cls(float(c))
-
-    def copy(self) -> Spring2023AntsGene:
-        return self.__class__(synapse_weight=self.synapse_weight)
-
-    def crossover(
-        self, w1: float, w2: float, gene_2: Gene
-    ) -> Tuple[Spring2023AntsGene, Spring2023AntsGene]:
-        assert gene_2 is None or isinstance(gene_2, self.__class__)
-        return self.__class__(
-            w1 * self.synapse_weight + w2 * gene_2.synapse_weight,
-        ), self.__class__(
-            w2 * self.synapse_weight + w1 * gene_2.synapse_weight,
+    def crossover_genomes(
+        cls,
+        w1: Union[float, np.ndarray],
+        w2: Union[float, np.ndarray],
+        genome_1: np.ndarray,
+        genome_2: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            cls.normalize(w1 * genome_1 + w2 * genome_2),
+            cls.normalize(w2 * genome_1 + w1 * genome_2),
         )
 
-    def mutate(self, _: Optional[Gene] = None) -> None:
-        delta = max(0.5, abs(self.synapse_weight) * 0.1)
-        self.synapse_weight = uniform(self.synapse_weight - delta, self.synapse_weight + delta)
+    @classmethod
+    def mutate_values(cls, values: np.ndarray) -> np.ndarray:
+        delta = np.maximum(0.5, np.abs(values) * 0.1)
+        return cls.normalize(RNG.uniform(values - delta, values + delta))
 
 
 class Spring2023AntsChromosome(Chromosome[Spring2023AntsGene]):
     last_score: float = 1200
 
-    def __init__(self, generation: int, genes: List[G], id: Optional[str] = None):
-        super().__init__(generation, genes, id)  # type: ignore
+    def __init__(self, generation: int, genome: np.ndarray, id: Optional[str] = None):
+        super().__init__(generation, genome, id)
         self.last_score = 1200
 
-    def set_last_score(self, score: float):
-        self.last_score = score
-
-    def get_last_score(self) -> float:
-        return self.last_score
-
-    def __str__(self) -> str:
-        return ",".join([str(gene) for gene in self.genes])
-
-    def get_file_name(self) -> str:
-        return f".chromosomes/{self.generation:05}_{self.id}.txt"
-
-    def encode(self) -> None:
-        with open(self.get_file_name(), "wt") as f:
-            f.write(str(self))
-
-    @classmethod
-    def from_str(cls, generation: int, string: str) -> Spring2023AntsChromosome:
-        return cls(generation, [Spring2023AntsGene(gene) for gene in Spring2023AntsAI.read_weights(string)])  # type: ignore
-
-    def copy(self) -> Spring2023AntsChromosome:
-        print(f"Copying {self.generation:05}_{self.id}")
-        self_copy = self.__class__(
-            generation=self.generation,
-            id=self.id,
-            genes=[gene.copy() for gene in self.genes],  # type: ignore
-        )
-        self_copy.set_last_score(self.get_last_score() * PREVIOUS_SCORE_RATIO)
-        return self_copy
-
-
 class Spring2023AntsPopulation(Population[Spring2023AntsChromosome]):
-    def encode(self) -> None:
-        for chromosome in self.chromosomes:
-            chromosome.encode()
+    pass
 
 
 def update_elo(rating1, rating2, score1, score2, K=32):
@@ -427,93 +120,153 @@ def update_elo(rating1, rating2, score1, score2, K=32):
     return new_rating1, new_rating2
 
 
-class Spring2023AntsGeneticAlgorithm(GeneticAlgorithm[Spring2023AntsPopulation]):
-    def __init__(self):
-        super().__init__()
-        rmtree(".chromosomes", ignore_errors=True)
-        mkdir(".chromosomes")
+def duel_args(file_name_1: str, file_name_2: str) -> Tuple[str, ...]:
+    return (AI, PREFIX + file_name_1, AI, PREFIX + file_name_2)
 
-    def compute_fitness(self) -> None:
-        self.population.encode()
-        population_size = len(self.population.chromosomes)
-        scores = []
-
-        for i in range(population_size):
-            scores.append(self.population.chromosomes[i].get_last_score())
-
-        # print(scores)
-        pool = Pool(POOL_SIZE)
-
-        results: List[Tuple[int, int, AsyncResult]] = []
-
-        for _ in range(ROUNDS_PER_GENERATION):
-            bracket = pairwise(sample(range(population_size), population_size))
-
-            for player_1, player_2 in bracket:
-                results.append(
-                    (
-                        player_1,
-                        player_2,
-                        pool.apply_async(
-                            self.launch_duel,
-                            (
-                                self.population.chromosomes[player_1],
-                                self.population.chromosomes[player_2],
-                            ),
-                        ),
-                    )
-                )
 
-        for player_1, player_2, res in results:
-            result = res.get()
-            assert result[0] != -1 and result[1] != -1, result
-            # print(self.population.chromosomes[player_1].id, self.population.chromosomes[player_2].id)
-            # print(result)
-            if result[0] == result[1]:
-                r0 = 0.5
-            else:
-                r0 = (0.8 if result[0] > result[1] else 0) + 0.2 * result[0] / (result[0] + result[1])
-            # print(scores[player_1], scores[player_2], r0, 1 - r0)
-            scores[player_1], scores[player_2] = update_elo(
-                scores[player_1], scores[player_2], r0, 1 - r0
+def local_duel_args(file_name_1: str, file_name_2: str) -> Tuple[str, ...]:
+    """The bots of this directory, on chromosome paths given as they are"""
+    return (LOCAL_AI, file_name_1, LOCAL_AI, file_name_2)
+
+
+def parse_duel(lines: List[str]) -> Tuple[int, int]:
+    scores = ast.literal_eval("\n".join(lines).replace("=", ":"))
+    return scores[0], scores[1]
+
+
+def ants_shares(results: np.ndarray) -> np.ndarray:
+    """Share of player 1: 0.8 for a win plus 0.2 x its part of the points"""
+    results = np.asarray(results, dtype=float).reshape(-1, 2)
+    total = results[:, 0] + results[:, 1]
+    share = results[:, 0] / np.where(total == 0, 1, total)
+    return np.where(
+        results[:, 0] == results[:, 1],
+        0.5,
+        np.where(results[:, 0] > results[:, 1], 0.8, 0.0) + 0.2 * share,
+    )
+
+
+def launch_duel(
+    file_name_1: str,
+    file_name_2: str,
+    args: Callable[[str, str], Tuple[str, ...]] = duel_args,
+) -> Tuple[int, int]:
+    for _ in range(3):
+        try:
+            result = subprocess.run(
+                ["java", "-cp", JAR, MAIN, *args(file_name_1, file_name_2)],
+                stdout=subprocess.PIPE,
+                timeout=DUEL_TIMEOUT,
             )
-            # print(scores[player_1], scores[player_2])
-            print(".", end="", flush=True)
 
-        # print(scores)
-        print("\n", end="", flush=True)
+            return parse_duel(result.stdout.decode("utf-8").splitlines())
+        except DUEL_ERRORS as err:
+            print(f"Unexpected {err=}, {type(err)=}")
+
+    return DUEL_DEFAULT
+
 
-        for i in range(population_size):
-            self.population.chromosomes[i].set_last_score(scores[i])
+def simulate_duel(
+    file_name_1: str, file_name_2: str, seed: Optional[int] = None
+) -> Tuple[int, int]:
+    """launch_duel played by the Python engine, in the calling process"""
+    ai_1, ai_2 = (
+        Spring2023AntsAI(load_weights(file_name))
+        for file_name in (file_name_1, file_name_2)
+    )
+    return AntsGame(seed).play(ai_1, ai_2)
 
-        self.scores = [round(score, 2) for score in scores]
 
-    def launch_duel(
+class Spring2023AntsGeneticAlgorithm(DuelGeneticAlgorithm[Spring2023AntsPopulation]):
+    python_referee: bool
+
+    def __init__(
         self,
-        chromosome_1: Spring2023AntsChromosome,
-        chromosome_2: Spring2023AntsChromosome,
-    ) -> Tuple[int, int]:
-        for _ in range(3):
-            try:
-                result = subprocess.run(
-                    [
-                        "java",
-                        "-cp",
-                        JAR,
-                        MAIN,
-                        AI,
-                        PREFIX + chromosome_1.get_file_name(),
-                        AI,
-                        PREFIX + chromosome_2.get_file_name(),
-                    ],
-                    stdout=subprocess.PIPE,
+        python_referee: bool = False,
+        async_duels: bool = False,
+        cache: bool = False,
+        cache_file: Optional[str] = None,
+        resume: bool = False,
+        genome_bank: bool = False,
+        racing: bool = False,
+        matchmaking: str = MATCHMAKING,
+        rating: str = RATINGS[0],
+        duel_store: Optional[str] = None,
+        telemetry_file: Optional[str] = None,
+        pool_size: int = POOL_SIZE,
+    ):
+        if python_referee and async_duels:
+            raise ValueError("The Python referee plays in the evaluation pool only")
+        if python_referee:
+            check_validation(VALIDATION_FILE, engine.__file__, VALIDATION_GAMES)
+        super().__init__(
+            CHROMOSOME_SIZE,
+            simulate_duel if python_referee else launch_duel,
+            (
+                AsyncDuelRunner(
+                    ["java", "-cp", JAR, MAIN],
+                    parse_duel,
+                    DUEL_DEFAULT,
+                    duel_args,
+                    timeout=DUEL_TIMEOUT,
                 )
+                if async_duels
+                else None
+            ),
+            cache,
+            cache_file,
+            resume,
+            genome_bank,
+            racing,
+            matchmaking,
+            rating,
+            RATING_SCALE,
+            duel_store,
+            telemetry_file,
+            population_size=POPULATION_SIZE,
+            generations_max=GENERATIONS_MAX,
+            elite_ratio=ELITE_RATIO,
+            chromosome_mutate_ratio=CHROMOSOME_MUTATE_RATIO,
+            gene_mutate_ratio=GENE_MUTATE_RATIO,
+            crossover_ratio=CROSSOVER_RATIO,
+            pool_size=pool_size,
+            rounds_per_generation=ROUNDS_PER_GENERATION,
+            previous_score_ratio=PREVIOUS_SCORE_RATIO,
+        )
+        self.python_referee = python_referee
 
-                scores = ast.literal_eval(
-                    result.stdout.decode("utf-8").replace("=", ":")
-                )
-                return scores[0], scores[1]
-            except BaseException as err:
-                print(f"Unexpected {err=}, {type(err)=}")
+    def save_best(self, generation: int, best: Chromosome) -> None:
+        with open(f".bests/{generation:05}_{best.id}.txt", "w") as f:
+            f.write(str(best))
 
-        return (0, 0)
+    def compute_fitness(self) -> None:
+        super().compute_fitness()
+        self.scores = [round(score, 2) for score in self.scores]
+
+    def rate(self) -> List[float]:
+        if self.rating == "sequential":
+            return super().rate()
+
+        pairs, results = self.standings.result_arrays()
+        initial = np.array(self.standings.initial, dtype=float)
+        shares = ants_shares(results)
+        if self.rating == "elo":
+            ratings = batch_elo(initial, pairs, shares, scale=RATING_SCALE)
+        else:
+            ratings = bradley_terry(initial, pairs, shares, RATING_SCALE)
+        return ratings.tolist()
+
+    def fold_duel(
+        self, scores: List[float], player_1: int, player_2: int, result: Tuple
+    ) -> None:
+        assert result[0] != -1 and result[1] != -1, result
+        # print(self.population.chromosomes[player_1].id, self.population.chromosomes[player_2].id)
+        # print(result)
+        if result[0] == result[1]:
+            r0 = 0.5
+        else:
+            r0 = (0.8 if result[0] > result[1] else 0) + 0.2 * result[0] / (result[0] + result[1])
+        # print(scores[player_1], scores[player_2], r0, 1 - r0)
+        scores[player_1], scores[player_2] = update_elo(
+            scores[player_1], scores[player_2], r0, 1 - r0
+        )
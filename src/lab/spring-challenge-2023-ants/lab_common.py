@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The GA modules shared by the lab projects live in src/lab/common: importing
+# this module first puts them on the path of a script run from this directory
+COMMON = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common")
+)
+if COMMON not in sys.path:
+    sys.path.append(COMMON)
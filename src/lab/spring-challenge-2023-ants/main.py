@@ -1,18 +1,42 @@
+import os
+import shutil
 import subprocess
+import tempfile
 from random import randint
+from typing import Optional
 
 import click
 
-from ai import WEIGHTS_COUNT, Spring2023AntsAI
+import engine
+import lab_common  # noqa: F401
+from ai import RECORD_VARIABLE, WEIGHTS_COUNT, Spring2023AntsAI
+from chromosome_archive import ChromosomeArchive
+from duel_store import DuelStore
+from engine import (
+    VALIDATION_FILE,
+    VALIDATION_GAMES,
+    ReplayedGame,
+    ReplayError,
+    read_record,
+)
+from evolution import ARCHIVE_FILE, MATCHMAKING, POOL_SIZE_FILE
 from genetic_algorithm import (
     AI,
     GENE_MAX,
     GENE_MIN,
+    POOL_SIZE,
     JAR,
     MAIN,
+    RATINGS,
+    Spring2023AntsChromosome,
     Spring2023AntsGeneticAlgorithm,
+    launch_duel,
+    local_duel_args,
 )
+from matchmaking import STRATEGIES
 from migration import migrate_directory
+from telemetry import format_report
+from validation import save_validation
 
 
 @click.group()
@@ -40,10 +64,173 @@ def launch() -> None:
     print(result.stdout.decode("utf-8"))
 
 
+def duel_options(command):
+    for option in reversed(
+        [
+            click.option(
+                "--python-referee",
+                is_flag=True,
+                help="Play duels with the Python engine once validate-engine passed",
+            ),
+            click.option(
+                "--asyncio",
+                "async_duels",
+                is_flag=True,
+                help="Run referees from asyncio",
+            ),
+            click.option(
+                "--cache", is_flag=True, help="Reuse results of known genomes"
+            ),
+            click.option(
+                "--cache-file", type=click.Path(), help="Persist the evaluation cache"
+            ),
+            click.option(
+                "--genome-bank",
+                is_flag=True,
+                help="Hand bots pre-decoded genomes from one memory-mapped file",
+            ),
+            click.option(
+                "--racing",
+                is_flag=True,
+                help="Spend duels on chromosomes near the elite cut only",
+            ),
+            click.option(
+                "--matchmaking",
+                type=click.Choice(STRATEGIES),
+                default=MATCHMAKING,
+                help="How chromosomes are paired in each round",
+            ),
+            click.option(
+                "--rating",
+                type=click.Choice(RATINGS),
+                default=RATINGS[0],
+                help="How a generation's duel results become scores",
+            ),
+            click.option(
+                "--duel-store", type=click.Path(), help="Keep every duel in SQLite"
+            ),
+            click.option(
+                "--telemetry",
+                "telemetry_file",
+                type=click.Path(),
+                help="Append per-generation metrics as JSON lines",
+            ),
+            click.option(
+                "--pool-size",
+                type=click.IntRange(1),
+                default=POOL_SIZE,
+                help=f"Worker processes, write a new count in {POOL_SIZE_FILE} to resize",
+            ),
+        ]
+    ):
+        command = option(command)
+    return command
+
+
 @main.command()
-def compete() -> None:
+@duel_options
+def compete(**options) -> None:
     """Launch the competition"""
-    Spring2023AntsGeneticAlgorithm().run()
+    Spring2023AntsGeneticAlgorithm(**options).run()
+
+
+@main.command()
+@duel_options
+def resume(**options) -> None:
+    """Resume the competition from its last checkpoint"""
+    Spring2023AntsGeneticAlgorithm(resume=True, **options).run()
+
+
+@main.command()
+@click.argument("id")
+@click.option("--generation", type=int, help="Archived generation, the last by default")
+@click.option("--archive", default=ARCHIVE_FILE, type=click.Path(exists=True))
+@click.option("--output", type=click.File("w"), default="-", help="Bot weights file")
+def export(id: str, generation: Optional[int], archive: str, output) -> None:
+    """Export an archived chromosome in the text format read by the bot"""
+    genome = ChromosomeArchive.open(archive).get(id, generation)
+    output.write(str(Spring2023AntsChromosome(generation or 0, genome, id)))
+
+
+@main.command()
+@click.argument("store", type=click.Path(exists=True))
+@click.argument("chromosome")
+@click.option("--opponent", help="Only the duels against this chromosome")
+@click.option("--generation", type=int, help="Only the duels of this generation")
+def duels(
+    store: str, chromosome: str, opponent: Optional[str], generation: Optional[int]
+) -> None:
+    """Report the stored duels of a chromosome"""
+    with DuelStore(store) as duel_store:
+        if opponent is not None:
+            for played_in, result in duel_store.head_to_head(chromosome, opponent):
+                print(f"{played_in:05} {result}")
+        elif generation is not None:
+            for _, other, result in duel_store.history(chromosome, generation):
+                print(f"{other} {result}")
+        else:
+            for other, count, score, opponent_score in duel_store.opponents(chromosome):
+                print(f"{other} {count} duels {score:.1f} - {opponent_score:.1f}")
+
+
+@main.command()
+@click.argument("run", type=click.Path(exists=True))
+@click.argument("baseline", type=click.Path(exists=True), required=False)
+@click.option(
+    "--threshold", default=0.1, help="Relative change flagged as a regression"
+)
+def report(run: str, baseline: Optional[str], threshold: float) -> None:
+    """Summarize a telemetry file, compared to a baseline run if given"""
+    print(format_report(run, baseline, threshold))
+
+
+@main.command()
+@click.argument("chromosome_1", type=click.Path(exists=True))
+@click.argument("chromosome_2", type=click.Path(exists=True))
+@click.option(
+    "--games", default=VALIDATION_GAMES, help="Games played by the Java referee"
+)
+@click.option(
+    "--record",
+    default=VALIDATION_FILE,
+    type=click.Path(),
+    help="Where a validation is recorded, for --python-referee",
+)
+def validate_engine(
+    chromosome_1: str, chromosome_2: str, games: int, record: str
+) -> None:
+    """Replay the games of the Java referee with the Python engine, turn by turn"""
+    diverged = 0
+    os.environ[RECORD_VARIABLE] = "1"
+    try:
+        for game in range(games):
+            with tempfile.TemporaryDirectory() as directory:
+                # Fresh copies of the chromosomes, the bots record to <copy>.jsonl
+                file_name_1, file_name_2 = (
+                    os.path.join(directory, f"{i}.txt") for i in (1, 2)
+                )
+                shutil.copyfile(chromosome_1, file_name_1)
+                shutil.copyfile(chromosome_2, file_name_2)
+                result = launch_duel(file_name_1, file_name_2, local_duel_args)
+                records = [
+                    read_record(f"{file_name}.jsonl")
+                    for file_name in (file_name_1, file_name_2)
+                ]
+            try:
+                replayed = ReplayedGame(*records).replay()
+                if replayed != result:
+                    raise ReplayError(f"result {replayed}, java {result}")
+                print(f"{game}: {len(records[0]) - 1} turns reproduced, result {result}")
+            except ReplayError as err:
+                diverged += 1
+                print(f"{game}: {err}")
+    finally:
+        del os.environ[RECORD_VARIABLE]
+
+    if diverged:
+        raise click.ClickException(f"{diverged} of {games} games diverged")
+    save_validation(record, engine.__file__, games)
+    print(f"Engine validated on {games} games, recorded in {record}")
 
 
 @main.command()
@@ -1,7 +1,32 @@
+import json
+import sys
+from random import Random
+
+import numpy as np
 import pytest
+from click.testing import CliRunner
 
-from ai import Spring2023AntsAI, Type
+import engine
+import lab_common  # noqa: F401
+import main as cli
+from ai import WEIGHTS_COUNT, Spring2023AntsAI, Type
+from engine import VALIDATION_GAMES, AntsGame, ReplayedGame, ReplayError, generate_map, share
+from genetic_algorithm import (
+    DUEL_DEFAULT,
+    Spring2023AntsChromosome,
+    Spring2023AntsGene,
+    Spring2023AntsGeneticAlgorithm,
+    Spring2023AntsPopulation,
+    ants_shares,
+    parse_duel,
+    simulate_duel,
+    update_elo,
+)
+from genome_bank import bank_argument, write_genome_bank
 from migration import add_zeros, process_content
+from rating import batch_elo
+from referee import RefereeSession
+from validation import save_validation
 
 
 @pytest.fixture
@@ -107,3 +132,244 @@ def test_process_content():
     assert process_content("1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0") == "1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,0.0,0.0"
     assert process_content("1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,9.0,10.0,11.0,12.0,13.0,14.0,15.0,16.0") == "1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,0.0,0.0,9.0,10.0,11.0,12.0,13.0,14.0,15.0,16.0,0.0,0.0"
 
+
+
+def test_chromosome_genome():
+    chromosome = Spring2023AntsChromosome.random(0, WEIGHTS_COUNT)
+
+    assert chromosome.genome.dtype == np.float32
+    assert chromosome.genome.shape == (WEIGHTS_COUNT,)
+    assert np.array_equal(Spring2023AntsChromosome.from_str(0, str(chromosome)).genome, chromosome.genome)
+
+
+def test_population_genomes():
+    population = Spring2023AntsPopulation.random(4, WEIGHTS_COUNT)
+
+    assert population.genomes.shape == (4, WEIGHTS_COUNT)
+    assert all(np.shares_memory(c.genome, population.genomes) for c in population.chromosomes)
+
+
+def test_chromosome_crossover():
+    parent_1 = Spring2023AntsChromosome(0, np.zeros(WEIGHTS_COUNT, dtype=np.float32))
+    parent_2 = Spring2023AntsChromosome(0, np.full(WEIGHTS_COUNT, 100, dtype=np.float32))
+    child_1, child_2 = parent_1.crossover(1, parent_2)
+
+    assert np.allclose(child_1.genome + child_2.genome, 100, atol=1e-3)
+    assert len(set(child_1.genome.tolist())) == 1
+
+
+def test_mutate_population():
+    genomes = np.full((3, WEIGHTS_COUNT), 100, dtype=np.float32)
+    Spring2023AntsGene.mutate_population(genomes, np.array([1]), 0.1)
+
+    mutated = genomes[1] != 100
+    assert np.count_nonzero(mutated) == 12
+    assert (np.abs(genomes[1][mutated] - 100) <= 10).all()
+    assert (genomes[[0, 2]] == 100).all()
+
+
+def test_referee_session(tmp_path):
+    file_names = []
+    for i, content in enumerate(["0.5,1.0", "0.25,1.0"]):
+        file_name = tmp_path / f"{i}.txt"
+        file_name.write_text(content)
+        file_names.append(str(file_name))
+
+    session = RefereeSession(
+        [sys.executable, "stub_referee.py"], 2, parse_duel, DUEL_DEFAULT, lambda f1, f2: ("ai.py", f1, "ai.py", f2)
+    )
+    with session:
+        results = dict(session.imap_unordered([(0, file_names), (1, file_names[::-1])]))
+        assert results == {0: (34, 84), 1: (84, 34)}
+        assert session.play(("crash", "crash")) == DUEL_DEFAULT
+
+
+def test_read_genome_bank(tmp_path):
+    population = Spring2023AntsPopulation.random(3, WEIGHTS_COUNT)
+    path = str(tmp_path / "genomes.bin")
+    write_genome_bank(path, population.genomes)
+
+    for slot, chromosome in enumerate(population.chromosomes):
+        weights = Spring2023AntsAI.read_genome_bank(bank_argument(path, slot))
+        assert weights == Spring2023AntsAI.read_weights(str(chromosome))
+
+
+def test_ants_shares():
+    shares = ants_shares([(30, 10), (10, 30), (20, 20), (0, 0)])
+    assert shares == pytest.approx([0.95, 0.05, 0.5, 0.5])
+
+
+def test_batch_elo_single_duel():
+    share = ants_shares([(30, 10)])
+    ratings = batch_elo([1200, 1300], np.array([(0, 1)]), share)
+
+    assert ratings.tolist() == pytest.approx(
+        update_elo(1200, 1300, share[0], 1 - share[0])
+    )
+
+
+def test_generate_map_is_symmetric():
+    cells, bases, opp_bases = generate_map(Random(0))
+
+    for i in range(1, len(cells), 2):
+        assert cells[i][:2] == cells[i + 1][:2]
+        # Neighbours of mirrored cells are mirrored, in the opposite direction
+        assert [n if n <= 0 else n + 1 if n % 2 else n - 1 for n in cells[i][2:]] == cells[i + 1][5:] + cells[i + 1][2:5]
+    assert opp_bases == [base + 1 for base in bases]
+
+
+def test_chain_strengths():
+    game = AntsGame(0)
+    base = game.bases[0][0]
+    neighbour = game.cells[base][2:][0]
+    game.ants = [[0] * len(game.cells) for _ in range(2)]
+    game.ants[0][base], game.ants[0][neighbour] = 7, 3
+    game.ants[1][neighbour] = 5
+
+    assert game.chain_strengths(0, [False] * len(game.cells))[neighbour] == 3
+    assert game.chain_strengths(1, [False] * len(game.cells))[neighbour] == 0
+    assert share([8, 3], 10) == [7, 3]
+    assert share([8, 9], 10) == [5, 5]
+
+
+def test_simulate_duel(tmp_path):
+    file_name = tmp_path / "weights.txt"
+    file_name.write_text(",".join(str(w) for w in Spring2023AntsAI().weights))
+
+    score_1, score_2 = simulate_duel(str(file_name), "missing.txt", 1)
+    assert (score_1, score_2) == simulate_duel(str(file_name), "missing.txt", 1)
+    assert score_1 + score_2 > 0
+
+
+class RecordingAI(Spring2023AntsAI):
+    """Keeps what it reads and prints, as ai.py does with ANTS_RECORD set"""
+
+    def __init__(self):
+        super().__init__()
+        self.record = []
+
+    def setup(self, cells, bases, opp_bases):
+        super().setup(cells, bases, opp_bases)
+        self.record.append(json.loads(json.dumps([cells, bases, opp_bases])))
+
+    def update(self, my_score, opp_score, cells):
+        super().update(my_score, opp_score, cells)
+        self.record.append(json.loads(json.dumps([[my_score, opp_score], cells])))
+
+    def decide(self):
+        actions = super().decide()
+        self.record[-1].append(";".join(actions))
+        return actions
+
+
+def recorded_game(seed):
+    """The scores and records of a game, as the Java referee would have them"""
+    ais = RecordingAI(), RecordingAI()
+    scores = AntsGame(seed).play(*ais)
+    return scores, [ai.record for ai in ais]
+
+
+def test_replayed_game():
+    scores, records = recorded_game(1)
+    assert ReplayedGame(*records).replay() == scores
+
+    records[1][3][1][0][0] += 1
+    with pytest.raises(ReplayError, match="turn 2: player 2 cell 0"):
+        ReplayedGame(*records).replay()
+
+    records[1][0][1:] = records[1][0][:0:-1]
+    with pytest.raises(ReplayError, match="different maps"):
+        ReplayedGame(*records)
+
+    _, records = recorded_game(1)
+    with pytest.raises(ReplayError, match="not the end"):
+        ReplayedGame(records[0][:-1], records[1][:-1]).replay()
+
+
+def test_validate_engine(tmp_path, monkeypatch):
+    games = [recorded_game(1), recorded_game(2)]
+
+    def launch_duel(file_name_1, file_name_2, args):
+        # The Java referee, each bot recording to <chromosome>.jsonl
+        scores, records = games.pop(0)
+        for file_name, record in zip((file_name_1, file_name_2), records):
+            with open(f"{file_name}.jsonl", "w") as f:
+                f.writelines(json.dumps(line) + "\n" for line in record)
+        return scores
+
+    monkeypatch.setattr(cli, "launch_duel", launch_duel)
+    chromosome = tmp_path / "chromosome.txt"
+    chromosome.write_text("")
+    record = tmp_path / "validation.json"
+    arguments = ["validate-engine", str(chromosome), str(chromosome), "--games", "2"]
+    arguments += ["--record", str(record)]
+
+    result = CliRunner().invoke(cli.main, arguments)
+    assert result.exit_code == 0
+    assert result.output.count("turns reproduced") == 2
+    assert json.loads(record.read_text())["games"] == 2
+    record.unlink()
+
+    first, second = recorded_game(1), recorded_game(2)
+    games[:] = [first, (second[0], first[1])]
+    result = CliRunner().invoke(cli.main, arguments)
+    assert result.exit_code == 1
+    assert "1: result" in result.output
+    assert "1 of 2 games diverged" in result.output
+    assert not record.exists()
+
+
+def test_python_referee_needs_a_validated_engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    record = tmp_path / "validation.json"
+    monkeypatch.setattr("genetic_algorithm.VALIDATION_FILE", str(record))
+    with pytest.raises(ValueError, match="never validated"):
+        Spring2023AntsGeneticAlgorithm(python_referee=True, pool_size=1)
+
+    save_validation(str(record), engine.__file__, VALIDATION_GAMES)
+    algorithm = Spring2023AntsGeneticAlgorithm(python_referee=True, pool_size=1)
+    assert algorithm.launch_duel is simulate_duel
+
+
+def hex_map(rings, seed=0):
+    """Spring 2023 like map: a hexagon of cells, a third of them with resources"""
+    random = np.random.default_rng(seed)
+    directions = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
+    coordinates = [
+        (q, r)
+        for q in range(-rings, rings + 1)
+        for r in range(max(-rings, -q - rings), min(rings, -q + rings) + 1)
+    ]
+    index = {coordinate: i for i, coordinate in enumerate(coordinates)}
+    types = random.choice([Type.EMPTY, Type.EGG, Type.CRYSTAL], len(coordinates), p=[0.66, 0.12, 0.22])
+    return {
+        i: {
+            "type": int(types[i]),
+            "resources": 0 if types[i] == Type.EMPTY else int(random.integers(10, 60)),
+            "neigh": [index.get((q + dq, r + dr), -1) for dq, dr in directions],
+            "myAnts": 0,
+            "oppAnts": 0,
+        }
+        for i, (q, r) in enumerate(coordinates)
+    }
+
+
+@pytest.mark.parametrize("rings", [4, 6])
+def test_benchmark_create_beacon_paths(benchmark, rings):
+    ai = Spring2023AntsAI()
+    ai.map = hex_map(rings)
+    ai.bases = [0, 1]
+    ai.cells_with_crystals = [i for i, cell in ai.map.items() if cell["type"] == Type.CRYSTAL]
+    ai.cells_with_eggs = [i for i, cell in ai.map.items() if cell["type"] == Type.EGG]
+    ai.total_resources = sum(cell["resources"] for cell in ai.map.values())
+    ai.total_my_ants = 60
+
+    def turn():
+        # Shortest paths are computed again every turn, see read_turn_info
+        ai.paths_from_base = {}
+        return ai.create_beacon_paths()
+
+    paths, beacons = benchmark(turn)
+
+    assert paths and all(path[0] in ai.bases for path in paths)
+    assert set(beacons) == {cell for path in paths for cell in path}